@@ -0,0 +1,247 @@
+"""
+Asynchrone Lese-API (async_api.py) für HVAC Classifier
+Reine ASGI-Anwendung für stark abgefragte Leseendpunkte (Modell, Komponente,
+Hierarchie, Statistik) auf der asyncio-Engine von SQLAlchemy. Die Antworten
+entsprechen den gleichnamigen Flask-Routen; geschrieben wird nichts.
+
+Start (z.B. mit uvicorn, Treiber asyncpg bzw. aiosqlite erforderlich):
+    uvicorn async_api:app --workers 4
+"""
+
+import json
+import re
+import zlib
+from urllib.parse import parse_qs
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from config import Config, engine_options
+from hierarchy import create_hierarchy_from_rows, hierarchy_filter_key
+from models import (
+    COMPONENT_DICT_COLUMNS, HVACComponent, IFCModel, Location, ModelHierarchy, component_dict
+)
+
+# Synchrone Treiber -> asyncio-Treiber
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_engine_args(url):
+    """
+    Übersetzt eine Datenbank-URL und die Engine-Optionen aus config.py für create_async_engine
+
+    Args:
+        url: Synchrone Datenbank-URL (wie in DATABASE_URL)
+
+    Returns:
+        tuple: (asynchrone URL, Optionen)
+    """
+    sync_url = make_url(url)
+    driver = ASYNC_DRIVERS.get(sync_url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"Keine asynchrone Unterstützung für {sync_url.get_backend_name()}")
+
+    async_url = sync_url.set(drivername=driver)
+    options = engine_options(url)
+    connect_args = options.pop("connect_args", {})
+    if driver == "postgresql+asyncpg":
+        # asyncpg kennt weder client_encoding in der URL noch "options"
+        async_url = async_url.difference_update_query(["client_encoding"])
+        statement_timeout = connect_args.get("options", "").partition("statement_timeout=")[2]
+        if statement_timeout:
+            options["connect_args"] = {"server_settings": {"statement_timeout": statement_timeout}}
+    return async_url, options
+
+
+class AsyncReadAPI:
+    """ASGI-Anwendung mit den lesenden Modell-Endpunkten"""
+
+    def __init__(self, database_url=None):
+        # Lesereplik bevorzugen, falls konfiguriert
+        self.database_url = database_url or Config.DATABASE_REPLICA_URL or Config.SQLALCHEMY_DATABASE_URI
+        self.engine = None
+        self.sessionmaker = None
+        self.routes = [
+            (re.compile(r"^/api/model/(\d+)$"), self.model_data),
+            (re.compile(r"^/api/model/(\d+)/hierarchy$"), self.model_hierarchy),
+            (re.compile(r"^/api/component/(\d+)$"), self.component_data),
+            (re.compile(r"^/api/statistics$"), self.statistics),
+        ]
+
+    async def startup(self):
+        """Erzeugt die Engine (beim Lifespan-Start oder bei der ersten Anfrage)"""
+        if self.engine is None:
+            url, options = async_engine_args(self.database_url)
+            self.engine = create_async_engine(url, **options)
+            self.sessionmaker = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def shutdown(self):
+        if self.engine is not None:
+            await self.engine.dispose()
+            self.engine = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        if scope["method"] not in ("GET", "HEAD"):
+            await self.respond(send, 405, {"error": "Methode nicht erlaubt"}, head=False)
+            return
+
+        for pattern, handler in self.routes:
+            match = pattern.match(scope["path"])
+            if match:
+                break
+        else:
+            await self.respond(send, 404, {"error": "Nicht gefunden"}, head=scope["method"] == "HEAD")
+            return
+
+        await self.startup()
+        args = {key: values[-1] for key, values in parse_qs(scope["query_string"].decode("latin-1")).items()}
+        async with self.sessionmaker() as session:
+            status, body = await handler(session, args, *(int(value) for value in match.groups()))
+        await self.respond(send, status, body, head=scope["method"] == "HEAD")
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def respond(self, send, status, body, head=False):
+        """Sendet eine JSON-Antwort (body: Objekt oder bereits serialisierter Text)"""
+        if not isinstance(body, str):
+            body = json.dumps(body, separators=(",", ":"))
+        data = body.encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(data)).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b"" if head else data})
+
+    @staticmethod
+    def hierarchy_filters(args):
+        """Hierarchie-Filter wie hierarchy_filters_from_request in main.py"""
+        electronic_only = args.get("electronic_only", "false").lower() == "true"
+        system_id = args.get("system_id")
+        system_id = int(system_id) if system_id and system_id.isdigit() else None
+        return electronic_only, system_id
+
+    @staticmethod
+    def component_filters(statement, model_id, electronic_only, system_id):
+        statement = statement.where(HVACComponent.model_id == model_id)
+        if electronic_only:
+            statement = statement.where(HVACComponent.is_electronic.is_(True))
+        if system_id is not None:
+            statement = statement.where(HVACComponent.system_id == system_id)
+        return statement
+
+    async def hierarchy_json(self, session, model_id, electronic_only, system_id):
+        """Gespeicherte Hierarchie oder, falls sie fehlt, eine ungespeicherte Berechnung"""
+        data = await session.scalar(
+            select(ModelHierarchy.data).where(
+                ModelHierarchy.model_id == model_id,
+                ModelHierarchy.filter_key == hierarchy_filter_key(electronic_only, system_id)
+            )
+        )
+        if data is not None:
+            return zlib.decompress(data).decode("utf-8")
+
+        statement = self.component_filters(
+            select(
+                HVACComponent.id, HVACComponent.name, HVACComponent.ifc_class,
+                HVACComponent.bas_code, HVACComponent.is_electronic,
+                Location.storey_id, Location.storey_name, Location.space_id, Location.space_name
+            ).outerjoin(HVACComponent.location),
+            model_id, electronic_only, system_id
+        ).order_by(HVACComponent.id)
+        rows = await session.execute(statement)
+        return json.dumps(create_hierarchy_from_rows(rows), separators=(",", ":"))
+
+    async def model_data(self, session, args, model_id):
+        """GET /api/model/<id> (wie api_model_data)"""
+        model = await session.get(IFCModel, model_id)
+        if model is None:
+            return 404, {"error": "Modell nicht gefunden"}
+        electronic_only, system_id = self.hierarchy_filters(args)
+
+        # Nur Spalten (ohne ORM-Objekte), wie component_dicts in main.py
+        statement = self.component_filters(
+            select(*COMPONENT_DICT_COLUMNS)
+            .outerjoin(HVACComponent.location)
+            .outerjoin(HVACComponent.type_properties),
+            model_id, electronic_only, system_id
+        ).order_by(HVACComponent.id)
+        components = [component_dict(row) for row in await session.execute(statement)]
+        hierarchy = await self.hierarchy_json(session, model_id, electronic_only, system_id)
+
+        return 200, {
+            "model_id": model.id,
+            "filename": model.filename,
+            "uploaded_at": model.uploaded_at.isoformat(),
+            "component_count": len(components),
+            "flat_results": components,
+            "hierarchy": json.loads(hierarchy)
+        }
+
+    async def model_hierarchy(self, session, args, model_id):
+        """GET /api/model/<id>/hierarchy (wie api_model_hierarchy)"""
+        if await session.get(IFCModel, model_id) is None:
+            return 404, {"error": "Modell nicht gefunden"}
+        electronic_only, system_id = self.hierarchy_filters(args)
+        return 200, await self.hierarchy_json(session, model_id, electronic_only, system_id)
+
+    async def component_data(self, session, args, component_id):
+        """GET /api/component/<id> (wie api_component_data)"""
+        component = await session.get(
+            HVACComponent, component_id,
+            options=[selectinload(HVACComponent.location), selectinload(HVACComponent.type_properties)]
+        )
+        if component is None:
+            return 404, {"error": "Komponente nicht gefunden"}
+        return 200, component.to_dict()
+
+    async def statistics(self, session, args):
+        """GET /api/statistics (wie api_statistics)"""
+        models_count = await session.scalar(select(func.count(IFCModel.id)))
+        components_count, electronic_count = (await session.execute(
+            select(
+                func.count(HVACComponent.id),
+                func.count(HVACComponent.id).filter(HVACComponent.is_electronic.is_(True))
+            )
+        )).one()
+        class_rows = await session.execute(
+            select(HVACComponent.ifc_class, func.count(HVACComponent.id)).group_by(HVACComponent.ifc_class)
+        )
+
+        return 200, {
+            "models_count": models_count,
+            "components_count": components_count,
+            "electronic_count": electronic_count,
+            "electronic_percentage": round(electronic_count / components_count * 100, 1) if components_count else 0,
+            "class_distribution": {ifc_class: count for ifc_class, count in class_rows}
+        }
+
+
+app = AsyncReadAPI()
@@ -0,0 +1,158 @@
+"""
+Lasttest (api_load.py) für die Lese-Endpunkte
+Vergleicht Anfragen pro Sekunde und Latenzen der Flask-Routen mit der
+asynchronen Lese-API (async_api.py) bei gleicher Parallelität
+
+Beide Server müssen laufen, z.B.:
+    gunicorn -w 4 -b 127.0.0.1:5000 main:app
+    uvicorn async_api:app --workers 4 --port 8000
+
+Aufruf:
+    python benchmarks/api_load.py --model-id 1 --component-id 1 \\
+        --target flask=http://127.0.0.1:5000 --target asgi=http://127.0.0.1:8000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+class KeepAliveClient:
+    """Minimaler HTTP/1.1-Client mit einer dauerhaften Verbindung (nur GET)"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def get(self, path):
+        """
+        Führt eine GET-Anfrage aus und liest die Antwort vollständig
+
+        Returns:
+            int: HTTP-Status
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nConnection: keep-alive\r\n\r\n".encode("ascii")
+        )
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Verbindung vom Server geschlossen")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await self.reader.read()
+            await self.close()
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.reader = self.writer = None
+
+
+async def run_load(base_url, path, concurrency, duration):
+    """
+    Ruft einen Pfad mit `concurrency` parallelen Verbindungen für `duration` Sekunden ab
+
+    Returns:
+        dict: Anzahl Anfragen, Fehler, Anfragen/s und Latenzen (ms)
+    """
+    url = urlsplit(base_url)
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        client = KeepAliveClient(url.hostname, url.port or 80)
+        try:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    status = await client.get(path)
+                except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                    errors += 1
+                    await client.close()
+                    continue
+                if status == 200:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+        finally:
+            await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+    }
+
+
+async def main(args):
+    paths = ["/api/statistics"]
+    if args.model_id:
+        paths.extend([f"/api/model/{args.model_id}", f"/api/model/{args.model_id}/hierarchy"])
+    if args.component_id:
+        paths.append(f"/api/component/{args.component_id}")
+
+    targets = [target.split("=", 1) for target in args.target]
+
+    print(f"{'Ziel':<8} {'Pfad':<32} {'Anfragen':>9} {'Fehler':>7} {'Anfr./s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for path in paths:
+        for name, base_url in targets:
+            # Kurzes Aufwärmen (Verbindungspools, Caches)
+            await run_load(base_url, path, args.concurrency, min(1.0, args.duration))
+            result = await run_load(base_url, path, args.concurrency, args.duration)
+            print(
+                f"{name:<8} {path:<32} {result['requests']:>9} {result['errors']:>7} "
+                f"{result['rps']:>9.1f} {result['p50']:>8.1f} {result['p99']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lasttest der Lese-Endpunkte (Flask vs. ASGI)")
+    parser.add_argument("--target", action="append", required=True,
+                        help="name=basis-url, z.B. flask=http://127.0.0.1:5000 (mehrfach)")
+    parser.add_argument("--model-id", type=int, help="Modell für /api/model/<id>")
+    parser.add_argument("--component-id", type=int, help="Komponente für /api/component/<id>")
+    parser.add_argument("--concurrency", type=int, default=50, help="Parallele Verbindungen")
+    parser.add_argument("--duration", type=float, default=10.0, help="Dauer je Pfad und Ziel in Sekunden")
+    asyncio.run(main(parser.parse_args()))
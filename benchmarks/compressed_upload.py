@@ -0,0 +1,82 @@
+"""
+Benchmark (compressed_upload.py) für komprimierte IFC-Uploads
+Misst Upload + Verarbeitung über /api/upload für .ifc, .ifczip, .ifc.gz und .ifc.zst
+
+Aufruf:
+    DATABASE_URL=sqlite:////tmp/bench.sqlite python benchmarks/compressed_upload.py modell.ifc [wiederholungen]
+"""
+
+import gzip
+import io
+import os
+import sys
+import time
+import zipfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from main import app, db  # noqa: E402
+from upload_store import zstandard  # noqa: E402
+
+
+def compressed_variants(path):
+    """
+    Erzeugt die komprimierten Varianten einer IFC-Datei im Speicher
+
+    Returns:
+        list: (Dateiname, Daten)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    stem = os.path.splitext(os.path.basename(path))[0]
+
+    variants = [(f"{stem}.ifc", data)]
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(f"{stem}.ifc", data)
+    variants.append((f"{stem}.ifczip", buffer.getvalue()))
+
+    variants.append((f"{stem}.ifc.gz", gzip.compress(data, compresslevel=6)))
+
+    if zstandard is not None:
+        variants.append((f"{stem}.ifc.zst", zstandard.ZstdCompressor(level=3).compress(data)))
+    else:
+        print("Hinweis: zstandard ist nicht installiert, .ifc.zst wird übersprungen")
+
+    return variants
+
+
+def run(path, repetitions=3):
+    """Führt den Benchmark aus und gibt eine Tabelle aus"""
+    variants = compressed_variants(path)
+    original_size = len(variants[0][1])
+
+    with app.app_context():
+        db.create_all()
+        client = app.test_client()
+
+        print(f"{'Datei':<40} {'Größe':>12} {'Verhältnis':>10} {'Upload+Parse':>14}")
+        for filename, data in variants:
+            timings = []
+            for _ in range(repetitions):
+                start = time.perf_counter()
+                response = client.post(
+                    "/api/upload",
+                    data={"file": (io.BytesIO(data), filename), "electronic_only": "false"},
+                    content_type="multipart/form-data"
+                )
+                timings.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    raise SystemExit(f"{filename}: {response.status_code} {response.get_json()}")
+
+            print(
+                f"{filename:<40} {len(data):>12,} {original_size / len(data):>9.1f}x "
+                f"{min(timings):>12.3f} s"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        raise SystemExit(__doc__)
+    run(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 3)
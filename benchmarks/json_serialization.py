@@ -0,0 +1,135 @@
+"""
+Benchmark (json_serialization.py) für die JSON-Serialisierung großer Modelle
+Vergleicht ORM-Objekte + to_dict + json.dumps mit Zeilentupeln (component_dicts)
+und den JSON-Backends stdlib/orjson, jeweils für einzelne Schritte und für
+den gesamten Endpunkt /api/model/<id>
+
+Aufruf:
+    DATABASE_URL=sqlite:////tmp/bench.sqlite python benchmarks/json_serialization.py [komponenten] [wiederholungen]
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from main import app, db, component_dicts, filtered_components_query  # noqa: E402
+from models import HVACComponent, IFCModel, Location, PropertyBlock  # noqa: E402
+from json_provider import OrjsonProvider, StdlibJSONProvider, orjson  # noqa: E402
+
+IFC_CLASSES = ["IfcValve", "IfcDamper", "IfcPump", "IfcSensor", "IfcActuator", "IfcController", "IfcAirTerminal"]
+
+
+def create_synthetic_model(component_count):
+    """
+    Legt ein Modell mit zufälligen Komponenten, Standorten und Typeigenschaften an
+
+    Returns:
+        int: ID des Modells
+    """
+    model = IFCModel(filename=f"benchmark_{component_count}.ifc")
+    db.session.add(model)
+    db.session.flush()
+
+    locations = [
+        Location(model_id=model.id, storey_id=storey, storey_name=f"OG {storey}",
+                 space_id=storey * 1000 + space, space_name=f"Raum {storey}.{space:03d}")
+        for storey in range(10) for space in range(50)
+    ]
+    blocks = [
+        PropertyBlock(block_key=hashlib.sha1(f"benchmark-{model.id}-{i}".encode()).hexdigest(),
+                      properties={"Hersteller": f"Hersteller {i}", "Typ": f"T-{i}", "Nennweite": 20 + i})
+        for i in range(50)
+    ]
+    db.session.add_all(locations + blocks)
+    db.session.flush()
+
+    rng = random.Random(42)
+    rows = []
+    for i in range(component_count):
+        ifc_class = rng.choice(IFC_CLASSES)
+        rows.append({
+            "model_id": model.id,
+            "global_id": f"{model.id:04d}{i:018d}",
+            "name": f"{ifc_class[3:]} {i:06d}",
+            "ifc_class": ifc_class,
+            "is_electronic": rng.random() < 0.4,
+            "bas_code": f"HEI_01_ERH_HZV_S{i % 1000:03d}_R{i % 500:03d}_T~~01_MW-01_TL",
+            "bas_standard": "amev",
+            "properties": {"Nummer": i, "Pset_Common": {"Status": "Neu"}},
+            "location_id": rng.choice(locations).id,
+            "type_properties_id": rng.choice(blocks).id,
+        })
+    db.session.execute(HVACComponent.__table__.insert(), rows)
+    db.session.commit()
+    return model.id
+
+
+def measure(function, repetitions):
+    """Bestes Ergebnis aus mehreren Durchläufen in Sekunden"""
+    best = None
+    result = None
+    for _ in range(repetitions):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(component_count=100000, repetitions=3):
+    """Führt den Benchmark aus und gibt eine Tabelle aus"""
+    with app.app_context():
+        db.create_all()
+        print(f"Erzeuge Modell mit {component_count} Komponenten ...")
+        model_id = create_synthetic_model(component_count)
+
+        def orm_dicts():
+            return [component.to_dict() for component in
+                    filtered_components_query(model_id).order_by(HVACComponent.id)]
+
+        def row_dicts():
+            return component_dicts(filtered_components_query(model_id))
+
+        print(f"{'Schritt':<44} {'Zeit':>10}")
+        orm_time, orm_result = measure(orm_dicts, repetitions)
+        print(f"{'Laden: ORM-Objekte + to_dict':<44} {orm_time:>9.2f}s")
+        row_time, row_result = measure(row_dicts, repetitions)
+        print(f"{'Laden: Zeilentupel (component_dicts)':<44} {row_time:>9.2f}s")
+        assert orm_result == row_result, "Zeilentupel liefern andere Daten als to_dict"
+
+        serializers = [
+            ("Serialisieren: json.dumps(indent=2)", lambda: json.dumps(row_result, indent=2)),
+            ("Serialisieren: json.dumps kompakt", lambda: json.dumps(row_result, separators=(",", ":"))),
+        ]
+        if orjson is not None:
+            serializers.append(("Serialisieren: orjson", lambda: orjson.dumps(row_result)))
+        for label, function in serializers:
+            elapsed, data = measure(function, repetitions)
+            print(f"{label:<44} {elapsed:>9.2f}s  ({len(data) / 1024 ** 2:.1f} MB)")
+
+        # Gesamter Endpunkt (Antwort-Cache und Komprimierung aus)
+        app.config["RESPONSE_CACHE_SIZE"] = 0
+        app.config["RESPONSE_COMPRESSION"] = False
+        from main import response_cache
+        response_cache.max_bytes = 0
+
+        providers = [("stdlib", StdlibJSONProvider)]
+        if orjson is not None:
+            providers.append(("orjson", OrjsonProvider))
+        client = app.test_client()
+        for name, provider in providers:
+            app.json = provider(app)
+            elapsed, response = measure(lambda: client.get(f"/api/model/{model_id}"), repetitions)
+            print(f"{'Endpunkt /api/model/<id> (' + name + ')':<44} {elapsed:>9.2f}s  ({len(response.data) / 1024 ** 2:.1f} MB)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    reps = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    run(count, reps)
@@ -0,0 +1,309 @@
+"""
+Connectivity Graph (connectivity_graph.py) für HVAC Classifier
+Baut aus den Port-Beziehungen einer IFC-Datei einen kompakten Verbindungsgraphen
+"""
+
+import sys
+from array import array
+from collections import deque
+
+# Relationstypen, über die Ports und Elemente verbunden werden
+PORT_CONNECTION_TYPES = ['IfcRelConnectsPorts']
+PORT_OWNER_TYPES = ['IfcRelNests', 'IfcRelConnectsPortToElement']
+
+
+# Sicheres Laden von IFC-Typen (Schema-agnostisch)
+def safe_by_type(ifc_file, type_name):
+    try:
+        return ifc_file.by_type(type_name)
+    except Exception:
+        return []
+
+
+class ConnectivityGraph:
+    """
+    Ungerichteter Verbindungsgraph der MEP-Elemente eines Modells.
+
+    Die Adjazenz wird im CSR-Format (Compressed Sparse Row) gehalten:
+    Die Nachbarn von Knoten i stehen in indices[indptr[i]:indptr[i + 1]].
+    Knoten werden über die GlobalId des IFC-Elements adressiert.
+    """
+
+    def __init__(self, node_keys, node_types, type_codes, indptr, indices, labels=None):
+        """
+        Initialisiert den Graphen aus bereits aufgebauten CSR-Arrays
+
+        Args:
+            node_keys: Liste der GlobalIds (Index = Knotennummer)
+            node_types: Liste der IFC-Klassennamen (Wörterbuch für type_codes)
+            type_codes: array('H') mit dem Klassenindex je Knoten
+            indptr: array('i') der Länge len(node_keys) + 1
+            indices: array('i') mit den Nachbarknoten
+            labels: Optional - array('i') mit der Zusammenhangskomponente je Knoten
+        """
+        self.node_keys = node_keys
+        self.node_types = node_types
+        self.type_codes = type_codes
+        self.indptr = indptr
+        self.indices = indices
+        self._index = {key: i for i, key in enumerate(node_keys)}
+        self.labels = labels if labels is not None else self._compute_labels()
+
+    @classmethod
+    def from_ifc(cls, ifc_file):
+        """
+        Erstellt den Graphen aus IfcRelConnectsPorts, IfcRelNests und
+        IfcRelConnectsPortToElement einer IFC-Datei
+
+        Args:
+            ifc_file: ifcopenshell.file.File Objekt der IFC-Datei
+
+        Returns:
+            ConnectivityGraph: Der aufgebaute Graph
+        """
+        # 1. Port -> besitzendes Element
+        port_owner = {}
+        for rel in safe_by_type(ifc_file, 'IfcRelNests'):
+            owner = rel.RelatingObject
+            if owner is None or not hasattr(owner, "GlobalId"):
+                continue
+            for related in rel.RelatedObjects or []:
+                if related.is_a("IfcPort"):
+                    port_owner[related.id()] = owner
+
+        for rel in safe_by_type(ifc_file, 'IfcRelConnectsPortToElement'):
+            if rel.RelatingPort is not None and rel.RelatedElement is not None:
+                port_owner[rel.RelatingPort.id()] = rel.RelatedElement
+
+        # 2. Port-Verbindungen -> Kanten zwischen Elementen
+        elements = {}
+        edges = []
+        for rel in safe_by_type(ifc_file, 'IfcRelConnectsPorts'):
+            if rel.RelatingPort is None or rel.RelatedPort is None:
+                continue
+            source = port_owner.get(rel.RelatingPort.id())
+            target = port_owner.get(rel.RelatedPort.id())
+            if source is None or target is None or source.id() == target.id():
+                continue
+            elements[source.id()] = source
+            elements[target.id()] = target
+            edges.append((source.id(), target.id()))
+
+        # Elemente in stabiler Reihenfolge (IFC-Step-ID) nummerieren
+        ordered = sorted(elements)
+        position = {step_id: i for i, step_id in enumerate(ordered)}
+        node_keys = [elements[step_id].GlobalId for step_id in ordered]
+
+        node_types = []
+        type_index = {}
+        type_codes = array('H')
+        for step_id in ordered:
+            ifc_class = elements[step_id].is_a()
+            if ifc_class not in type_index:
+                type_index[ifc_class] = len(node_types)
+                node_types.append(ifc_class)
+            type_codes.append(type_index[ifc_class])
+
+        indptr, indices = cls._build_csr(
+            len(node_keys),
+            [(position[a], position[b]) for a, b in edges]
+        )
+        return cls(node_keys, node_types, type_codes, indptr, indices)
+
+    @staticmethod
+    def _build_csr(node_count, edges):
+        """
+        Baut die CSR-Arrays aus einer ungerichteten Kantenliste (ohne Duplikate)
+
+        Args:
+            node_count: Anzahl der Knoten
+            edges: Liste von (i, j)-Tupeln
+
+        Returns:
+            tuple: (indptr, indices)
+        """
+        unique_edges = set()
+        for a, b in edges:
+            if a != b:
+                unique_edges.add((a, b) if a < b else (b, a))
+
+        degree = [0] * node_count
+        for a, b in unique_edges:
+            degree[a] += 1
+            degree[b] += 1
+
+        indptr = array('i', [0]) * (node_count + 1)
+        for i in range(node_count):
+            indptr[i + 1] = indptr[i] + degree[i]
+
+        indices = array('i', [0]) * indptr[node_count]
+        cursor = list(indptr[:node_count])
+        for a, b in sorted(unique_edges):
+            indices[cursor[a]] = b
+            cursor[a] += 1
+            indices[cursor[b]] = a
+            cursor[b] += 1
+
+        return indptr, indices
+
+    def _compute_labels(self):
+        """Ermittelt die Zusammenhangskomponenten per Breitensuche"""
+        labels = array('i', [-1]) * len(self.node_keys)
+        label = 0
+        for start in range(len(self.node_keys)):
+            if labels[start] != -1:
+                continue
+            labels[start] = label
+            queue = deque([start])
+            while queue:
+                node = queue.popleft()
+                for neighbor in self.indices[self.indptr[node]:self.indptr[node + 1]]:
+                    if labels[neighbor] == -1:
+                        labels[neighbor] = label
+                        queue.append(neighbor)
+            label += 1
+        return labels
+
+    @property
+    def node_count(self):
+        return len(self.node_keys)
+
+    @property
+    def edge_count(self):
+        return len(self.indices) // 2
+
+    @property
+    def component_count(self):
+        return max(self.labels) + 1 if len(self.labels) else 0
+
+    def has_node(self, key):
+        return key in self._index
+
+    def node_type(self, key):
+        """Liefert die IFC-Klasse eines Knotens"""
+        return self.node_types[self.type_codes[self._index[key]]]
+
+    def neighbors(self, key, hops=1, ifc_class=None):
+        """
+        Ermittelt alle Knoten innerhalb von N Schritten
+
+        Args:
+            key: GlobalId des Startelements
+            hops: Maximale Anzahl von Schritten
+            ifc_class: Optional - nur Knoten dieser IFC-Klasse zurückgeben
+
+        Returns:
+            dict: GlobalId -> Abstand (Startknoten ausgeschlossen)
+        """
+        start = self._index[key]
+        distances = {start: 0}
+        frontier = [start]
+        for distance in range(1, hops + 1):
+            next_frontier = []
+            for node in frontier:
+                for neighbor in self.indices[self.indptr[node]:self.indptr[node + 1]]:
+                    if neighbor not in distances:
+                        distances[neighbor] = distance
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        del distances[start]
+        return {
+            self.node_keys[node]: distance
+            for node, distance in distances.items()
+            if ifc_class is None or self.node_types[self.type_codes[node]] == ifc_class
+        }
+
+    def shortest_path(self, source_key, target_key):
+        """
+        Ermittelt den kürzesten Pfad zwischen zwei Elementen
+
+        Args:
+            source_key: GlobalId des Startelements
+            target_key: GlobalId des Zielelements
+
+        Returns:
+            list: GlobalIds entlang des Pfads oder None wenn nicht verbunden
+        """
+        source = self._index[source_key]
+        target = self._index[target_key]
+        if self.labels[source] != self.labels[target]:
+            return None
+
+        previous = {source: None}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                break
+            for neighbor in self.indices[self.indptr[node]:self.indptr[node + 1]]:
+                if neighbor not in previous:
+                    previous[neighbor] = node
+                    queue.append(neighbor)
+
+        path = []
+        node = target
+        while node is not None:
+            path.append(self.node_keys[node])
+            node = previous[node]
+        path.reverse()
+        return path
+
+    def connected_component(self, key):
+        """
+        Liefert alle Elemente, die mit dem Element verbunden sind
+
+        Args:
+            key: GlobalId des Elements
+
+        Returns:
+            list: GlobalIds der Zusammenhangskomponente (inkl. Element)
+        """
+        label = self.labels[self._index[key]]
+        return [self.node_keys[i] for i, value in enumerate(self.labels) if value == label]
+
+    def to_columns(self):
+        """
+        Serialisiert den Graphen für die Speicherung in der Datenbank
+
+        Returns:
+            dict: Spaltenwerte für models.ModelGraph
+        """
+        return {
+            "node_count": self.node_count,
+            "edge_count": self.edge_count,
+            "node_keys": self.node_keys,
+            "node_types": self.node_types,
+            "type_codes": self.type_codes.tobytes(),
+            "indptr": self.indptr.tobytes(),
+            "indices": self.indices.tobytes(),
+            "labels": self.labels.tobytes()
+        }
+
+    def approximate_size(self):
+        """Ungefährer Speicherbedarf in Bytes (Arrays, GlobalIds und Knotenindex)"""
+        arrays = sum(
+            values.itemsize * len(values)
+            for values in (self.type_codes, self.indptr, self.indices, self.labels)
+        )
+        keys = sum(sys.getsizeof(key) for key in self.node_keys)
+        return arrays + keys + sys.getsizeof(self.node_keys) + sys.getsizeof(self._index)
+
+    @classmethod
+    def from_columns(cls, node_keys, node_types, type_codes, indptr, indices, labels):
+        """
+        Stellt einen gespeicherten Graphen wieder her
+
+        Returns:
+            ConnectivityGraph: Der geladene Graph
+        """
+        return cls(
+            list(node_keys),
+            list(node_types),
+            array('H', type_codes),
+            array('i', indptr),
+            array('i', indices),
+            array('i', labels)
+        )
@@ -6,6 +6,55 @@ Extrahiert HVAC-Komponenten aus IFC-Dateien
 import ifcopenshell
 import re
 
+from classifier.connectivity_graph import ConnectivityGraph
+from classifier.property_extractor import PropertyExtractor
+from classifier.step_prescan import prescan_step_file
+
+# HVAC-relevante IFC-Typen
+HVAC_TYPES = [
+    'IfcDuctSegment',            # Luftkanalabschnitt
+    'IfcPipeSegment',            # Rohrabschnitt
+    'IfcDuctFitting',            # Luftkanalverbindungsstück
+    'IfcPipeFitting',            # Rohrverbindungsstück
+    'IfcDuctAccessory',          # Zubehör für Luftkanäle
+    'IfcPipeAccessory',          # Zubehör für Rohre
+    'IfcDuctSilencer',           # Schalldämpfer
+    'IfcDuctDamper',             # Drosselklappe
+    'IfcFireDamper',             # Brandschutzklappe
+    'IfcValve',                  # Ventil
+    'IfcFan',                    # Ventilator
+    'IfcPump',                   # Pumpe
+    'IfcAirTerminal',            # Luftauslass, -einlass
+    'IfcAirTerminalBox',         # Luftauslassbox
+    'IfcHumidifier',             # Befeuchter
+    'IfcFilter',                 # Filter
+    'IfcChiller',                # Kältemaschine
+    'IfcBoiler',                 # Heizkessel
+    'IfcCoolingTower',           # Kühlturm
+    'IfcCompressor',             # Kompressor
+    'IfcHeatExchanger',          # Wärmetauscher
+    'IfcFlowController',         # Ventile, Klappen, etc.
+    'IfcFlowFitting',            # Verbindungsstücke, Übergänge
+    'IfcFlowMovingDevice',       # Pumpen, Ventilatoren
+    'IfcFlowSegment',            # Rohre, Kanäle
+    'IfcFlowStorageDevice',      # Tanks, Speicher
+    'IfcFlowTerminal',           # Auslässe, Einlässe
+    'IfcFlowTreatmentDevice',    # Filter, Kühler, Heizregister
+    'IfcEnergyConversionDevice', # Kessel, Wärmetauscher
+    'IfcSensor',                 # Sensoren
+    'IfcActuator',               # Aktoren
+    'IfcController',             # Steuerungen, Regler
+    'IfcUnitaryControlElement',  # Steuergeräte
+    'IfcDistributionElement',    # Allgemeine Versorgungselemente
+    'IfcDistributionControlElement' # Steuerelemente für Versorgungssysteme
+]
+
+# Elektronisch gesteuerte Komponenten-Typen
+ELECTRONIC_TYPES = [
+    'IfcActuator', 'IfcAlarm', 'IfcController', 'IfcSensor', 'IfcUnitaryControlElement',
+    'IfcProtectiveDeviceTrippingUnit', 'IfcFlowMeter', 'IfcElectricDistributionBoard'
+]
+
 def ifc_type_exists(ifc_file, type_name):
     try:
         _ = ifc_file.by_type(type_name)
@@ -27,54 +76,20 @@ class HVACExtractor:
     Identifiziert relevante TGA/HVAC-Elemente in einem BIM-Modell.
     """
     
-    def __init__(self, ifc_file):
+    def __init__(self, ifc_file, property_extractor=None):
         """
         Initialisiert den HVAC Extractor
         
         Args:
             ifc_file: ifcopenshell.file.File Objekt der IFC-Datei
+            property_extractor: Optional - gemeinsam genutzter PropertyExtractor derselben Datei
         """
         self.ifc_file = ifc_file
+        self.property_extractor = property_extractor or PropertyExtractor(ifc_file)
         
 
         # HVAC-relevante IFC-Typen
-        self.hvac_types_all = [
-            'IfcDuctSegment',            # Luftkanalabschnitt
-            'IfcPipeSegment',            # Rohrabschnitt
-            'IfcDuctFitting',            # Luftkanalverbindungsstück
-            'IfcPipeFitting',            # Rohrverbindungsstück
-            'IfcDuctAccessory',          # Zubehör für Luftkanäle
-            'IfcPipeAccessory',          # Zubehör für Rohre
-            'IfcDuctSilencer',           # Schalldämpfer
-            'IfcDuctDamper',             # Drosselklappe
-            'IfcFireDamper',             # Brandschutzklappe
-            'IfcValve',                  # Ventil
-            'IfcFan',                    # Ventilator
-            'IfcPump',                   # Pumpe
-            'IfcAirTerminal',            # Luftauslass, -einlass
-            'IfcAirTerminalBox',         # Luftauslassbox
-            'IfcHumidifier',             # Befeuchter
-            'IfcFilter',                 # Filter
-            'IfcChiller',                # Kältemaschine
-            'IfcBoiler',                 # Heizkessel
-            'IfcCoolingTower',           # Kühlturm
-            'IfcCompressor',             # Kompressor
-            'IfcHeatExchanger',          # Wärmetauscher
-            'IfcFlowController',         # Ventile, Klappen, etc.
-            'IfcFlowFitting',            # Verbindungsstücke, Übergänge
-            'IfcFlowMovingDevice',       # Pumpen, Ventilatoren
-            'IfcFlowSegment',            # Rohre, Kanäle
-            'IfcFlowStorageDevice',      # Tanks, Speicher
-            'IfcFlowTerminal',           # Auslässe, Einlässe
-            'IfcFlowTreatmentDevice',    # Filter, Kühler, Heizregister
-            'IfcEnergyConversionDevice', # Kessel, Wärmetauscher
-            'IfcSensor',                 # Sensoren
-            'IfcActuator',               # Aktoren
-            'IfcController',             # Steuerungen, Regler
-            'IfcUnitaryControlElement',  # Steuergeräte
-            'IfcDistributionElement',    # Allgemeine Versorgungselemente
-            'IfcDistributionControlElement' # Steuerelemente für Versorgungssysteme
-        ]
+        self.hvac_types_all = list(HVAC_TYPES)
 
         # Hier den Filter anwenden
         self.hvac_types = [t for t in self.hvac_types_all if ifc_type_exists(self.ifc_file, t)]
@@ -88,10 +103,7 @@ class HVACExtractor:
         ]
         
         # Elektronisch gesteuerte Komponenten-Typen
-        self.electronic_types = [
-            'IfcActuator', 'IfcAlarm', 'IfcController', 'IfcSensor', 'IfcUnitaryControlElement',
-            'IfcProtectiveDeviceTrippingUnit', 'IfcFlowMeter', 'IfcElectricDistributionBoard'
-        ]
+        self.electronic_types = list(ELECTRONIC_TYPES)
     
     def extract_all_hvac_elements(self):
         """
@@ -226,7 +238,7 @@ class HVACExtractor:
     
     def _extract_properties(self, element):
         """
-        Extrahiert die Eigenschaften eines Elements
+        Extrahiert die Eigenschaften eines Elements (Typ- und Instanzeigenschaften)
         
         Args:
             element: Ein IFC-Element
@@ -234,29 +246,7 @@ class HVACExtractor:
         Returns:
             dict: Die Eigenschaften des Elements
         """
-        properties = {}
-        
-        # Durchlaufe die PropertySets
-        if hasattr(element, "IsDefinedBy"):
-            for definition in element.IsDefinedBy:
-                if hasattr(definition, "RelatingPropertyDefinition"):
-                    prop_def = definition.RelatingPropertyDefinition
-                    
-                    # Einzelne Eigenschaften
-                    if hasattr(prop_def, "HasProperties"):
-                        for prop in prop_def.HasProperties:
-                            if hasattr(prop, "Name") and hasattr(prop, "NominalValue") and prop.NominalValue:
-                                prop_name = prop.Name
-                                prop_value = prop.NominalValue.wrappedValue
-                                properties[prop_name] = prop_value
-                    
-                    # Property Sets
-                    if hasattr(prop_def, "Name"):
-                        pset_name = prop_def.Name
-                        if pset_name.startswith("Pset_") or pset_name.startswith("PSet_"):
-                            properties[f"PropertySet_{pset_name}"] = True
-        
-        return properties
+        return self.property_extractor.properties(element)
     
     def _extract_geometry_info(self, element):
         """
@@ -342,6 +332,15 @@ class HVACExtractor:
         
         return materials if materials else None
     
+    def build_connectivity_graph(self):
+        """
+        Baut den Verbindungsgraphen der MEP-Elemente über ihre Ports auf
+        
+        Returns:
+            ConnectivityGraph: Graph im CSR-Format, adressiert über GlobalIds
+        """
+        return ConnectivityGraph.from_ifc(self.ifc_file)
+    
     def get_element_by_id(self, element_id):
         """
         Lädt ein Element anhand seiner ID
@@ -393,6 +392,23 @@ class HVACExtractor:
         
         return result
     
+    @staticmethod
+    def prescan_hvac_statistics(path):
+        """
+        Erstellt Statistiken über HVAC-Elemente per Vorabscan, ohne die Datei zu parsen
+        
+        Args:
+            path: Pfad zur IFC-Datei
+            
+        Returns:
+            dict: Statistik-Informationen (elektronisch nur nach Elementtyp)
+        """
+        scan = prescan_step_file(path)
+        stats = scan.hvac_statistics(HVAC_TYPES, ELECTRONIC_TYPES)
+        stats["schema"] = scan.schema
+        stats["file_size"] = scan.file_size
+        return stats
+    
     def get_hvac_statistics(self):
         """
         Erstellt Statistiken über HVAC-Elemente in der IFC-Datei
@@ -7,6 +7,8 @@ import re
 import os
 import json
 
+from classifier.property_extractor import PropertyExtractor
+
 def ifc_type_exists(ifc_file, type_name):
     try:
         _ = ifc_file.by_type(type_name)
@@ -28,7 +30,7 @@ class HVACClassifier:
     gemäß VDI BAS und AMEV BAS Standards.
     """
     
-    def __init__(self, ifc_file, location_extractor, rules_file=None):
+    def __init__(self, ifc_file, location_extractor, rules_file=None, property_extractor=None):
         """
         Initialisiert den HVAC Classifier
         
@@ -36,9 +38,11 @@ class HVACClassifier:
             ifc_file: ifcopenshell.file.File Objekt der IFC-Datei
             location_extractor: LocationExtractor Instanz
             rules_file: Optional - Pfad zu einer JSON-Datei mit Klassifizierungsregeln
+            property_extractor: Optional - gemeinsam genutzter PropertyExtractor derselben Datei
         """
         self.ifc_file = ifc_file
         self.location_extractor = location_extractor
+        self.property_extractor = property_extractor or PropertyExtractor(ifc_file)
         self.rules = self._load_rules(rules_file)
         
         # HVAC-spezifische IFC-Typen
@@ -194,22 +198,25 @@ class HVACClassifier:
             print(f"Fehler beim Laden der Regeldatei: {str(e)}")
             return default_rules
     
-    def classify_all_hvac_elements(self, standard="amev", electronic_only=True):
+    def classify_all_hvac_elements(self, standard="amev", electronic_only=True, build_hierarchy=True):
         """
         Klassifiziert alle HVAC-Elemente in der IFC-Datei
         
         Args:
             standard: "amev" oder "vdi"
             electronic_only: Nur elektronisch gesteuerte Elemente beachten
+            build_hierarchy: Hierarchie aufbauen (die Webanwendung berechnet sie aus der Datenbank)
             
         Returns:
             dict: {
                 "flat_results": Liste aller klassifizierten Elemente,
-                "hierarchy": Hierarchische Struktur der Elemente nach Standort
+                "hierarchy": Hierarchische Struktur der Elemente nach Standort,
+                "property_blocks": Geteilte Typ-Eigenschaften (Schlüssel -> dict)
             }
         """
         results = []
         hierarchy = {}
+        property_blocks = {}
         
         # Alle HVAC-Elemententypen durchgehen
         for element_type in self.hvac_types:
@@ -219,8 +226,14 @@ class HVACClassifier:
                 result = self.classify_element(element, standard, electronic_only)
                 if result:
                     # In hierarchische Struktur einfügen
-                    self._add_to_hierarchy(hierarchy, result)
+                    if build_hierarchy:
+                        self._add_to_hierarchy(hierarchy, result)
                     results.append(result)
+                    
+                    # Typ-Eigenschaften nur einmal pro Block sammeln
+                    block_key = result.get("type_properties_key")
+                    if block_key and block_key not in property_blocks:
+                        property_blocks[block_key] = self.property_extractor.type_properties(element)[1]
         
         # Ergebnisse sortieren und zurückgeben
         sorted_results = sorted(results, key=lambda x: (
@@ -231,7 +244,8 @@ class HVACClassifier:
         
         return {
             "flat_results": sorted_results,
-            "hierarchy": hierarchy
+            "hierarchy": hierarchy,
+            "property_blocks": property_blocks
         }
     
     def classify_element(self, element, standard="amev", electronic_only=False):
@@ -264,6 +278,7 @@ class HVACClassifier:
         
         # Eigenschaften extrahieren
         properties = self._extract_properties(element)
+        type_properties_key, _ = self.property_extractor.type_properties(element)
         
         # Standortinformationen ermitteln
         location = self.location_extractor.get_element_location(element)
@@ -279,7 +294,12 @@ class HVACClassifier:
             "is_electronic": is_electronic,
             "bas_code": bas_code,
             "standard": standard,
-            "properties": properties
+            "properties": properties,
+            "instance_properties": self.property_extractor.instance_properties(element),
+            "type_properties_key": type_properties_key,
+            "metadata": {
+                "global_id": element.GlobalId if hasattr(element, "GlobalId") else None
+            }
         }
         
         # Standortinformationen hinzufügen, falls vorhanden
@@ -329,7 +349,7 @@ class HVACClassifier:
     
     def _extract_properties(self, element):
         """
-        Extrahiert die Eigenschaften eines Elements
+        Extrahiert die Eigenschaften eines Elements (Typ- und Instanzeigenschaften)
         
         Args:
             element: Ein IFC-Element
@@ -337,29 +357,7 @@ class HVACClassifier:
         Returns:
             dict: Die Eigenschaften des Elements
         """
-        properties = {}
-        
-        # Durchlaufe die PropertySets
-        if hasattr(element, "IsDefinedBy"):
-            for definition in element.IsDefinedBy:
-                if hasattr(definition, "RelatingPropertyDefinition"):
-                    prop_def = definition.RelatingPropertyDefinition
-                    
-                    # Einzelne Eigenschaften
-                    if hasattr(prop_def, "HasProperties"):
-                        for prop in prop_def.HasProperties:
-                            if hasattr(prop, "Name") and hasattr(prop, "NominalValue") and prop.NominalValue:
-                                prop_name = prop.Name
-                                prop_value = prop.NominalValue.wrappedValue
-                                properties[prop_name] = prop_value
-                    
-                    # Property Sets
-                    if hasattr(prop_def, "Name"):
-                        pset_name = prop_def.Name
-                        if pset_name.startswith("Pset_") or pset_name.startswith("PSet_"):
-                            properties[f"PropertySet_{pset_name}"] = True
-        
-        return properties
+        return self.property_extractor.properties(element)
     
     def _generate_bas_code(self, element, element_type, location, standard):
         """
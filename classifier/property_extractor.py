@@ -0,0 +1,166 @@
+"""
+Property Extractor (property_extractor.py) für HVAC Classifier
+Extrahiert PropertySets aus IFC-Dateien mit gemeinsamer Nutzung von Typ-Eigenschaften
+"""
+
+import hashlib
+import json
+
+
+# Sicheres Laden von IFC-Typen (Schema-agnostisch)
+def safe_by_type(ifc_file, type_name):
+    try:
+        return ifc_file.by_type(type_name)
+    except Exception:
+        return []
+
+
+def property_block_key(properties):
+    """
+    Berechnet einen inhaltsbasierten Schlüssel für einen Eigenschaftsblock
+
+    Args:
+        properties: dict mit Eigenschaften
+
+    Returns:
+        str: SHA1-Hexdigest der kanonischen JSON-Darstellung
+    """
+    canonical = json.dumps(properties, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class PropertyExtractor:
+    """
+    Klasse zur Extraktion von Eigenschaften über alle Elemente einer IFC-Datei.
+
+    Statt für jedes Element die inversen Beziehungen einzeln zu durchlaufen, werden
+    IfcRelDefinesByProperties und IfcRelDefinesByType einmalig indiziert.
+    PropertySets von Typobjekten werden pro Typ nur einmal extrahiert und von allen
+    Instanzen gemeinsam genutzt; Namen und Werte werden über eine Tabelle internalisiert.
+    """
+
+    def __init__(self, ifc_file):
+        """
+        Initialisiert den PropertyExtractor
+
+        Args:
+            ifc_file: ifcopenshell.file.File Objekt der IFC-Datei
+        """
+        self.ifc_file = ifc_file
+        self._element_psets = None   # element_id -> [PropertySetDefinition]
+        self._element_type = None    # element_id -> Typobjekt
+        self._instance_cache = {}    # element_id -> dict
+        self._type_cache = {}        # type_id -> (key, dict)
+        self._intern_table = {}      # Wert -> geteilte Instanz
+
+    def _index_relations(self):
+        """Indiziert Eigenschafts- und Typzuweisungen in einem Durchlauf"""
+        self._element_psets = {}
+        self._element_type = {}
+
+        for rel in safe_by_type(self.ifc_file, 'IfcRelDefinesByProperties'):
+            definition = rel.RelatingPropertyDefinition
+            # IFC4: IfcPropertySetDefinitionSet ist ein Tupel von Definitionen
+            definitions = definition if isinstance(definition, (list, tuple)) else [definition]
+            for related in rel.RelatedObjects or []:
+                self._element_psets.setdefault(related.id(), []).extend(definitions)
+
+        for rel in safe_by_type(self.ifc_file, 'IfcRelDefinesByType'):
+            if rel.RelatingType is None:
+                continue
+            for related in rel.RelatedObjects or []:
+                self._element_type[related.id()] = rel.RelatingType
+
+    def _intern(self, value):
+        """Liefert eine geteilte Instanz für gleiche Namen und Werte"""
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            return self._intern_table.setdefault((type(value), value), value)
+        return value
+
+    def _read_property_sets(self, definitions):
+        """
+        Liest Einzelwerte aus einer Liste von PropertySet-Definitionen
+
+        Args:
+            definitions: Liste von IfcPropertySetDefinition
+
+        Returns:
+            dict: Die Eigenschaften
+        """
+        properties = {}
+        for prop_def in definitions:
+            if prop_def is None:
+                continue
+
+            # Einzelne Eigenschaften
+            if hasattr(prop_def, "HasProperties"):
+                for prop in prop_def.HasProperties or []:
+                    if hasattr(prop, "Name") and hasattr(prop, "NominalValue") and prop.NominalValue:
+                        properties[self._intern(prop.Name)] = self._intern(prop.NominalValue.wrappedValue)
+
+            # Property Sets
+            pset_name = getattr(prop_def, "Name", None)
+            if pset_name and (pset_name.startswith("Pset_") or pset_name.startswith("PSet_")):
+                properties[self._intern(f"PropertySet_{pset_name}")] = True
+
+        return properties
+
+    def instance_properties(self, element):
+        """
+        Extrahiert die direkt am Element definierten Eigenschaften
+
+        Args:
+            element: Ein IFC-Element
+
+        Returns:
+            dict: Die Eigenschaften des Elements
+        """
+        if self._element_psets is None:
+            self._index_relations()
+
+        element_id = element.id()
+        if element_id not in self._instance_cache:
+            self._instance_cache[element_id] = self._read_property_sets(
+                self._element_psets.get(element_id, [])
+            )
+        return self._instance_cache[element_id]
+
+    def type_properties(self, element):
+        """
+        Extrahiert die Eigenschaften des Typobjekts eines Elements (einmal pro Typ)
+
+        Args:
+            element: Ein IFC-Element
+
+        Returns:
+            tuple: (Blockschlüssel oder None, dict der Typ-Eigenschaften)
+        """
+        if self._element_type is None:
+            self._index_relations()
+
+        type_object = self._element_type.get(element.id())
+        if type_object is None:
+            return None, {}
+
+        type_id = type_object.id()
+        if type_id not in self._type_cache:
+            properties = self._read_property_sets(getattr(type_object, "HasPropertySets", None) or [])
+            key = property_block_key(properties) if properties else None
+            self._type_cache[type_id] = (key, properties)
+        return self._type_cache[type_id]
+
+    def properties(self, element):
+        """
+        Liefert die zusammengeführten Eigenschaften (Instanzwerte überschreiben Typwerte)
+
+        Args:
+            element: Ein IFC-Element
+
+        Returns:
+            dict: Die Eigenschaften des Elements
+        """
+        _, type_props = self.type_properties(element)
+        instance_props = self.instance_properties(element)
+        if not type_props:
+            return instance_props
+        return {**type_props, **instance_props}
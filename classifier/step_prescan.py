@@ -0,0 +1,191 @@
+"""
+STEP Pre-Scan (step_prescan.py) für HVAC Classifier
+Ermittelt Schema und Entitätsanzahlen einer IFC-STEP-Datei ohne vollständiges Parsen
+"""
+
+import mmap
+import os
+import re
+import time
+from collections import Counter
+from functools import lru_cache
+
+import ifcopenshell.ifcopenshell_wrapper as ifc_wrapper
+
+# Instanzzeilen wie "#123=IFCVALVE(" bzw. "#123 = IFCVALVE ("
+ENTITY_PATTERN = re.compile(rb"#\d+\s*=\s*([A-Za-z0-9_]+)\s*\(")
+SCHEMA_PATTERN = re.compile(rb"FILE_SCHEMA\s*\(\s*\(\s*'([^']*)'")
+
+# Größe der Abschnitte, in denen die Datei durchsucht wird
+WINDOW_SIZE = 64 * 1024 * 1024
+# Maximale Größe des HEADER-Abschnitts
+HEADER_LIMIT = 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def _schema(schema_name):
+    """Lädt die Schemadefinition (z.B. IFC4X3_ADD2 -> IFC4X3_ADD2 oder IFC4X3)"""
+    for name in (schema_name, schema_name.split("_")[0]):
+        try:
+            return ifc_wrapper.schema_by_name(name)
+        except Exception:
+            continue
+    return None
+
+
+@lru_cache(maxsize=None)
+def entity_names(schema_name, ifc_class):
+    """
+    Liefert die STEP-Namen einer Klasse und aller Unterklassen im Schema
+
+    Args:
+        schema_name: Schema aus dem Dateikopf (z.B. IFC4)
+        ifc_class: IFC-Klasse (z.B. IfcFlowController)
+
+    Returns:
+        frozenset: Großgeschriebene Entitätsnamen (z.B. IFCVALVE, IFCDAMPER, ...)
+    """
+    schema = _schema(schema_name) if schema_name else None
+    if schema is None:
+        return frozenset([ifc_class.upper()])
+
+    try:
+        declaration = schema.declaration_by_name(ifc_class)
+    except Exception:
+        # Klasse existiert in diesem Schema nicht
+        return frozenset()
+
+    names = set()
+    stack = [declaration]
+    while stack:
+        current = stack.pop()
+        names.add(current.name().upper())
+        stack.extend(current.subtypes())
+    return frozenset(names)
+
+
+class StepScan:
+    """
+    Ergebnis eines Vorabscans: Schema, Dateigröße und Anzahl der Instanzen je Entitätstyp.
+
+    Die Zählung erfolgt textbasiert über die Instanzzeilen; Inhalte von
+    Zeichenketten werden nicht gesondert behandelt. Für Vorabentscheidungen
+    (enthält die Datei HVAC-Elemente, wie groß ist sie) ist das ausreichend.
+    """
+
+    def __init__(self, path, file_size, schema, entity_counts, duration):
+        self.path = path
+        self.file_size = file_size
+        self.schema = schema
+        self.entity_counts = entity_counts  # STEP-Name (großgeschrieben) -> Anzahl
+        self.duration = duration
+
+    @property
+    def entity_count(self):
+        return sum(self.entity_counts.values())
+
+    def count(self, ifc_class):
+        """Anzahl der Instanzen einer Klasse einschließlich Unterklassen (wie ifc_file.by_type)"""
+        return sum(self.entity_counts.get(name, 0) for name in entity_names(self.schema, ifc_class))
+
+    def has_any(self, ifc_classes):
+        """Prüft, ob mindestens eine Instanz einer der Klassen vorkommt"""
+        return any(self.count(ifc_class) for ifc_class in ifc_classes)
+
+    def hvac_statistics(self, hvac_types, electronic_types):
+        """
+        Statistik über HVAC-Elemente analog zu HVACExtractor.get_hvac_statistics
+
+        Elektronisch gesteuert werden hier nur Elemente der elektronischen Typen
+        gezählt; die Schlüsselwort- und Eigenschaftsprüfung erfordert das Parsen.
+
+        Args:
+            hvac_types: Liste der HVAC-relevanten IFC-Klassen
+            electronic_types: Liste der elektronisch gesteuerten IFC-Klassen
+
+        Returns:
+            dict: Statistik-Informationen
+        """
+        electronic_names = set()
+        for ifc_class in electronic_types:
+            electronic_names |= entity_names(self.schema, ifc_class)
+
+        stats = {
+            "total_elements": 0,
+            "electronic_elements": 0,
+            "by_type": {}
+        }
+
+        # Elemente nur einmal zählen, auch wenn sie unter mehrere Obertypen fallen
+        counted = set()
+        for ifc_class in hvac_types:
+            names = entity_names(self.schema, ifc_class)
+            total = sum(self.entity_counts.get(name, 0) for name in names)
+            if total == 0:
+                continue
+            electronic = sum(self.entity_counts.get(name, 0) for name in names & electronic_names)
+            stats["by_type"][ifc_class] = {
+                "total": total,
+                "electronic": electronic
+            }
+
+            new_names = names - counted
+            stats["total_elements"] += sum(self.entity_counts.get(name, 0) for name in new_names)
+            stats["electronic_elements"] += sum(
+                self.entity_counts.get(name, 0) for name in new_names & electronic_names
+            )
+            counted |= names
+
+        return stats
+
+    def to_dict(self):
+        """Konvertiert den Scan in ein Wörterbuch (für JSON-Serialisierung)"""
+        return {
+            "schema": self.schema,
+            "file_size": self.file_size,
+            "entity_count": self.entity_count,
+            "entity_counts": dict(self.entity_counts.most_common()),
+            "duration": round(self.duration, 3)
+        }
+
+
+def prescan_step_file(path, window_size=WINDOW_SIZE):
+    """
+    Liest eine IFC-STEP-Datei speichergemappt und zählt die Instanzen je Entitätstyp
+
+    Args:
+        path: Pfad zur (unkomprimierten) IFC-Datei
+        window_size: Größe der Abschnitte, die am Stück durchsucht werden
+
+    Returns:
+        StepScan: Ergebnis des Scans
+    """
+    start = time.perf_counter()
+    file_size = os.path.getsize(path)
+    counts = Counter()
+    schema = None
+
+    if file_size == 0:
+        return StepScan(path, 0, None, counts, time.perf_counter() - start)
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # Kopfbereich bis zum ersten ENDSEC;
+        header_end = data.find(b"ENDSEC;", 0, HEADER_LIMIT)
+        header = data[:header_end if header_end != -1 else min(file_size, HEADER_LIMIT)]
+        match = SCHEMA_PATTERN.search(header)
+        if match:
+            schema = match.group(1).decode("ascii", "replace").upper()
+
+        # Abschnittsweise zählen; Grenzen liegen hinter einem ';' und teilen so keine Instanzzeile
+        position = header_end if header_end != -1 else 0
+        while position < file_size:
+            end = min(position + window_size, file_size)
+            if end < file_size:
+                boundary = data.rfind(b";", position, end)
+                if boundary > position:
+                    end = boundary + 1
+            counts.update(ENTITY_PATTERN.findall(data, position, end))
+            position = end
+
+    entity_counts = Counter({name.decode("ascii").upper(): count for name, count in counts.items()})
+    return StepScan(path, file_size, schema, entity_counts, time.perf_counter() - start)
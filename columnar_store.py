@@ -0,0 +1,244 @@
+"""
+Spaltenspeicher (columnar_store.py) für HVAC Classifier
+Legt die Klassifikationsergebnisse je Modell spaltenweise als NumPy-Dateien ab,
+die speichergemappt und ohne ORM ausgewertet werden können
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from array import array
+
+import numpy as np
+
+# Spalten mit Wörterbuchkodierung (Code je Zeile, Zeichenketten in <spalte>.dict.json)
+DICTIONARY_COLUMNS = ["name", "ifc_class", "bas_code", "storey", "space"]
+# Gruppierungsschlüssel für aggregate(); "bas_prefix" wird aus bas_code abgeleitet
+GROUP_KEYS = ["ifc_class", "bas_prefix", "storey", "space", "is_electronic"]
+
+
+class ColumnarModel:
+    """
+    Speichergemappte Spalten eines Modells.
+
+    id, system_id (-1 = ohne System) und is_electronic liegen als Zahlen-/Bool-Arrays vor,
+    global_id als Bytes fester Länge, alle anderen Texte als int32-Codes mit Wörterbuch.
+    """
+
+    def __init__(self, directory):
+        """
+        Öffnet die Spalten eines Modells (ohne sie zu lesen)
+
+        Args:
+            directory: Verzeichnis mit meta.json und den .npy-Dateien
+        """
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self._columns = {}
+        self._dictionaries = {}
+
+    @property
+    def row_count(self):
+        return self.meta["row_count"]
+
+    def column(self, name):
+        """Liefert eine Spalte als speichergemapptes Array"""
+        if name not in self._columns:
+            self._columns[name] = np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode="r")
+        return self._columns[name]
+
+    def dictionary(self, name):
+        """Liefert das Wörterbuch einer kodierten Spalte (Index = Code)"""
+        if name not in self._dictionaries:
+            with open(os.path.join(self.directory, f"{name}.dict.json")) as f:
+                self._dictionaries[name] = json.load(f)
+        return self._dictionaries[name]
+
+    def code_of(self, name, value):
+        """Code eines Werts in einer kodierten Spalte oder -1, wenn er nicht vorkommt"""
+        try:
+            return self.dictionary(name).index(value)
+        except ValueError:
+            return -1
+
+    def _group_codes(self, key, bas_prefix_parts):
+        """
+        Liefert (Codes je Zeile, Werte je Code) für einen Gruppierungsschlüssel
+
+        Returns:
+            tuple: (np.ndarray, list)
+        """
+        if key == "is_electronic":
+            return self.column("is_electronic").astype(np.int64), [False, True]
+        if key == "bas_prefix":
+            # Präfix einmal je Wörterbucheintrag bilden und per Code nachschlagen
+            prefixes = {}
+            prefix_codes = np.empty(len(self.dictionary("bas_code")), dtype=np.int64)
+            for code, bas_code in enumerate(self.dictionary("bas_code")):
+                prefix = "_".join(bas_code.split("_")[:bas_prefix_parts]) if bas_code is not None else None
+                prefix_codes[code] = prefixes.setdefault(prefix, len(prefixes))
+            return prefix_codes[self.column("bas_code")], list(prefixes)
+        return self.column(key).astype(np.int64), self.dictionary(key)
+
+    def aggregate(self, by, bas_prefix_parts=2, is_electronic=None, ifc_class=None):
+        """
+        Zählt die Komponenten gruppiert nach den angegebenen Schlüsseln
+
+        Args:
+            by: Liste von Schlüsseln aus GROUP_KEYS
+            bas_prefix_parts: Anzahl der "_"-getrennten Teile des BAS-Code-Präfixes
+            is_electronic: Optional - nur (nicht) elektronische Komponenten
+            ifc_class: Optional - nur Komponenten dieser IFC-Klasse
+
+        Returns:
+            dict: Tupel der Gruppenwerte -> Anzahl
+        """
+        mask = np.ones(self.row_count, dtype=bool)
+        if is_electronic is not None:
+            mask &= self.column("is_electronic") == bool(is_electronic)
+        if ifc_class is not None:
+            mask &= self.column("ifc_class") == self.code_of("ifc_class", ifc_class)
+
+        if not by:
+            return {(): int(mask.sum())}
+
+        columns = []
+        decoders = []
+        for key in by:
+            codes, values = self._group_codes(key, bas_prefix_parts)
+            columns.append(codes[mask])
+            decoders.append(values)
+
+        radices = [max(len(values), 1) for values in decoders]
+        if np.prod(radices, dtype=float) < 2 ** 62:
+            # Gruppenschlüssel zu einer Zahl kombinieren (gemischte Basis): deutlich schneller
+            combined = np.zeros(len(columns[0]), dtype=np.int64)
+            for codes, radix in zip(columns, radices):
+                combined = combined * radix + codes
+            keys, counts = np.unique(combined, return_counts=True)
+            groups = []
+            for key in keys.tolist():
+                group = []
+                for radix in reversed(radices):
+                    key, code = divmod(key, radix)
+                    group.append(code)
+                groups.append(reversed(group))
+        else:
+            groups, counts = np.unique(np.stack(columns, axis=1), axis=0, return_counts=True)
+            groups = groups.tolist()
+
+        return {
+            tuple(values[code] for values, code in zip(decoders, group)): count
+            for group, count in zip(groups, counts.tolist())
+        }
+
+
+class ColumnarStore:
+    """Verzeichnis mit den Spaltendateien aller Modelle (ein Unterverzeichnis je Modell)"""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def model_directory(self, model_id):
+        return os.path.join(self.root, str(model_id))
+
+    def has_model(self, model_id):
+        return os.path.exists(os.path.join(self.model_directory(model_id), "meta.json"))
+
+    def model_ids(self):
+        """IDs aller Modelle mit Spaltendateien"""
+        return sorted(
+            int(name) for name in os.listdir(self.root)
+            if name.isdigit() and self.has_model(int(name))
+        )
+
+    def open(self, model_id):
+        """Öffnet die Spalten eines Modells"""
+        return ColumnarModel(self.model_directory(model_id))
+
+    def write_model(self, model_id, rows):
+        """
+        Schreibt die Spalten eines Modells (ersetzt vorhandene Dateien atomar)
+
+        Args:
+            model_id: ID des Modells
+            rows: Iterierbare Tupel (id, global_id, name, ifc_class, is_electronic,
+                  bas_code, system_id, storey_name, space_name)
+
+        Returns:
+            int: Anzahl der geschriebenen Zeilen
+        """
+        ids = array("q")
+        system_ids = array("q")
+        electronic = array("b")
+        global_ids = []
+        codes = {column: array("i") for column in DICTIONARY_COLUMNS}
+        lookups = {column: {} for column in DICTIONARY_COLUMNS}
+
+        for (component_id, global_id, name, ifc_class, is_electronic,
+             bas_code, system_id, storey_name, space_name) in rows:
+            ids.append(component_id)
+            system_ids.append(system_id if system_id is not None else -1)
+            electronic.append(1 if is_electronic else 0)
+            global_ids.append(global_id.encode("ascii", "replace"))
+            for column, value in zip(DICTIONARY_COLUMNS, (name, ifc_class, bas_code, storey_name, space_name)):
+                lookup = lookups[column]
+                codes[column].append(lookup.setdefault(value, len(lookup)))
+
+        temp_dir = tempfile.mkdtemp(dir=self.root, prefix=".tmp-")
+        try:
+            np.save(os.path.join(temp_dir, "id.npy"), np.frombuffer(ids, dtype=np.int64))
+            np.save(os.path.join(temp_dir, "system_id.npy"), np.frombuffer(system_ids, dtype=np.int64))
+            np.save(os.path.join(temp_dir, "is_electronic.npy"), np.frombuffer(electronic, dtype=np.int8).astype(bool))
+            np.save(os.path.join(temp_dir, "global_id.npy"), np.array(global_ids, dtype="S22"))
+            for column in DICTIONARY_COLUMNS:
+                np.save(os.path.join(temp_dir, f"{column}.npy"), np.frombuffer(codes[column], dtype=np.int32))
+                with open(os.path.join(temp_dir, f"{column}.dict.json"), "w") as f:
+                    json.dump(list(lookups[column]), f)
+            with open(os.path.join(temp_dir, "meta.json"), "w") as f:
+                json.dump({"model_id": model_id, "row_count": len(ids)}, f)
+
+            # Alte Dateien erst nach dem Austausch löschen (geöffnete mmaps bleiben gültig)
+            target = self.model_directory(model_id)
+            old_dir = None
+            if os.path.exists(target):
+                old_dir = tempfile.mkdtemp(dir=self.root, prefix=".old-")
+                os.replace(target, os.path.join(old_dir, "data"))
+            os.replace(temp_dir, target)
+            if old_dir is not None:
+                shutil.rmtree(old_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        return len(ids)
+
+    def remove_model(self, model_id):
+        """Löscht die Spalten eines Modells"""
+        shutil.rmtree(self.model_directory(model_id), ignore_errors=True)
+
+    def aggregate(self, by, model_ids=None, **filters):
+        """
+        Zählt Komponenten über mehrere Modelle (siehe ColumnarModel.aggregate)
+
+        Args:
+            by: Liste von Schlüsseln aus GROUP_KEYS
+            model_ids: Optional - Modelle, sonst alle mit Spaltendateien
+            **filters: bas_prefix_parts, is_electronic, ifc_class
+
+        Returns:
+            dict: Tupel der Gruppenwerte -> Anzahl
+        """
+        unknown = [key for key in by if key not in GROUP_KEYS]
+        if unknown:
+            raise ValueError(f"Unbekannte Gruppierung: {', '.join(unknown)}")
+
+        result = {}
+        for model_id in (model_ids if model_ids is not None else self.model_ids()):
+            if not self.has_model(model_id):
+                continue
+            for group, count in self.open(model_id).aggregate(by, **filters).items():
+                result[group] = result.get(group, 0) + count
+        return result
@@ -0,0 +1,137 @@
+"""
+Archiv-Stream (export_archive.py) für HVAC Classifier
+Schreibt mehrere Exportdateien als ZIP- oder TAR-Archiv blockweise in einen Stream,
+ohne das Archiv im Speicher oder auf der Festplatte aufzubauen
+"""
+
+import io
+import os
+import tarfile
+import time
+import zipfile
+
+# Archivformat -> (MIME-Typ, Dateiendung)
+ARCHIVE_FORMATS = {
+    "zip": ("application/zip", "zip"),
+    "tar": ("application/x-tar", "tar"),
+    "tar.gz": ("application/gzip", "tar.gz"),
+}
+
+# Bereits komprimierte Formate werden im ZIP nur abgelegt
+STORED_EXTENSIONS = (".xlsx", ".parquet", ".zip", ".gz")
+
+# Blockgröße beim Kopieren der Dateien ins Archiv
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class _ArchiveSink:
+    """Nicht suchbares Schreibziel, dessen Inhalt nach jedem Block abgeholt wird"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Liefert die seit dem letzten Aufruf geschriebenen Bytes"""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ArchiveStream:
+    """
+    Baut ein Archiv Eintrag für Eintrag auf; jede Methode liefert die dabei
+    entstandenen Bytes als Generator, sodass sie sofort weitergegeben werden können.
+
+    ZIP-Einträge verwenden Datendeskriptoren (Größe und CRC hinter den Daten),
+    TAR-Einträge benötigen die Dateigröße vorab.
+    """
+
+    def __init__(self, archive_format="zip"):
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unbekanntes Archivformat: {archive_format}")
+        self.archive_format = archive_format
+        self._sink = _ArchiveSink()
+        if archive_format == "zip":
+            self._archive = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED)
+        else:
+            mode = "w|gz" if archive_format == "tar.gz" else "w|"
+            self._archive = tarfile.open(fileobj=self._sink, mode=mode)
+
+    @property
+    def mimetype(self):
+        return ARCHIVE_FORMATS[self.archive_format][0]
+
+    @property
+    def extension(self):
+        return ARCHIVE_FORMATS[self.archive_format][1]
+
+    def add_file(self, name, path):
+        """
+        Fügt eine Datei blockweise hinzu
+
+        Args:
+            name: Name im Archiv
+            path: Pfad der Datei
+
+        Yields:
+            bytes: Geschriebene Archivdaten
+        """
+        size = os.path.getsize(path)
+        with open(path, "rb") as source:
+            yield from self._add(name, source, size)
+
+    def add_bytes(self, name, data):
+        """Fügt einen kleinen Eintrag aus dem Speicher hinzu (z.B. ein Manifest)"""
+        yield from self._add(name, io.BytesIO(data), len(data))
+
+    def _add(self, name, source, size):
+        if self.archive_format == "zip":
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = (
+                zipfile.ZIP_STORED if name.lower().endswith(STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+            )
+            info.file_size = size
+            with self._archive.open(info, "w", force_zip64=size > zipfile.ZIP64_LIMIT) as target:
+                yield from self._copy(source, target)
+        else:
+            # Wie TarFile.addfile, aber blockweise, damit der Eintrag nicht komplett im Speicher landet
+            info = tarfile.TarInfo(name)
+            info.size = size
+            info.mtime = int(time.time())
+            archive = self._archive
+            header = info.tobuf(archive.format, archive.encoding, archive.errors)
+            archive.fileobj.write(header)
+            yield from self._copy(source, archive.fileobj)
+            blocks, remainder = divmod(size, tarfile.BLOCKSIZE)
+            if remainder:
+                archive.fileobj.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+                blocks += 1
+            archive.offset += len(header) + blocks * tarfile.BLOCKSIZE
+        data = self._sink.drain()
+        if data:
+            yield data
+
+    def _copy(self, source, target):
+        """Kopiert source blockweise nach target und liefert die jeweils geschriebenen Bytes"""
+        while True:
+            chunk = source.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            target.write(chunk)
+            data = self._sink.drain()
+            if data:
+                yield data
+
+    def close(self):
+        """Schließt das Archiv (ZIP-Verzeichnis bzw. TAR-Ende) und liefert die letzten Bytes"""
+        self._archive.close()
+        data = self._sink.drain()
+        if data:
+            yield data
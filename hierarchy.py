@@ -0,0 +1,64 @@
+"""
+Standorthierarchie (hierarchy.py) für HVAC Classifier
+Baut die Hierarchie Stockwerk -> Raum -> Komponente aus Abfragezeilen auf;
+gemeinsam genutzt von der Flask-Anwendung und der asynchronen Lese-API
+"""
+
+
+def hierarchy_filter_key(electronic_only=False, system_id=None):
+    """Schlüssel einer Filterkombination für gespeicherte Hierarchien"""
+    return f"electronic_only={int(bool(electronic_only))};system_id={system_id if system_id is not None else ''}"
+
+
+def create_hierarchy_from_rows(rows):
+    """
+    Erstellt eine hierarchische Struktur aus den Komponenten nach Standort
+
+    Args:
+        rows: Zeilen (id, name, ifc_class, bas_code, is_electronic,
+              storey_id, storey_name, space_id, space_name)
+
+    Returns:
+        dict: Hierarchische Struktur nach Stockwerk und Raum
+    """
+    hierarchy = {}
+
+    for (component_id, name, ifc_class, bas_code, is_electronic,
+         storey_id, storey_name, space_id, space_name) in rows:
+        element = {
+            "id": component_id,
+            "name": name,
+            "type": ifc_class,
+            "bas_code": bas_code,
+            "is_electronic": is_electronic
+        }
+
+        if storey_id is None and storey_name is None and space_name is None:
+            # Komponenten ohne Standortinformation unter "Unbekannter Standort" sammeln
+            storey_name = "Unbekannter Standort"
+
+        # Stockwerk hinzufügen, falls noch nicht vorhanden
+        if storey_name not in hierarchy:
+            hierarchy[storey_name] = {
+                "id": storey_id,
+                "name": storey_name,
+                "type": "storey",
+                "children": {}
+            }
+
+        # Wenn Raum vorhanden, Komponente zum Raum hinzufügen
+        if space_name:
+            # Raum hinzufügen, falls noch nicht vorhanden
+            if space_name not in hierarchy[storey_name]["children"]:
+                hierarchy[storey_name]["children"][space_name] = {
+                    "id": space_id,
+                    "name": space_name,
+                    "type": "space",
+                    "children": {}
+                }
+            hierarchy[storey_name]["children"][space_name]["children"][str(component_id)] = element
+        else:
+            # Komponente direkt dem Stockwerk hinzufügen, wenn kein Raum vorhanden
+            hierarchy[storey_name]["children"][str(component_id)] = element
+
+    return hierarchy
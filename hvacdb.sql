@@ -2,16 +2,23 @@
 Angepasste SQL-Struktur mit zusätzlichen Tabellen für Standorte, BAS-Codes und Sessions
 """
 
+-- Erweiterung für die Textsuche (Trigramm-Indizes)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Tabelle für IFC-Modelle
 CREATE TABLE ifc_models (
   id SERIAL PRIMARY KEY,
   filename VARCHAR NOT NULL,
-  uploaded_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now()
+  uploaded_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+  revision INTEGER NOT NULL DEFAULT 1,
+  updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+  processing_key VARCHAR(64)
 );
 
 -- Tabelle für Standortinformationen
 CREATE TABLE locations (
   id SERIAL PRIMARY KEY,
+  model_id INTEGER REFERENCES ifc_models(id) ON DELETE CASCADE,
   storey_id INTEGER,
   storey_name VARCHAR,
   space_id INTEGER,
@@ -35,21 +42,54 @@ CREATE TABLE classification_mappings (
   amev_code VARCHAR
 );
 
+-- Geteilte Eigenschaftsblöcke (z.B. PropertySets von Typobjekten)
+CREATE TABLE property_blocks (
+  id SERIAL PRIMARY KEY,
+  block_key VARCHAR(40) UNIQUE NOT NULL,
+  properties JSONB NOT NULL
+);
+
 -- Erweiterte Tabelle für HVAC-Komponenten
 CREATE TABLE hvac_components (
   id SERIAL PRIMARY KEY,
-  global_id VARCHAR UNIQUE NOT NULL,
+  global_id VARCHAR NOT NULL,
   name VARCHAR,
   ifc_class VARCHAR NOT NULL,
   object_type VARCHAR,
-  properties JSON,
+  properties JSONB,
   is_electronic BOOLEAN DEFAULT FALSE,
   bas_code VARCHAR,
   bas_standard VARCHAR,
   model_id INTEGER REFERENCES ifc_models(id) ON DELETE CASCADE,
   system_id INTEGER REFERENCES distribution_systems(id) ON DELETE SET NULL,
   mapping_id INTEGER REFERENCES classification_mappings(id) ON DELETE SET NULL,
-  location_id INTEGER REFERENCES locations(id) ON DELETE SET NULL
+  location_id INTEGER REFERENCES locations(id) ON DELETE SET NULL,
+  type_properties_id INTEGER REFERENCES property_blocks(id) ON DELETE SET NULL
+);
+
+-- Verbindungsgraph (CSR-Arrays) je Modell
+CREATE TABLE model_graphs (
+  id SERIAL PRIMARY KEY,
+  model_id INTEGER UNIQUE NOT NULL REFERENCES ifc_models(id) ON DELETE CASCADE,
+  node_count INTEGER NOT NULL,
+  edge_count INTEGER NOT NULL,
+  node_keys JSON NOT NULL,
+  node_types JSON NOT NULL,
+  type_codes BYTEA NOT NULL,
+  indptr BYTEA NOT NULL,
+  indices BYTEA NOT NULL,
+  labels BYTEA NOT NULL,
+  built_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now()
+);
+
+-- Vorberechnete Standorthierarchien je Modell und Filterkombination
+CREATE TABLE model_hierarchies (
+  id SERIAL PRIMARY KEY,
+  model_id INTEGER NOT NULL REFERENCES ifc_models(id) ON DELETE CASCADE,
+  filter_key VARCHAR NOT NULL,
+  data BYTEA NOT NULL,
+  created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+  CONSTRAINT uq_model_hierarchies_model_filter UNIQUE (model_id, filter_key)
 );
 
 -- Tabelle für Flask-Sessions
@@ -59,10 +99,16 @@ CREATE TABLE flask_sessions (
   expiry TIMESTAMP(6) WITHOUT TIME ZONE NOT NULL
 );
 
--- Indizes für schnellere Abfragen
-CREATE INDEX idx_hvac_components_model_id ON hvac_components(model_id);
-CREATE INDEX idx_hvac_components_is_electronic ON hvac_components(is_electronic);
-CREATE INDEX idx_hvac_components_ifc_class ON hvac_components(ifc_class);
+-- Indizes für schnellere Abfragen (GlobalIds sind nur je Modell eindeutig)
+CREATE UNIQUE INDEX uq_hvac_components_model_global_id ON hvac_components(model_id, global_id);
+CREATE INDEX ix_hvac_components_model_electronic ON hvac_components(model_id, is_electronic);
+CREATE INDEX ix_hvac_components_model_ifc_class ON hvac_components(model_id, ifc_class);
+CREATE INDEX ix_hvac_components_ifc_class ON hvac_components(ifc_class);
+CREATE INDEX ix_hvac_components_properties ON hvac_components USING gin (properties jsonb_path_ops);
+CREATE INDEX ix_hvac_components_name_trgm ON hvac_components USING gin (lower(name) gin_trgm_ops);
+CREATE INDEX ix_hvac_components_bas_code_trgm ON hvac_components USING gin (lower(bas_code) gin_trgm_ops);
+CREATE INDEX ix_property_blocks_properties ON property_blocks USING gin (properties jsonb_path_ops);
+CREATE UNIQUE INDEX uq_locations_model_storey_space ON locations(model_id, COALESCE(storey_id, -1), COALESCE(space_id, -1));
 CREATE INDEX idx_flask_sessions_expiry ON flask_sessions(expiry);
 
 -- Standard-Kategoriemappings einfügen
@@ -0,0 +1,106 @@
+"""
+JSON-Backend (json_provider.py) für HVAC Classifier
+Flask-JSON-Provider mit orjson (falls installiert) oder der Standardbibliothek;
+Antworten sind kompakt, eingerückt nur mit ?indent=<n>
+"""
+
+import json
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Obergrenze für ?indent=
+MAX_INDENT = 8
+
+
+def requested_indent():
+    """Einrückung aus dem Anfrageparameter indent (1-8) oder None für kompakte Ausgabe"""
+    if not has_request_context():
+        return None
+    value = request.args.get("indent", "")
+    if not value.isdigit() or int(value) == 0:
+        return None
+    return min(int(value), MAX_INDENT)
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """JSON über die Standardbibliothek; kompakte Antworten unabhängig vom Debug-Modus"""
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = requested_indent()
+        if indent:
+            data = self.dumps(obj, indent=indent) + "\n"
+        else:
+            data = self.dumps(obj, separators=(",", ":"))
+        return self._app.response_class(data, mimetype=self.mimetype)
+
+    def engine_options(self):
+        """Zusätzliche Engine-Optionen für JSON-Spalten (Standard: json der Standardbibliothek)"""
+        return {}
+
+
+class OrjsonProvider(StdlibJSONProvider):
+    """
+    JSON über orjson. Ausgabe wie StdlibJSONProvider (sortierte Schlüssel, Datumswerte
+    im HTTP-Format), aber ohne ASCII-Escapes und eingerückt immer mit zwei Leerzeichen.
+    """
+
+    def dumps_bytes(self, obj, indent=None, sort_keys=None, default=None):
+        """Serialisiert direkt nach UTF-8-Bytes (ohne Umweg über str)"""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, default=default or self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        if "cls" in kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(
+            obj,
+            indent=kwargs.get("indent"),
+            sort_keys=kwargs.get("sort_keys"),
+            default=kwargs.get("default")
+        ).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self.dumps_bytes(obj, indent=requested_indent()),
+            mimetype=self.mimetype
+        )
+
+    def engine_options(self):
+        # Nur Lesen: Eigenschaften aus IFC-Dateien werden weiter mit json.dumps geschrieben
+        return {"json_deserializer": orjson.loads}
+
+
+def json_provider_class(backend="auto"):
+    """
+    Wählt die Provider-Klasse
+
+    Args:
+        backend: "auto" (orjson, falls installiert), "orjson" oder "stdlib"
+
+    Returns:
+        type: Unterklasse von DefaultJSONProvider
+    """
+    if backend == "stdlib":
+        return StdlibJSONProvider
+    if backend == "orjson" and orjson is None:
+        raise RuntimeError("JSON_BACKEND=orjson benötigt die orjson-Bibliothek, die nicht installiert ist.")
+    if backend not in ("auto", "orjson"):
+        raise RuntimeError(f"Unbekanntes JSON_BACKEND: {backend}")
+    return OrjsonProvider if orjson is not None else StdlibJSONProvider
@@ -5,22 +5,48 @@ Angepasste Hauptanwendung (main.py) mit Integration aller Komponenten
 import os
 import sys
 import json
+import gzip
+import zlib
+import hashlib
+import tempfile
+import click
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 import ifcopenshell
-from flask import Flask, request, render_template, jsonify, send_from_directory, flash, redirect, url_for, Response, session
+from flask import Flask, request, render_template, jsonify, send_from_directory, flash, redirect, url_for, Response, session, stream_with_context, make_response
 from werkzeug.utils import secure_filename
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from flask_migrate import Migrate
 from flask_session import Session
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Import der eigenen Module
-from models import db, IFCModel, HVACComponent, Location, ClassificationMapping, DistributionSystem
+from models import db, use_read_replica, READ_REPLICA_BIND, IFCModel, HVACComponent, Location, ClassificationMapping, DistributionSystem, ModelGraph, PropertyBlock, ModelHierarchy, COMPONENT_DICT_COLUMNS, component_dict, merge_properties
 from classifier.location_extractor import LocationExtractor
 from classifier.hvac_rules import HVACClassifier
-from classifier.hvac_extractor import HVACExtractor
+from classifier.hvac_extractor import HVACExtractor, HVAC_TYPES, ELECTRONIC_TYPES
+from classifier.property_extractor import PropertyExtractor
+from classifier.step_prescan import prescan_step_file
 from classifier.bas_converter import BASConverter
+from classifier.connectivity_graph import ConnectivityGraph
+from hierarchy import create_hierarchy_from_rows, hierarchy_filter_key
+from json_provider import json_provider_class
 
 # Konfiguration
 from config import Config
+from columnar_store import ColumnarStore, GROUP_KEYS
+from export_archive import ArchiveStream, ARCHIVE_FORMATS
+from response_cache import ResponseCache
+from processing_lock import ModelLock, RequestCoalescer, processing_key
+from upload_store import UploadStore, UploadError, UploadOffsetMismatch, COMPRESSED_SUFFIXES, compression_for, ifc_filename
 
 # Absolute Pfade zu den Verzeichnissen
 template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), 'web_interface', 'templates'))
@@ -31,12 +57,30 @@ app = Flask(__name__,
             template_folder=template_dir,
             static_folder=static_dir)
 app.config.from_object(Config)
+app.json = json_provider_class(app.config['JSON_BACKEND'])(app)  # orjson, falls installiert
+# JSON-Spalten (Eigenschaften) mit demselben Backend lesen
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**app.config['SQLALCHEMY_ENGINE_OPTIONS'], **app.json.engine_options()}
+app.config['SQLALCHEMY_BINDS'] = {
+    key: {**options, **app.json.engine_options()} for key, options in app.config['SQLALCHEMY_BINDS'].items()
+}
 app.secret_key = "hvac-classifier-secret-key"  # Für Flash-Nachrichten
 
-# Session-Konfiguration für PostgreSQL
-app.config['SESSION_TYPE'] = 'sqlalchemy'
-app.config['SESSION_SQLALCHEMY'] = db  # Deine SQLAlchemy-Datenbank-Instanz
-app.config['SESSION_SQLALCHEMY_TABLE'] = 'flask_sessions'  # Name der Tabelle in PostgreSQL
+# Session-Konfiguration (Backend über SESSION_BACKEND, Standard: PostgreSQL)
+session_backend = app.config['SESSION_BACKEND']
+if session_backend == 'sqlalchemy':
+    app.config['SESSION_TYPE'] = 'sqlalchemy'
+    app.config['SESSION_SQLALCHEMY'] = db  # Deine SQLAlchemy-Datenbank-Instanz
+    app.config['SESSION_SQLALCHEMY_TABLE'] = 'flask_sessions'  # Name der Tabelle in PostgreSQL
+elif session_backend == 'redis':
+    # Redis oder ein kompatibler Server (z.B. Valkey, KeyDB) auf dem lokalen Rechner
+    try:
+        import redis
+    except ImportError:
+        raise RuntimeError('SESSION_BACKEND=redis benötigt die redis-Bibliothek, die nicht installiert ist.')
+    app.config['SESSION_TYPE'] = 'redis'
+    app.config['SESSION_REDIS'] = redis.from_url(app.config['SESSION_REDIS_URL'])
+elif session_backend != 'cookie':
+    raise RuntimeError(f'Unbekanntes SESSION_BACKEND: {session_backend}')
 app.config['SESSION_PERMANENT'] = True
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)  # Session hält eine Woche
 app.config['SESSION_USE_SIGNER'] = True  # Signiere die Session-Cookie-Daten
@@ -46,8 +90,9 @@ app.config['SESSION_KEY_PREFIX'] = 'hvac_'  # Präfix für Session-Schlüssel
 db.init_app(app)
 migrate = Migrate(app, db)
 
-# Session initialisieren (nach db.init_app!)
-Session(app)
+# Session initialisieren (nach db.init_app!); "cookie" nutzt Flasks signierte Cookie-Session
+if session_backend != 'cookie':
+    Session(app)
 
 # Verzeichnisse
 UPLOAD_FOLDER = os.path.join(app.root_path, 'uploads')
@@ -58,12 +103,174 @@ for directory in [UPLOAD_FOLDER, SAMPLES_FOLDER]:
     if not os.path.exists(directory):
         os.makedirs(directory)
 
-# Erlaubte Dateierweiterungen
-ALLOWED_EXTENSIONS = {'ifc'}
+# Inhaltsadressierter Speicher für Uploads (keine Überschreibungen bei gleichen Dateinamen)
+upload_store = UploadStore(
+    UPLOAD_FOLDER,
+    max_size=app.config['UPLOAD_MAX_SIZE'],
+    chunk_size=app.config['UPLOAD_CHUNK_SIZE']
+)
+
+# Spaltendateien der Klassifikationsergebnisse für Auswertungen über viele Modelle
+columnar_store = ColumnarStore(os.path.join(app.root_path, 'columnar'))
+
+# Sperre je Modell und Zusammenfassung identischer Verarbeitungen
+model_lock = ModelLock(os.path.join(app.root_path, 'locks'))
+processing_coalescer = RequestCoalescer()
+
+# Serialisierte Antworten häufig abgefragter Modelle (je Prozess, Schlüssel enthält die Revision)
+response_cache = ResponseCache(app.config['RESPONSE_CACHE_SIZE'], app.config['RESPONSE_CACHE_TTL'])
+
+# Erlaubte Dateierweiterungen (unkomprimiert und komprimiert)
+ALLOWED_EXTENSIONS = {'.ifc'} | set(COMPRESSED_SUFFIXES)
 
 def allowed_file(filename):
     """Prüft, ob die Dateierweiterung erlaubt ist"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(tuple(ALLOWED_EXTENSIONS))
+
+def model_version(model_id, revision, updated_at):
+    """
+    Versionskennung eines Modells für ETags
+    
+    Enthält neben der Revision den Änderungszeitpunkt, weil z.B. SQLite die IDs
+    gelöschter Modelle wiederverwendet und ein neues Modell wieder mit Revision 1 beginnt.
+    """
+    return f"m{model_id}r{revision}t{updated_at.isoformat() if updated_at else ''}"
+
+def model_state(model_id):
+    """
+    Stand eines Modells für bedingte Anfragen
+    
+    Returns:
+        tuple: (Modell-ID, Versionskennung, Zeitpunkt der letzten Änderung) oder None, wenn das Modell fehlt
+    """
+    row = db.session.query(IFCModel.revision, IFCModel.updated_at).filter(IFCModel.id == model_id).first()
+    if row is None:
+        return None
+    return model_id, model_version(model_id, row.revision, row.updated_at), row.updated_at
+
+def component_state(component_id):
+    """Stand des Modells, zu dem eine Komponente gehört (siehe model_state)"""
+    row = (
+        db.session.query(IFCModel.id, IFCModel.revision, IFCModel.updated_at)
+        .join(HVACComponent, HVACComponent.model_id == IFCModel.id)
+        .filter(HVACComponent.id == component_id)
+        .first()
+    )
+    if row is None:
+        return None
+    return row.id, model_version(row.id, row.revision, row.updated_at), row.updated_at
+
+def all_models_state():
+    """Stand aller Modelle (für modellübergreifende Statistiken, siehe model_state)"""
+    count, max_id, revisions, updated_at = db.session.query(
+        db.func.count(IFCModel.id),
+        db.func.max(IFCModel.id),
+        db.func.sum(IFCModel.revision),
+        db.func.max(IFCModel.updated_at)
+    ).one()
+    return None, f"n{count}i{max_id}r{revisions}t{updated_at.isoformat() if updated_at else ''}", updated_at
+
+def not_modified(etag, last_modified):
+    """Antwort 304 mit den Validatoren der gespeicherten Antwort"""
+    response = Response(status=304)
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def conditional_response(state):
+    """
+    Decorator: Starke ETags und Last-Modified für Antworten, die nur vom Stand der
+    Modelle abhängen; bei passendem If-None-Match/If-Modified-Since wird 304
+    geliefert, ohne die Antwort zu berechnen. Vollständig erzeugte Antworten
+    landen unter ihrem ETag im response_cache.
+    
+    Args:
+        state: Funktion der URL-Parameter der Route -> (Modell-ID, Versionskennung,
+               Änderungszeitpunkt) oder None
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            current = state(**kwargs)
+            if current is None:
+                # Unbekanntes Modell: Die Route liefert selbst 404
+                return view(*args, **kwargs)
+            model_id, version, last_modified = current
+            
+            # Die Darstellung hängt von Pfad und Parametern ab (Filter, Format, Seite)
+            etag = hashlib.sha1(
+                f"{version}|{request.path}?{request.query_string.decode('latin-1')}".encode('utf-8')
+            ).hexdigest()
+            
+            if request.if_none_match:
+                # Auch komprimierte Varianten (siehe compress_response) gelten als aktuell
+                for candidate in (etag, f"{etag}-br", f"{etag}-gzip"):
+                    if request.if_none_match.contains(candidate):
+                        return not_modified(candidate, last_modified)
+            elif request.if_modified_since and last_modified:
+                if last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since:
+                    return not_modified(etag, last_modified)
+            
+            cached = response_cache.get(etag) if response_cache.enabled else None
+            if cached is not None:
+                response = Response(cached.body, status=cached.status, headers=cached.headers)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed and not response.direct_passthrough:
+                    headers = [(name, value) for name, value in response.headers if name != 'Content-Length']
+                    response_cache.set(etag, response.status_code, headers, response.get_data(), tag=model_id)
+            
+            if response.status_code == 200:
+                response.set_etag(etag)
+                if last_modified:
+                    response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+                # Zwischenspeichern erlaubt, aber immer erst beim Server nachfragen
+                response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+model_conditional = conditional_response(lambda model_id, **_: model_state(model_id))
+
+# Antworttypen, die beim Ausliefern komprimiert werden
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/csv'}
+
+@app.after_request
+def compress_response(response):
+    """Komprimiert große JSON-/CSV-Antworten mit Brotli (falls installiert) oder gzip"""
+    if (
+        not app.config['RESPONSE_COMPRESSION']
+        or response.status_code != 200
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+    ):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if response.content_length is None or response.content_length < app.config['RESPONSE_COMPRESSION_MIN_SIZE']:
+        return response
+    
+    encoding = request.accept_encodings.best_match(['br', 'gzip'] if brotli is not None else ['gzip'])
+    if encoding is None:
+        return response
+    
+    data = response.get_data()
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=5))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = encoding
+    
+    # Starke ETags unterscheiden sich je Kodierung
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
 
 @app.route('/')
 def index():
@@ -97,8 +304,12 @@ def upload_file():
     
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(filepath)
+        try:
+            stored = upload_store.save_stream(file.stream, compression=compression_for(filename))
+            filename = ifc_filename(filename)
+        except UploadError as e:
+            flash(f'Fehler beim Hochladen: {str(e)}', 'error')
+            return redirect(url_for('index'))
         
         # Standard
         standard = request.form.get('standard', 'amev')
@@ -106,14 +317,14 @@ def upload_file():
         
         # Verarbeite die Datei
         try:
-            model_id = process_ifc_file(filepath, filename, standard, electronic_only)
+            model_id = process_ifc_file(stored.path, filename, standard, electronic_only, content_hash=stored.sha256)
             flash(f'Datei "{filename}" erfolgreich verarbeitet', 'success')
             return redirect(url_for('view_model', model_id=model_id))
         except Exception as e:
             flash(f'Fehler bei der Verarbeitung: {str(e)}', 'error')
             return redirect(url_for('index'))
     else:
-        flash('Nicht erlaubter Dateityp. Nur IFC-Dateien sind erlaubt.', 'error')
+        flash('Nicht erlaubter Dateityp. Nur IFC-Dateien (.ifc, .ifczip, .ifc.gz, .ifc.zst) sind erlaubt.', 'error')
         return redirect(request.url)
     
 @app.route('/debug/session')
@@ -140,60 +351,182 @@ def api_upload_file():
     
     if file and allowed_file(file.filename):
         filename = secure_filename(file.filename)
-        filepath = os.path.join(UPLOAD_FOLDER, filename)
-        file.save(filepath)
-        
-        # Standard
-        standard = request.form.get('standard', 'amev')
-        electronic_only = request.form.get('electronic_only', 'true').lower() == 'true'
-        
-        # Verarbeite die Datei
         try:
-            model_id = process_ifc_file(filepath, filename, standard, electronic_only)
-            
-            # Lade das verarbeitete Modell mit seinen Komponenten
-            model = IFCModel.query.get(model_id)
-            components = HVACComponent.query.filter_by(model_id=model_id).all()
-            
-            # Hierarchische Struktur erstellen
-            hierarchy = create_hierarchy_from_components(components)
-            
-            # Ergebnisse zurückgeben
-            return jsonify({
-                'model_id': model_id,
-                'filename': model.filename,
-                'uploaded_at': model.uploaded_at.isoformat(),
-                'component_count': len(components),
-                'flat_results': [component.to_dict() for component in components],
-                'hierarchy': hierarchy
-            })
+            stored = upload_store.save_stream(file.stream, compression=compression_for(filename))
+            filename = ifc_filename(filename)
+        except UploadError as e:
+            return jsonify({'error': str(e)}), e.status_code
         
-        except Exception as e:
-            return jsonify({'error': str(e)}), 500
+        return process_upload_response(stored, filename, request.form)
     else:
-        return jsonify({'error': 'Nicht erlaubter Dateityp. Nur IFC-Dateien sind erlaubt.'}), 400
+        return jsonify({'error': 'Nicht erlaubter Dateityp. Nur IFC-Dateien (.ifc, .ifczip, .ifc.gz, .ifc.zst) sind erlaubt.'}), 400
+
+def process_upload_response(stored, filename, options):
+    """
+    Verarbeitet eine vollständig gespeicherte Datei und liefert die API-Antwort
+    
+    Args:
+        stored: StoredUpload aus dem Upload-Speicher
+        filename: Ursprünglicher (bereinigter) Dateiname
+        options: Formular- oder JSON-Werte mit standard und electronic_only
+        
+    Returns:
+        Response: JSON mit Modell, Komponenten und Hierarchie
+    """
+    # Standard
+    standard = options.get('standard', 'amev')
+    electronic_only = str(options.get('electronic_only', 'true')).lower() == 'true'
+    
+    # Verarbeite die Datei
+    try:
+        model_id = process_ifc_file(stored.path, filename, standard, electronic_only, content_hash=stored.sha256)
+        
+        # Lade das verarbeitete Modell mit seinen Komponenten
+        model = IFCModel.query.get(model_id)
+        components = component_dicts(HVACComponent.query.filter_by(model_id=model_id))
+        
+        # Bei der Verarbeitung vorberechnete Hierarchie laden
+        hierarchy = json.loads(get_model_hierarchy_json(model_id))
+        
+        # Ergebnisse zurückgeben
+        return jsonify({
+            'model_id': model_id,
+            'filename': model.filename,
+            'uploaded_at': model.uploaded_at.isoformat(),
+            'sha256': stored.sha256,
+            'component_count': len(components),
+            'flat_results': components,
+            'hierarchy': hierarchy
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/prescan', methods=['POST'])
+def api_prescan_file():
+    """
+    Liefert Schema, Dateigröße und Entitätsanzahlen einer IFC-Datei per Vorabscan,
+    ohne die Datei zu parsen (die Datei wird nur temporär gespeichert und danach gelöscht)
+    """
+    if 'file' not in request.files:
+        return jsonify({'error': 'Keine Datei hochgeladen'}), 400
+    
+    file = request.files['file']
+    filename = secure_filename(file.filename)
+    if not filename or not allowed_file(filename):
+        return jsonify({'error': 'Nicht erlaubter Dateityp. Nur IFC-Dateien (.ifc, .ifczip, .ifc.gz, .ifc.zst) sind erlaubt.'}), 400
+    
+    try:
+        with upload_store.temporary_stream(file.stream, compression=compression_for(filename)) as stored:
+            scan = prescan_step_file(stored.path)
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    
+    result = scan.to_dict()
+    result['filename'] = ifc_filename(filename)
+    result['sha256'] = stored.sha256
+    result['hvac_statistics'] = scan.hvac_statistics(HVAC_TYPES, ELECTRONIC_TYPES)
+    result['has_hvac'] = result['hvac_statistics']['total_elements'] > 0
+    return jsonify(result)
+
+@app.route('/api/uploads', methods=['POST'])
+def api_start_upload():
+    """
+    Startet einen fortsetzbaren Upload in Teilstücken (für sehr große Dateien)
+    
+    JSON: filename, optional size (Gesamtgröße in Bytes)
+    """
+    data = request.get_json(silent=True) or {}
+    filename = secure_filename(data.get('filename', ''))
+    if not filename or not allowed_file(filename):
+        return jsonify({'error': 'Nicht erlaubter Dateityp. Nur IFC-Dateien (.ifc, .ifczip, .ifc.gz, .ifc.zst) sind erlaubt.'}), 400
+    
+    size = data.get('size')
+    try:
+        upload_id = upload_store.start_session(filename, int(size) if size is not None else None)
+    except (UploadError, ValueError) as e:
+        return jsonify({'error': str(e)}), getattr(e, 'status_code', 400)
+    
+    return jsonify({
+        'upload_id': upload_id,
+        'chunk_size': upload_store.chunk_size,
+        'max_size': upload_store.max_size
+    }), 201
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+def api_upload_status(upload_id):
+    """Liefert den Stand eines fortsetzbaren Uploads (received = nächster Offset)"""
+    try:
+        return jsonify(upload_store.session_status(upload_id))
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status_code
+
+@app.route('/api/uploads/<upload_id>', methods=['PUT'])
+def api_upload_chunk(upload_id):
+    """
+    Nimmt ein Teilstück als Rohdaten im Anfragekörper an
+    
+    Query-Parameter: offset (Position des Teilstücks, muss dem bisherigen Stand entsprechen)
+    """
+    offset = request.args.get('offset', type=int)
+    if offset is None:
+        return jsonify({'error': 'Parameter offset fehlt'}), 400
+    
+    try:
+        received = upload_store.append_chunk(upload_id, offset, request.stream)
+    except UploadError as e:
+        response = {'error': str(e)}
+        if isinstance(e, UploadOffsetMismatch):
+            # Client setzt an dieser Position fort
+            response['received'] = e.expected
+        return jsonify(response), e.status_code
+    
+    return jsonify({'upload_id': upload_id, 'received': received})
+
+@app.route('/api/uploads/<upload_id>', methods=['DELETE'])
+def api_abort_upload(upload_id):
+    """Verwirft einen fortsetzbaren Upload"""
+    try:
+        upload_store.abort_session(upload_id)
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    return '', 204
+
+@app.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+def api_complete_upload(upload_id):
+    """
+    Schließt einen fortsetzbaren Upload ab und verarbeitet die Datei erst danach
+    
+    JSON: optional sha256 (Prüfsumme), standard, electronic_only
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        stored, filename = upload_store.complete_session(upload_id, expected_sha256=data.get('sha256'))
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status_code
+    
+    return process_upload_response(stored, filename, data)
 
 @app.route('/model/<int:model_id>')
+@use_read_replica
 def view_model(model_id):
     """Zeigt Details eines verarbeiteten Modells an"""
     model = IFCModel.query.get_or_404(model_id)
-    components = HVACComponent.query.filter_by(model_id=model_id).all()
-    
-    # Systeme für Filter
-    systems = DistributionSystem.query.all()
     
-    # Zähler für elektronische Komponenten
-    electronic_count = sum(1 for c in components if c.is_electronic)
+    # Nur Kennzahlen laden; die Tabelle wird über /api/model/<id>/components seitenweise geladen
+    component_count, electronic_count, bas_standard = model_component_summary(model_id)
     
     return render_template(
         'model_details.html',
         model=model,
-        components=components,
-        systems=systems,
-        electronic_count=electronic_count
+        component_count=component_count,
+        electronic_count=electronic_count,
+        bas_standard=bas_standard
     )
 
 @app.route('/export/model/<int:model_id>')
+@use_read_replica
+@model_conditional
 def export_model_data(model_id):
     """Exportiert Modelldaten in verschiedenen Formaten"""
     format_type = request.args.get('format', 'csv')
@@ -204,47 +537,610 @@ def export_model_data(model_id):
     # Lade das Modell
     model = IFCModel.query.get_or_404(model_id)
     
-    # Lade die Komponenten
-    components = HVACComponent.query.filter_by(model_id=model_id).all()
-    
-    # Formatspezifische Exportlogik
+    # Alle Formate lesen nur die benötigten Spalten direkt aus einem Datenbank-Cursor (ohne ORM-Objekte)
+    if format_type in ('parquet', 'arrow'):
+        return export_arrow(model, format_type, include_properties, include_location, filtered_only)
+    if format_type == 'xlsx':
+        return export_excel(model, include_properties, include_location, filtered_only)
+    if format_type == 'json':
+        return export_json(model, include_properties, include_location, filtered_only)
     if format_type == 'csv':
-        return export_csv(model, components, include_properties, include_location)
-    elif format_type == 'json':
-        return export_json(model, components, include_properties, include_location)
-    elif format_type == 'xlsx':
-        return export_excel(model, components, include_properties, include_location)
-    else:
-        flash('Unbekanntes Exportformat.', 'error')
-        return redirect(url_for('view_model', model_id=model_id))
+        return export_csv(model, include_properties, include_location, filtered_only)
+    
+    flash('Unbekanntes Exportformat.', 'error')
+    return redirect(url_for('view_model', model_id=model_id))
+
+@app.route('/export/models')
+def export_models_archive():
+    """Exportiert mehrere Modelle als ein ZIP- oder TAR-Archiv (eine Datei je Modell)"""
+    model_ids = request.args.getlist('model_id', type=int)
+    format_type = request.args.get('format', 'csv')
+    archive_format = request.args.get('archive', 'zip')
+    options = {
+        'properties': request.args.get('properties', 'true'),
+        'location': request.args.get('location', 'true')
+    }
+    
+    if not model_ids:
+        return jsonify({'error': 'Keine Modelle ausgewählt (Parameter model_id)'}), 400
+    if archive_format not in ARCHIVE_FORMATS:
+        return jsonify({'error': f'Unbekanntes Archivformat: {archive_format}'}), 400
+    error = check_export_format(format_type)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    # Reihenfolge der Anfrage beibehalten, Duplikate entfernen
+    model_ids = list(dict.fromkeys(model_ids))
+    found = {row.id for row in IFCModel.query.with_entities(IFCModel.id).filter(IFCModel.id.in_(model_ids))}
+    missing = [model_id for model_id in model_ids if model_id not in found]
+    if missing:
+        return jsonify({'error': 'Modelle nicht gefunden', 'model_ids': missing}), 404
+    
+    archive = ArchiveStream(archive_format)
+    filename = f"hvac_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{archive.extension}"
+    
+    return Response(
+        generate_model_archive(archive, model_ids, format_type, options),
+        mimetype=archive.mimetype,
+        headers={"Content-Disposition": f"attachment;filename={filename}"}
+    )
 
 @app.route('/api/model/<int:model_id>')
+@use_read_replica
+@model_conditional
 def api_model_data(model_id):
     """API-Endpunkt für Modelldaten"""
     model = IFCModel.query.get_or_404(model_id)
-    components = HVACComponent.query.filter_by(model_id=model_id).all()
-    
-    # Filter anwenden
-    electronic_only = request.args.get('electronic_only', 'false').lower() == 'true'
-    if electronic_only:
-        components = [c for c in components if c.is_electronic]
+    electronic_only, system_id = hierarchy_filters_from_request()
     
-    system_id = request.args.get('system_id')
-    if system_id and system_id.isdigit():
-        components = [c for c in components if c.system_id == int(system_id)]
+    # Filter anwenden (Zeilentupel statt ORM-Objekten)
+    components = component_dicts(filtered_components_query(model_id, electronic_only, system_id))
     
-    # Hierarchische Struktur erstellen
-    hierarchy = create_hierarchy_from_components(components)
+    # Vorberechnete Hierarchie laden
+    hierarchy = app.json.loads(get_model_hierarchy_json(model_id, electronic_only, system_id))
     
     return jsonify({
         'model_id': model.id,
         'filename': model.filename,
         'uploaded_at': model.uploaded_at.isoformat(),
         'component_count': len(components),
-        'flat_results': [component.to_dict() for component in components],
+        'flat_results': components,
         'hierarchy': hierarchy
     })
 
+@app.route('/api/model/<int:model_id>', methods=['DELETE'])
+def api_delete_model(model_id):
+    """Löscht ein Modell mit allen Komponenten"""
+    deleted_components = delete_model(model_id)
+    if deleted_components is None:
+        return jsonify({'error': 'Modell nicht gefunden'}), 404
+    return jsonify({'model_id': model_id, 'deleted_components': deleted_components})
+
+@app.route('/api/model/<int:model_id>/hierarchy')
+@model_conditional
+def api_model_hierarchy(model_id):
+    """API-Endpunkt für die vorberechnete Standorthierarchie eines Modells"""
+    IFCModel.query.get_or_404(model_id)
+    electronic_only, system_id = hierarchy_filters_from_request()
+    
+    # Gespeichertes JSON wird ohne erneute Serialisierung ausgeliefert
+    return Response(
+        get_model_hierarchy_json(model_id, electronic_only, system_id),
+        mimetype="application/json"
+    )
+
+@app.route('/api/model/<int:model_id>/storeys')
+@model_conditional
+def api_model_storeys(model_id):
+    """Liefert die Geschosse eines Modells mit Komponentenzahlen (erste Ebene des Standortbaums)"""
+    IFCModel.query.get_or_404(model_id)
+    electronic_only, system_id = hierarchy_filters_from_request()
+    
+    rows = (
+        filtered_components_query(model_id, electronic_only, system_id)
+        .outerjoin(HVACComponent.location)
+        .with_entities(
+            Location.storey_id,
+            db.func.max(Location.storey_name),
+            db.func.count(HVACComponent.id),
+            db.func.count(db.distinct(Location.space_id)),
+            db.func.sum(db.case((HVACComponent.is_electronic.is_(True), 1), else_=0))
+        )
+        .group_by(Location.storey_id)
+        .order_by(db.func.max(Location.storey_name))
+        .all()
+    )
+    
+    return jsonify({
+        'model_id': model_id,
+        'storeys': [
+            {
+                'storey_id': storey_id,
+                'name': storey_name if storey_id is not None else "Unbekannter Standort",
+                'component_count': component_count,
+                'space_count': space_count,
+                'electronic_count': int(electronic_count or 0)
+            }
+            for storey_id, storey_name, component_count, space_count, electronic_count in rows
+        ]
+    })
+
+@app.route('/api/model/<int:model_id>/storeys/<int:storey_id>/spaces')
+@model_conditional
+def api_model_storey_spaces(model_id, storey_id):
+    """Liefert die Räume eines Geschosses mit Komponentenzahlen"""
+    IFCModel.query.get_or_404(model_id)
+    electronic_only, system_id = hierarchy_filters_from_request()
+    
+    rows = (
+        filtered_components_query(model_id, electronic_only, system_id)
+        .join(HVACComponent.location)
+        .filter(Location.storey_id == storey_id)
+        .with_entities(
+            Location.space_id,
+            db.func.max(Location.space_name),
+            db.func.count(HVACComponent.id),
+            db.func.sum(db.case((HVACComponent.is_electronic.is_(True), 1), else_=0))
+        )
+        .group_by(Location.space_id)
+        .order_by(db.func.max(Location.space_name))
+        .all()
+    )
+    
+    spaces = []
+    direct_count = 0
+    for space_id, space_name, component_count, electronic_count in rows:
+        if space_id is None:
+            # Komponenten, die direkt dem Geschoss zugeordnet sind
+            direct_count = component_count
+            continue
+        spaces.append({
+            'space_id': space_id,
+            'name': space_name,
+            'component_count': component_count,
+            'electronic_count': int(electronic_count or 0)
+        })
+    
+    return jsonify({
+        'model_id': model_id,
+        'storey_id': storey_id,
+        'direct_component_count': direct_count,
+        'spaces': spaces
+    })
+
+@app.route('/api/model/<int:model_id>/spaces/<int:space_id>/components', defaults={'storey_id': None})
+@app.route('/api/model/<int:model_id>/storeys/<int:storey_id>/components', defaults={'space_id': None})
+@app.route('/api/model/<int:model_id>/storeys/none/components', defaults={'storey_id': None, 'space_id': None})
+@model_conditional
+def api_model_location_components(model_id, storey_id, space_id):
+    """
+    Liefert die Komponenten eines Raums, die direkt einem Geschoss zugeordneten
+    Komponenten oder die Komponenten ohne Standort bzw. Geschoss (seitenweise, ohne Eigenschaften)
+    """
+    IFCModel.query.get_or_404(model_id)
+    electronic_only, system_id = hierarchy_filters_from_request()
+    
+    query = filtered_components_query(model_id, electronic_only, system_id)
+    if space_id is not None:
+        query = query.join(HVACComponent.location).filter(Location.space_id == space_id)
+    elif storey_id is not None:
+        query = query.join(HVACComponent.location).filter(
+            Location.storey_id == storey_id, Location.space_id.is_(None)
+        )
+    else:
+        # Wie der Eintrag "Unbekannter Standort" in /storeys: ohne Standort oder ohne Geschoss
+        query = query.outerjoin(HVACComponent.location).filter(
+            db.or_(HVACComponent.location_id.is_(None), Location.storey_id.is_(None))
+        )
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 100, type=int)
+    pagination = (
+        query
+        .with_entities(
+            HVACComponent.id, HVACComponent.global_id, HVACComponent.name,
+            HVACComponent.ifc_class, HVACComponent.bas_code, HVACComponent.is_electronic
+        )
+        .order_by(HVACComponent.name, HVACComponent.id)
+        .paginate(page=page, per_page=per_page, max_per_page=1000, error_out=False)
+    )
+    
+    return jsonify({
+        'model_id': model_id,
+        'storey_id': storey_id,
+        'space_id': space_id,
+        'page': pagination.page,
+        'per_page': pagination.per_page,
+        'pages': pagination.pages,
+        'total': pagination.total,
+        'components': [
+            {
+                'id': component_id,
+                'global_id': global_id,
+                'name': name,
+                'type': ifc_class,
+                'bas_code': bas_code,
+                'is_electronic': is_electronic
+            }
+            for component_id, global_id, name, ifc_class, bas_code, is_electronic in pagination.items
+        ]
+    })
+
+@app.route('/api/model/<int:model_id>/components')
+@model_conditional
+def api_model_components(model_id):
+    """
+    API-Endpunkt für die seitenweise Komponententabelle eines Modells
+    (Suche, Filter, Sortierung und Eigenschaftsfilter prop.<name>=<wert>)
+    """
+    IFCModel.query.get_or_404(model_id)
+    
+    query = (
+        HVACComponent.query
+        .filter(HVACComponent.model_id == model_id)
+        .outerjoin(HVACComponent.location)
+        .outerjoin(HVACComponent.type_properties)
+    )
+    
+    # Such-, Tabellen- und Eigenschaftsfilter werden in der Datenbank ausgewertet
+    query = component_table_filters(query)
+    for arg, value in request.args.items(multi=True):
+        if arg.startswith('prop.') and len(arg) > len('prop.'):
+            query = query.filter(property_filter(arg[len('prop.'):], value))
+    
+    sort = request.args.get('sort', 'id')
+    if sort not in COMPONENT_SORT_COLUMNS:
+        return jsonify({'error': f"Unbekannte Sortierung: {sort}"}), 400
+    descending = request.args.get('order', 'asc').lower() == 'desc'
+    
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 50, type=int)
+    pagination = (
+        query
+        .with_entities(*COMPONENT_DICT_COLUMNS)
+        .order_by(*component_table_order(sort, descending))
+        .paginate(page=page, per_page=per_page, max_per_page=500, error_out=False)
+    )
+    
+    return jsonify({
+        'model_id': model_id,
+        'sort': sort,
+        'order': 'desc' if descending else 'asc',
+        'page': pagination.page,
+        'per_page': pagination.per_page,
+        'pages': pagination.pages,
+        'total': pagination.total,
+        'components': [component_dict(row) for row in pagination.items]
+    })
+
+@app.route('/api/model/<int:model_id>/components/facets')
+@model_conditional
+def api_model_component_facets(model_id):
+    """
+    Liefert die Filterwerte der Komponententabelle mit Anzahl (IFC-Klassen, Systeme, elektronisch).
+    Jede Facette berücksichtigt alle aktiven Filter außer ihrem eigenen.
+    """
+    IFCModel.query.get_or_404(model_id)
+    
+    def facet_query(exclude, *columns):
+        query = (
+            db.session.query(*columns, db.func.count(HVACComponent.id))
+            .select_from(HVACComponent)
+            .filter(HVACComponent.model_id == model_id)
+        )
+        return component_table_filters(query, exclude=exclude).group_by(*columns)
+    
+    ifc_classes = facet_query('ifc_class', HVACComponent.ifc_class).order_by(HVACComponent.ifc_class).all()
+    electronic = facet_query('electronic', HVACComponent.is_electronic).all()
+    systems = (
+        facet_query('system_id', HVACComponent.system_id, DistributionSystem.name)
+        .outerjoin(HVACComponent.system)
+        .order_by(DistributionSystem.name)
+        .all()
+    )
+    
+    return jsonify({
+        'model_id': model_id,
+        'ifc_classes': [{'value': ifc_class, 'count': count} for ifc_class, count in ifc_classes],
+        'systems': [
+            {'id': system_id, 'name': name, 'count': count}
+            for system_id, name, count in systems if system_id is not None
+        ],
+        'electronic': {
+            'true': sum(count for value, count in electronic if value),
+            'false': sum(count for value, count in electronic if not value)
+        }
+    })
+
+# Vergleichbare Felder von Komponenten mit gleicher GlobalId (Eigenschaften nur als Änderungsmarke)
+COMPARISON_FIELDS = ['name', 'ifc_class', 'is_electronic', 'bas_code', 'storey_name', 'space_name']
+
+def model_pair_state(model_id, other_model_id):
+    """Stand zweier Modelle für den Modellvergleich (siehe model_state)"""
+    rows = (
+        db.session.query(IFCModel.id, IFCModel.revision, IFCModel.updated_at)
+        .filter(IFCModel.id.in_([model_id, other_model_id]))
+        .all()
+    )
+    if len(rows) != len({model_id, other_model_id}):
+        return None
+    versions = {row.id: model_version(row.id, row.revision, row.updated_at) for row in rows}
+    updated_at = max((row.updated_at for row in rows if row.updated_at), default=None)
+    # Ohne Modell-Tag: Der Antwort-Cache verwirft den Eintrag bei jeder Verarbeitung
+    return None, versions[model_id] + versions[other_model_id], updated_at
+
+def model_comparison_queries(model_id, other_model_id):
+    """
+    Mengenbasierte Abfragen für den Vergleich zweier Modelle über die GlobalId
+    
+    Args:
+        model_id: Ausgangsmodell (alt)
+        other_model_id: Vergleichsmodell (neu)
+        
+    Returns:
+        dict: Abfragen "matched" (in beiden), "removed" (nur alt), "added" (nur neu),
+              die Spaltenlisten "old"/"new", die GlobalId-Spalte je Kategorie ("global_id")
+              und die Änderungsausdrücke je Feld ("differences")
+    """
+    old, new = db.aliased(HVACComponent), db.aliased(HVACComponent)
+    old_location, new_location = db.aliased(Location), db.aliased(Location)
+    
+    def side_columns(component, location):
+        return [
+            component.id, component.name, component.ifc_class, component.is_electronic,
+            component.bas_code, location.storey_name, location.space_name
+        ]
+    
+    differences = {
+        'name': old.name.is_distinct_from(new.name),
+        'ifc_class': old.ifc_class.is_distinct_from(new.ifc_class),
+        'is_electronic': old.is_electronic.is_distinct_from(new.is_electronic),
+        'bas_code': old.bas_code.is_distinct_from(new.bas_code),
+        'storey_name': old_location.storey_name.is_distinct_from(new_location.storey_name),
+        'space_name': old_location.space_name.is_distinct_from(new_location.space_name),
+        # Typeigenschaften sind inhaltsadressiert: gleicher Block = gleiche Eigenschaften
+        'properties': db.or_(
+            old.properties.is_distinct_from(new.properties),
+            old.type_properties_id.is_distinct_from(new.type_properties_id)
+        ),
+    }
+    same_global_id = db.and_(new.model_id == other_model_id, new.global_id == old.global_id)
+    
+    matched = (
+        db.session.query(old.global_id)
+        .select_from(old)
+        .join(new, same_global_id)
+        .outerjoin(old_location, old.location_id == old_location.id)
+        .outerjoin(new_location, new.location_id == new_location.id)
+        .filter(old.model_id == model_id)
+    )
+    removed = (
+        db.session.query(old.global_id, *side_columns(old, old_location))
+        .select_from(old)
+        .outerjoin(new, same_global_id)
+        .outerjoin(old_location, old.location_id == old_location.id)
+        .filter(old.model_id == model_id, new.id.is_(None))
+    )
+    added = (
+        db.session.query(new.global_id, *side_columns(new, new_location))
+        .select_from(new)
+        .outerjoin(old, db.and_(old.model_id == model_id, old.global_id == new.global_id))
+        .outerjoin(new_location, new.location_id == new_location.id)
+        .filter(new.model_id == other_model_id, old.id.is_(None))
+    )
+    return {
+        'matched': matched,
+        'removed': removed,
+        'added': added,
+        'old': side_columns(old, old_location),
+        'new': side_columns(new, new_location),
+        'global_id': {'changed': old.global_id, 'removed': old.global_id, 'added': new.global_id},
+        'differences': differences,
+    }
+
+def comparison_side(row):
+    """Komponentendaten einer Vergleichsseite aus (id, name, ifc_class, is_electronic, bas_code, storey_name, space_name)"""
+    component_id, *values = row
+    return {'id': component_id, **dict(zip(COMPARISON_FIELDS, values))}
+
+@app.route('/api/model/<int:model_id>/compare/<int:other_model_id>')
+@use_read_replica
+@conditional_response(model_pair_state)
+def api_compare_models(model_id, other_model_id):
+    """
+    Vergleicht zwei Modelle über die GlobalId: hinzugefügte, entfernte und geänderte
+    Komponenten (Zusammenfassung und seitenweise Liste einer Kategorie)
+    """
+    IFCModel.query.get_or_404(model_id)
+    IFCModel.query.get_or_404(other_model_id)
+    
+    change = request.args.get('change', 'changed')
+    if change not in ('added', 'removed', 'changed'):
+        return jsonify({'error': f"Unbekannte Kategorie: {change}"}), 400
+    field = request.args.get('field')
+    queries = model_comparison_queries(model_id, other_model_id)
+    differences = queries['differences']
+    if field is not None and field not in differences:
+        return jsonify({'error': f"Unbekanntes Feld: {field}"}), 400
+    
+    # Zusammenfassung: Anzahl je Modell und je geändertem Feld in zwei Aggregaten
+    counts = dict(
+        db.session.query(HVACComponent.model_id, db.func.count(HVACComponent.id))
+        .filter(HVACComponent.model_id.in_([model_id, other_model_id]))
+        .group_by(HVACComponent.model_id)
+        .all()
+    )
+    any_difference = db.or_(*differences.values())
+    matched_id = queries['old'][0]
+    aggregates = queries['matched'].with_entities(
+        db.func.count(matched_id),
+        db.func.count(matched_id).filter(any_difference),
+        *(db.func.count(matched_id).filter(expression) for expression in differences.values())
+    ).one()
+    matched_count, changed_count, *field_counts = aggregates
+    field_counts = dict(zip(differences, field_counts))
+    
+    summary = {
+        'old_count': counts.get(model_id, 0),
+        'new_count': counts.get(other_model_id, 0),
+        'added': counts.get(other_model_id, 0) - matched_count,
+        'removed': counts.get(model_id, 0) - matched_count,
+        'changed': changed_count,
+        'unchanged': matched_count - changed_count,
+        'changed_fields': field_counts
+    }
+    
+    # Seitenweise Liste der gewählten Kategorie, sortiert nach GlobalId
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 100, type=int), 1), 1000)
+    global_id = queries['global_id'][change]
+    if change == 'changed':
+        query = queries['matched'].filter(differences[field] if field else any_difference).with_entities(
+            global_id, *queries['old'], *queries['new'], differences['properties']
+        )
+        total = field_counts[field] if field else changed_count
+    else:
+        query = queries[change]
+        total = summary[change]
+    rows = query.order_by(global_id).limit(per_page).offset((page - 1) * per_page).all()
+    
+    items = []
+    for row in rows:
+        if change == 'changed':
+            size = len(COMPARISON_FIELDS) + 1
+            old_values = comparison_side(row[1:1 + size])
+            new_values = comparison_side(row[1 + size:1 + 2 * size])
+            changed_fields = [name for name in COMPARISON_FIELDS if old_values[name] != new_values[name]]
+            if row[-1]:
+                changed_fields.append('properties')
+            items.append({
+                'global_id': row[0],
+                'old_id': old_values['id'],
+                'new_id': new_values['id'],
+                'changed_fields': changed_fields,
+                'old': {name: old_values[name] for name in changed_fields if name in old_values},
+                'new': {name: new_values[name] for name in changed_fields if name in new_values}
+            })
+        else:
+            items.append({'global_id': row[0], **comparison_side(row[1:])})
+    
+    return jsonify({
+        'model_id': model_id,
+        'other_model_id': other_model_id,
+        'summary': summary,
+        'change': change,
+        'field': field,
+        'page': page,
+        'per_page': per_page,
+        'pages': (total + per_page - 1) // per_page,
+        'total': total,
+        'components': items
+    })
+
+@app.route('/api/analytics/components')
+def api_analytics_components():
+    """
+    Zählt Komponenten über alle (oder ausgewählte) Modelle aus dem Spaltenspeicher,
+    gruppiert nach ifc_class, bas_prefix, storey, space und/oder is_electronic
+    """
+    by = request.args.getlist('by') or ['ifc_class']
+    model_ids = request.args.getlist('model_id', type=int) or None
+    electronic = request.args.get('electronic', 'all').lower()
+    
+    try:
+        groups = columnar_store.aggregate(
+            by,
+            model_ids=model_ids,
+            bas_prefix_parts=request.args.get('bas_prefix_parts', 2, type=int),
+            is_electronic=(electronic == 'true') if electronic in ('true', 'false') else None,
+            ifc_class=request.args.get('ifc_class')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e), 'allowed': GROUP_KEYS}), 400
+    
+    rows = [dict(zip(by, group), count=count) for group, count in groups.items()]
+    rows.sort(key=lambda row: row['count'], reverse=True)
+    return jsonify({
+        'by': by,
+        'total': sum(groups.values()),
+        'groups': rows
+    })
+
+@app.route('/api/model/<int:model_id>/graph')
+@model_conditional
+def api_model_graph(model_id):
+    """API-Endpunkt für Kennzahlen des Verbindungsgraphen"""
+    IFCModel.query.get_or_404(model_id)
+    graph = load_model_graph(model_id)
+    if graph is None:
+        return jsonify({'error': 'Kein Verbindungsgraph vorhanden'}), 404
+    
+    return jsonify({
+        'model_id': model_id,
+        'node_count': graph.node_count,
+        'edge_count': graph.edge_count,
+        'component_count': graph.component_count
+    })
+
+@app.route('/api/model/<int:model_id>/graph/neighbors/<global_id>')
+@model_conditional
+def api_graph_neighbors(model_id, global_id):
+    """Liefert alle Elemente innerhalb von N Verbindungsschritten"""
+    graph = load_model_graph(model_id)
+    if graph is None or not graph.has_node(global_id):
+        return jsonify({'error': 'Element nicht im Verbindungsgraphen'}), 404
+    
+    try:
+        hops = int(request.args.get('hops', 1))
+    except ValueError:
+        return jsonify({'error': 'hops muss eine ganze Zahl sein'}), 400
+    if hops < 1 or hops > 50:
+        return jsonify({'error': 'hops muss zwischen 1 und 50 liegen'}), 400
+    ifc_class = request.args.get('ifc_class')
+    
+    distances = graph.neighbors(global_id, hops, ifc_class)
+    global_ids = sorted(distances, key=lambda key: (distances[key], key))
+    
+    return jsonify({
+        'global_id': global_id,
+        'hops': hops,
+        'count': len(global_ids),
+        'neighbors': graph_nodes_to_dicts(model_id, graph, global_ids, distances)
+    })
+
+@app.route('/api/model/<int:model_id>/graph/path')
+@model_conditional
+def api_graph_path(model_id):
+    """Liefert den kürzesten Verbindungspfad zwischen zwei Elementen"""
+    graph = load_model_graph(model_id)
+    source = request.args.get('source')
+    target = request.args.get('target')
+    if graph is None or not graph.has_node(source) or not graph.has_node(target):
+        return jsonify({'error': 'Element nicht im Verbindungsgraphen'}), 404
+    
+    path = graph.shortest_path(source, target)
+    return jsonify({
+        'source': source,
+        'target': target,
+        'connected': path is not None,
+        'path': graph_nodes_to_dicts(model_id, graph, path) if path else []
+    })
+
+@app.route('/api/model/<int:model_id>/graph/component/<global_id>')
+@model_conditional
+def api_graph_component(model_id, global_id):
+    """Liefert alle Elemente, die mit dem Element verbunden sind"""
+    graph = load_model_graph(model_id)
+    if graph is None or not graph.has_node(global_id):
+        return jsonify({'error': 'Element nicht im Verbindungsgraphen'}), 404
+    
+    members = graph.connected_component(global_id)
+    return jsonify({
+        'global_id': global_id,
+        'count': len(members),
+        'members': graph_nodes_to_dicts(model_id, graph, members)
+    })
+
 @app.route('/api/convert', methods=['POST'])
 def convert_bas_code():
     """Konvertiert einen BAS-Code zwischen Standards"""
@@ -283,6 +1179,7 @@ def view_component(component_id):
     return render_template('component_details.html', component=component)
 
 @app.route('/api/component/<int:component_id>')
+@conditional_response(component_state)
 def api_component_data(component_id):
     """API-Endpunkt für Komponentendaten"""
     component = HVACComponent.query.get_or_404(component_id)
@@ -309,6 +1206,8 @@ def download_sample(filename):
     return send_from_directory(SAMPLES_FOLDER, filename)
 
 @app.route('/api/statistics')
+@use_read_replica
+@conditional_response(all_models_state)
 def api_statistics():
     """Liefert statistische Daten zur Anwendung"""
     models_count = IFCModel.query.count()
@@ -331,39 +1230,108 @@ def api_statistics():
         'class_distribution': class_stats
     })
 
-def process_ifc_file(filepath, filename, standard="amev", electronic_only=True, overwrite_mode="update"):
+def pool_metrics(engine):
     """
-    Verarbeitet eine IFC-Datei und speichert die Ergebnisse in der Datenbank
-    mit UPSERT-Logik (Aktualisieren, wenn der Eintrag bereits existiert)
+    Kennzahlen des Verbindungspools einer Engine
     
-    Args:
-        filepath: Pfad zur IFC-Datei
-        filename: Name der Datei
-        standard: BAS-Standard (amev oder vdi)
-        electronic_only: Nur elektronisch gesteuerte Elemente berücksichtigen
-        overwrite_mode: "update" (aktualisieren), "replace" (ersetzen) oder "skip" (überspringen)
-        
     Returns:
-        int: ID des erstellten Modells
+        dict: Poolklasse, Größe, ausgeliehene/freie Verbindungen, Überlauf
     """
+    pool = engine.pool
+    metrics = {
+        'pool_class': type(pool).__name__,
+        'status': pool.status()
+    }
+    # Nur QueuePool liefert Zähler
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        if hasattr(pool, name):
+            metrics[name] = getattr(pool, name)()
+    return metrics
+
+@app.route('/api/metrics')
+def api_metrics():
+    """Liefert Betriebskennzahlen (Verbindungspools der Datenbank, Antwort- und Graph-Cache)"""
+    engines = db.engines
+    return jsonify({
+        'database': {
+            'primary': pool_metrics(db.engine),
+            'replica': pool_metrics(engines[READ_REPLICA_BIND]) if READ_REPLICA_BIND in engines else None
+        },
+        'response_cache': response_cache.stats(),
+        'graph_cache': _graph_cache.stats()
+    })
+
+def process_ifc_file(filepath, filename, standard="amev", electronic_only=True, overwrite_mode="update",
+                     content_hash=None):
+    """
+    Verarbeitet eine IFC-Datei und speichert die Ergebnisse in der Datenbank
+    mit UPSERT-Logik (Aktualisieren, wenn der Eintrag bereits existiert)
+    
+    Verarbeitungen desselben Dateinamens laufen nacheinander (Modellsperre). Mit
+    content_hash werden gleichzeitige identische Aufrufe im Prozess zusammengefasst,
+    und ein Modell, das bereits aus derselben Datei mit denselben Optionen
+    entstanden ist, wird ohne erneute Verarbeitung zurückgegeben.
+    
+    Args:
+        filepath: Pfad zur IFC-Datei
+        filename: Name der Datei
+        standard: BAS-Standard (amev oder vdi)
+        electronic_only: Nur elektronisch gesteuerte Elemente berücksichtigen
+        overwrite_mode: "update" (aktualisieren), "replace" (ersetzen) oder "skip" (überspringen)
+        content_hash: Optional - SHA-256 der Datei (z.B. StoredUpload.sha256)
+        
+    Returns:
+        int: ID des erstellten Modells
+    """
+    key = processing_key(content_hash, standard, electronic_only) if content_hash else None
+    
+    def process_locked():
+        with model_lock.hold(db.session, filename):
+            try:
+                return process_ifc_file_locked(filepath, filename, standard, electronic_only, overwrite_mode, key)
+            except Exception:
+                # Transaktion beenden, damit auch ein Advisory-Lock sofort frei wird
+                db.session.rollback()
+                raise
+    
+    return processing_coalescer.run((filename, key, overwrite_mode) if key else None, process_locked)
+
+def process_ifc_file_locked(filepath, filename, standard, electronic_only, overwrite_mode, key):
+    """
+    Verarbeitung unter der Modellsperre (siehe process_ifc_file)
+    
+    Args:
+        key: Verarbeitungsschlüssel aus processing_key() oder None
+        
+    Returns:
+        int: ID des erstellten Modells
+    """
+    # Modell erst unter der Sperre suchen, damit gleichzeitige Uploads kein zweites anlegen
+    existing_model = IFCModel.query.filter_by(filename=filename).first()
+    
+    # Gleiche Datei mit gleichen Optionen wurde bereits verarbeitet
+    if existing_model and key is not None and existing_model.processing_key == key:
+        app.logger.info("%s ist bereits verarbeitet (Modell %s)", filename, existing_model.id)
+        return existing_model.id
+    
+    # Vorabscan (Sekunden statt Minuten): Dateien ohne HVAC-Elemente nicht parsen
+    scan = prescan_step_file(filepath)
+    app.logger.info(
+        "Vorabscan %s: Schema %s, %d Bytes, %d Instanzen (%.2f s)",
+        filename, scan.schema, scan.file_size, scan.entity_count, scan.duration
+    )
+    if scan.schema is not None and not scan.has_any(HVAC_TYPES):
+        raise ValueError(f"Die Datei enthält keine HVAC-Komponenten (Schema {scan.schema})")
+    
     # IFC-Datei öffnen
     ifc_file = ifcopenshell.open(filepath)
     
     # Modell in Datenbank erstellen oder aktualisieren
-    existing_model = IFCModel.query.filter_by(filename=filename).first()
-    
     if existing_model:
         if overwrite_mode == "replace":
-            # Lösche alle bestehenden Komponenten dieses Modells
-            components_to_delete = HVACComponent.query.filter_by(model_id=existing_model.id).all()
-            
-            for component in components_to_delete:
-                # Lösche auch zugehörige Standorte
-                if component.location_id:
-                    location = Location.query.get(component.location_id)
-                    if location:
-                        db.session.delete(location)
-                db.session.delete(component)
+            # Lösche alle bestehenden Komponenten dieses Modells mit einer Anweisung;
+            # nicht mehr benötigte Standorte werden nach dem Speichern entfernt
+            delete_model_components(existing_model.id)
                 
             # Nutze das bestehende Modell
             model = existing_model
@@ -379,58 +1347,63 @@ def process_ifc_file(filepath, filename, standard="amev", electronic_only=True,
         db.session.add(model)
         db.session.flush()  # ID generieren
     
+    if existing_model:
+        # Neue Revision: ETags und zwischengespeicherte Antworten des Modells werden ungültig
+        model.revision = (model.revision or 0) + 1
+        model.updated_at = datetime.utcnow()
+    
     # Extraktoren und Classifier initialisieren
     location_extractor = LocationExtractor(ifc_file)
-    hvac_extractor = HVACExtractor(ifc_file)
-    hvac_classifier = HVACClassifier(ifc_file, location_extractor)
+    # Ein PropertyExtractor für beide: Relationen werden nur einmal indiziert
+    property_extractor = PropertyExtractor(ifc_file)
+    hvac_extractor = HVACExtractor(ifc_file, property_extractor)
+    hvac_classifier = HVACClassifier(ifc_file, location_extractor, property_extractor=property_extractor)
     
     # HVAC-Elemente klassifizieren
-    classification_results = hvac_classifier.classify_all_hvac_elements(standard, electronic_only)
+    classification_results = hvac_classifier.classify_all_hvac_elements(
+        standard, electronic_only, build_hierarchy=False
+    )
+    
+    # Geteilte Typ-Eigenschaften einmalig speichern
+    property_block_ids = save_property_blocks(classification_results.get("property_blocks", {}))
+    
+    # Standorte einmal pro (Geschoss, Raum) anlegen
+    location_ids = save_locations(model.id, [
+        element_data["location"]
+        for element_data in classification_results["flat_results"]
+        if "location" in element_data
+    ])
+    
+    # Bestehende Komponenten mit einer Abfrage laden (nur beim Aktualisieren benötigt)
+    existing_components = {}
+    if existing_model and overwrite_mode == "update":
+        existing_components = {
+            component.global_id: component
+            for component in HVACComponent.query.filter_by(model_id=model.id)
+        }
     
     # Iteriere durch klassifizierte Elemente
+    processed_ids = set()
     for element_data in classification_results["flat_results"]:
         # Global ID ermitteln
-        global_id = element_data.get("metadata", {}).get("global_id", f"ID_{element_data['element_id']}")
+        global_id = element_data.get("metadata", {}).get("global_id") or f"ID_{element_data['element_id']}"
+        
+        # Elemente werden über Obertypen (z.B. IfcDistributionElement) mehrfach gefunden
+        if global_id in processed_ids:
+            continue
+        processed_ids.add(global_id)
         
         # Prüfen, ob Komponente bereits existiert
-        existing_component = HVACComponent.query.filter_by(global_id=global_id, model_id=model.id).first()
+        existing_component = existing_components.get(global_id)
         
-        # Standort verarbeiten
+        # Geteilten Standort zuordnen
         location_id = None
         if "location" in element_data:
-            location_data = element_data["location"]
-            # Standort suchen oder erstellen
-            if existing_component and existing_component.location_id and overwrite_mode == "update":
-                # Bestehenden Standort aktualisieren
-                location = Location.query.get(existing_component.location_id)
-                if location:
-                    location.storey_id = location_data.get("storey_id")
-                    location.storey_name = location_data.get("storey_name")
-                    location.space_id = location_data.get("space_id")
-                    location.space_name = location_data.get("space_name")
-                    location_id = location.id
-                else:
-                    # Standort nicht gefunden, neuen erstellen
-                    location = Location(
-                        storey_id=location_data.get("storey_id"),
-                        storey_name=location_data.get("storey_name"),
-                        space_id=location_data.get("space_id"),
-                        space_name=location_data.get("space_name")
-                    )
-                    db.session.add(location)
-                    db.session.flush()
-                    location_id = location.id
-            else:
-                # Neuen Standort erstellen
-                location = Location(
-                    storey_id=location_data.get("storey_id"),
-                    storey_name=location_data.get("storey_name"),
-                    space_id=location_data.get("space_id"),
-                    space_name=location_data.get("space_name")
-                )
-                db.session.add(location)
-                db.session.flush()
-                location_id = location.id
+            location_id = location_ids.get(location_key(element_data["location"]))
+        
+        # Instanzeigenschaften speichern, Typ-Eigenschaften referenzieren
+        properties = element_data.get("instance_properties", element_data.get("properties", {}))
+        type_properties_id = property_block_ids.get(element_data.get("type_properties_key"))
         
         # Komponente aktualisieren oder erstellen
         if existing_component and overwrite_mode == "update":
@@ -440,7 +1413,8 @@ def process_ifc_file(filepath, filename, standard="amev", electronic_only=True,
             existing_component.is_electronic = element_data["is_electronic"]
             existing_component.bas_code = element_data["bas_code"]
             existing_component.bas_standard = standard
-            existing_component.properties = element_data.get("properties", {})
+            existing_component.properties = properties
+            existing_component.type_properties_id = type_properties_id
             existing_component.location_id = location_id
         else:
             # Neue Komponente erstellen
@@ -451,100 +1425,584 @@ def process_ifc_file(filepath, filename, standard="amev", electronic_only=True,
                 is_electronic=element_data["is_electronic"],
                 bas_code=element_data["bas_code"],
                 bas_standard=standard,
-                properties=element_data.get("properties", {}),
+                properties=properties,
+                type_properties_id=type_properties_id,
                 model_id=model.id,
                 location_id=location_id
             )
             db.session.add(component)
     
-    # Änderungen speichern
+    # Verbindungsgraph aufbauen und speichern
+    save_model_graph(model.id, hvac_extractor.build_connectivity_graph())
+    
+    # Hierarchien neu berechnen (häufige Filterkombinationen vorab)
+    db.session.flush()
+    delete_orphaned_locations(model.id)
+    invalidate_model_hierarchies(model.id)
+    for hierarchy_electronic_only in (False, True):
+        store_model_hierarchy(model.id, hierarchy_electronic_only)
+    
+    # Änderungen speichern (gibt unter PostgreSQL auch die Modellsperre frei)
+    model.processing_key = key
     db.session.commit()
+    
+    # Zwischengespeicherte Antworten des Modells und modellübergreifende Statistiken verwerfen
+    response_cache.invalidate(model.id)
+    response_cache.invalidate(None)
+    
+    # Spaltendateien erst nach dem Commit schreiben; sie lassen sich jederzeit neu erzeugen
+    try:
+        save_model_columns(model.id)
+    except OSError:
+        app.logger.exception("Spaltendateien für Modell %s konnten nicht geschrieben werden", model.id)
+    
     return model.id
 
-def create_hierarchy_from_components(components):
+def delete_model_components(model_id):
     """
-    Erstellt eine hierarchische Struktur aus den Komponenten nach Standort
+    Löscht alle Komponenten eines Modells mit einer DELETE-Anweisung (ohne sie zu laden)
     
     Args:
-        components: Liste von HVACComponent-Objekten
+        model_id: ID des Modells
         
     Returns:
-        dict: Hierarchische Struktur nach Stockwerk und Raum
+        int: Anzahl der gelöschten Komponenten
     """
-    hierarchy = {}
+    return HVACComponent.query.filter_by(model_id=model_id).delete(synchronize_session=False)
+
+def delete_orphaned_locations(model_id):
+    """
+    Löscht die Standorte eines Modells, auf die keine Komponente mehr verweist
     
-    for component in components:
-        if not component.location:
-            # Komponenten ohne Standortinformation unter "Unbekannter Standort" sammeln
-            storey_name = "Unbekannter Standort"
-            if storey_name not in hierarchy:
-                hierarchy[storey_name] = {
-                    "id": None,
-                    "name": storey_name,
-                    "type": "storey",
-                    "children": {}
-                }
-            
-            # Komponente direkt dem Stockwerk hinzufügen
-            element_id = str(component.id)
-            hierarchy[storey_name]["children"][element_id] = {
-                "id": component.id,
-                "name": component.name,
-                "type": component.ifc_class,
-                "bas_code": component.bas_code,
-                "is_electronic": component.is_electronic
-            }
-            continue
+    Args:
+        model_id: ID des Modells
         
-        # Stockwerksinformationen
-        storey_name = component.location.storey_name
-        storey_id = component.location.storey_id
-        
-        # Stockwerk hinzufügen, falls noch nicht vorhanden
-        if storey_name not in hierarchy:
-            hierarchy[storey_name] = {
-                "id": storey_id,
-                "name": storey_name,
-                "type": "storey",
-                "children": {}
-            }
+    Returns:
+        int: Anzahl der gelöschten Standorte
+    """
+    used_location_ids = (
+        db.select(HVACComponent.location_id)
+        .where(HVACComponent.model_id == model_id, HVACComponent.location_id.is_not(None))
+    )
+    return (
+        Location.query
+        .filter(Location.model_id == model_id, Location.id.not_in(used_location_ids))
+        .delete(synchronize_session=False)
+    )
+
+def delete_model(model_id):
+    """
+    Löscht ein Modell mit Komponenten, Standorten, Graph und Hierarchien
+    in einer Transaktion (mengenbasiert) sowie seine Spaltendateien und Caches
+    
+    Hält dieselbe Modellsperre wie process_ifc_file, damit keine laufende
+    Verarbeitung Komponenten für das gelöschte Modell anlegt.
+    
+    Args:
+        model_id: ID des Modells
         
-        # Rauminformationen
-        space_name = component.location.space_name
-        space_id = component.location.space_id
-        
-        # Wenn Raum vorhanden, Komponente zum Raum hinzufügen
-        if space_name:
-            # Raum hinzufügen, falls noch nicht vorhanden
-            if space_name not in hierarchy[storey_name]["children"]:
-                hierarchy[storey_name]["children"][space_name] = {
-                    "id": space_id,
-                    "name": space_name,
-                    "type": "space",
-                    "children": {}
-                }
-            
-            # Komponente dem Raum hinzufügen
-            element_id = str(component.id)
-            hierarchy[storey_name]["children"][space_name]["children"][element_id] = {
-                "id": component.id,
-                "name": component.name,
-                "type": component.ifc_class,
-                "bas_code": component.bas_code,
-                "is_electronic": component.is_electronic
-            }
+    Returns:
+        int: Anzahl der gelöschten Komponenten oder None, wenn das Modell nicht existiert
+    """
+    filename = db.session.query(IFCModel.filename).filter(IFCModel.id == model_id).scalar()
+    if filename is None:
+        return None
+    
+    with model_lock.hold(db.session, filename):
+        # Nach dem Warten erneut prüfen: Eine gleichzeitige Löschung kann zuvorgekommen sein
+        if db.session.query(IFCModel.id).filter(IFCModel.id == model_id).scalar() is None:
+            db.session.rollback()
+            return None
+        try:
+            component_count = delete_model_components(model_id)
+            Location.query.filter_by(model_id=model_id).delete(synchronize_session=False)
+            ModelGraph.query.filter_by(model_id=model_id).delete(synchronize_session=False)
+            invalidate_model_hierarchies(model_id)
+            IFCModel.query.filter_by(id=model_id).delete(synchronize_session=False)
+            # Gibt unter PostgreSQL auch die Modellsperre frei
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    _graph_cache.pop(model_id)
+    response_cache.invalidate(model_id)
+    response_cache.invalidate(None)
+    columnar_store.remove_model(model_id)
+    return component_count
+
+def save_model_columns(model_id):
+    """
+    Schreibt die Komponenten eines Modells in den Spaltenspeicher
+    
+    Args:
+        model_id: ID des Modells
+        
+    Returns:
+        int: Anzahl der geschriebenen Komponenten
+    """
+    rows = (
+        db.session.query(
+            HVACComponent.id, HVACComponent.global_id, HVACComponent.name, HVACComponent.ifc_class,
+            HVACComponent.is_electronic, HVACComponent.bas_code, HVACComponent.system_id,
+            Location.storey_name, Location.space_name
+        )
+        .outerjoin(HVACComponent.location)
+        .filter(HVACComponent.model_id == model_id)
+        .order_by(HVACComponent.id)
+        .execution_options(yield_per=10000)
+    )
+    return columnar_store.write_model(model_id, rows)
+
+def property_value_candidates(value):
+    """
+    Ermittelt die möglichen typisierten Werte eines Query-Parameters
+    
+    Args:
+        value: Wert als Zeichenkette
+        
+    Returns:
+        list: Zeichenkette sowie ggf. Boolean-, Integer- oder Float-Wert
+    """
+    candidates = [value]
+    if value.lower() in ('true', 'false'):
+        candidates.append(value.lower() == 'true')
+    else:
+        for cast in (int, float):
+            try:
+                candidates.append(cast(value))
+                break
+            except ValueError:
+                continue
+    return candidates
+
+def property_filter(name, value):
+    """
+    Erstellt eine SQL-Bedingung "Eigenschaft name hat den Wert value".
+    Instanzeigenschaften haben Vorrang vor den Eigenschaften des Typs (PropertyBlock).
+    
+    Auf PostgreSQL werden JSONB-Containment-Abfragen (@>) verwendet, die den
+    GIN-Index nutzen; andere Datenbanken (SQLite) verwenden json_extract.
+    
+    Args:
+        name: Name der Eigenschaft
+        value: Gesuchter Wert als Zeichenkette
+        
+    Returns:
+        SQL-Ausdruck für Query.filter()
+    """
+    candidates = property_value_candidates(value)
+    
+    if db.engine.dialect.name == 'postgresql':
+        instance_props = db.type_coerce(HVACComponent.properties, JSONB)
+        type_props = db.type_coerce(PropertyBlock.properties, JSONB)
+        instance_match = db.or_(*[instance_props.contains({name: v}) for v in candidates])
+        type_match = db.or_(*[type_props.contains({name: v}) for v in candidates])
+        instance_has_key = db.func.coalesce(instance_props.has_key(name), False)
+    else:
+        path = '$."{}"'.format(name.replace('"', ''))
+        instance_match = db.func.json_extract(HVACComponent.properties, path).in_(candidates)
+        type_match = db.func.json_extract(PropertyBlock.properties, path).in_(candidates)
+        instance_has_key = db.func.json_type(HVACComponent.properties, path).isnot(None)
+    
+    return db.or_(instance_match, db.and_(db.not_(instance_has_key), type_match))
+
+def location_key(location_data):
+    """Schlüssel eines Standorts innerhalb eines Modells"""
+    return (location_data.get("storey_id"), location_data.get("space_id"))
+
+def save_locations(model_id, locations):
+    """
+    Legt die Standorte eines Modells dedupliziert an (ein Eintrag pro Geschoss und Raum)
+    
+    Bestehende Standorte des Modells werden mit einer Abfrage geladen und bei
+    geänderten Namen aktualisiert, fehlende gemeinsam eingefügt.
+    
+    Args:
+        model_id: ID des Modells
+        locations: Liste von Standort-dicts (storey_id, storey_name, space_id, space_name)
+        
+    Returns:
+        dict: Standortschlüssel -> ID in der Datenbank
+    """
+    distinct = {}
+    for location_data in locations:
+        distinct.setdefault(location_key(location_data), location_data)
+    
+    existing = {
+        (location.storey_id, location.space_id): location
+        for location in Location.query.filter_by(model_id=model_id)
+    }
+    
+    new_locations = []
+    for key, location_data in distinct.items():
+        location = existing.get(key)
+        if location is None:
+            location = Location(model_id=model_id, storey_id=key[0], space_id=key[1])
+            new_locations.append(location)
+            existing[key] = location
+        location.storey_name = location_data.get("storey_name")
+        location.space_name = location_data.get("space_name")
+    
+    if new_locations:
+        db.session.add_all(new_locations)
+        db.session.flush()
+    
+    return {key: location.id for key, location in existing.items()}
+
+def save_property_blocks(property_blocks):
+    """
+    Speichert geteilte Eigenschaftsblöcke (vorhandene Blöcke werden wiederverwendet)
+    
+    Neue Blöcke werden mit ON CONFLICT DO NOTHING eingefügt, damit gleichzeitige
+    Verarbeitungen verschiedener Dateien mit denselben Blöcken nicht kollidieren.
+    
+    Args:
+        property_blocks: dict Blockschlüssel -> Eigenschaften
+        
+    Returns:
+        dict: Blockschlüssel -> ID in der Datenbank
+    """
+    if not property_blocks:
+        return {}
+    
+    def select_block_ids():
+        return dict(
+            db.session.query(PropertyBlock.block_key, PropertyBlock.id)
+            .filter(PropertyBlock.block_key.in_(list(property_blocks)))
+            .all()
+        )
+    
+    block_ids = select_block_ids()
+    new_blocks = [
+        {'block_key': key, 'properties': properties}
+        for key, properties in property_blocks.items()
+        if key not in block_ids
+    ]
+    if new_blocks:
+        dialect = db.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            statement = postgresql.insert(PropertyBlock).on_conflict_do_nothing(index_elements=['block_key'])
+        elif dialect == 'sqlite':
+            statement = sqlite.insert(PropertyBlock).on_conflict_do_nothing(index_elements=['block_key'])
         else:
-            # Komponente direkt dem Stockwerk hinzufügen, wenn kein Raum vorhanden
-            element_id = str(component.id)
-            hierarchy[storey_name]["children"][element_id] = {
-                "id": component.id,
-                "name": component.name,
-                "type": component.ifc_class,
-                "bas_code": component.bas_code,
-                "is_electronic": component.is_electronic
-            }
+            statement = db.insert(PropertyBlock)
+        db.session.execute(statement, new_blocks)
+        # Auch von anderen Verarbeitungen eingefügte Blöcke erhalten so ihre ID
+        block_ids = select_block_ids()
+    
+    return block_ids
+
+def save_model_graph(model_id, graph):
+    """
+    Speichert den Verbindungsgraphen eines Modells (ersetzt einen vorhandenen)
+    
+    Args:
+        model_id: ID des Modells
+        graph: ConnectivityGraph Instanz
+    """
+    model_graph = ModelGraph.query.filter_by(model_id=model_id).first()
+    if model_graph is None:
+        model_graph = ModelGraph(model_id=model_id)
+        db.session.add(model_graph)
+    
+    for column, value in graph.to_columns().items():
+        setattr(model_graph, column, value)
+    model_graph.built_at = datetime.utcnow()
+    
+    _graph_cache.pop(model_id)
+
+class GraphCache:
+    """
+    Geladene Verbindungsgraphen je Modell (LRU), begrenzt auf max_bytes
+    geschätzten Speicher; ein Eintrag gilt nur für den Stand built_at
+    """
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # model_id -> (built_at, graph, Größe)
+        self._lock = threading.Lock()
+        self._bytes = 0
+    
+    def get(self, model_id, built_at):
+        """Liefert den Graphen, wenn er zum gespeicherten Stand passt, sonst None"""
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is None or entry[0] != built_at:
+                return None
+            self._entries.move_to_end(model_id)
+            return entry[1]
+    
+    def set(self, model_id, built_at, graph):
+        """Speichert einen Graphen und verdrängt die am längsten nicht genutzten"""
+        size = graph.approximate_size()
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(model_id)
+            self._entries[model_id] = (built_at, graph, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+    
+    def pop(self, model_id):
+        """Verwirft den Graphen eines Modells"""
+        with self._lock:
+            self._remove(model_id)
+    
+    def _remove(self, model_id):
+        entry = self._entries.pop(model_id, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+    
+    def stats(self):
+        """Kennzahlen für /api/metrics"""
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'max_bytes': self.max_bytes}
+
+_graph_cache = GraphCache(app.config['GRAPH_CACHE_SIZE'])
+
+def load_model_graph(model_id):
+    """
+    Lädt den Verbindungsgraphen eines Modells (mit Prozess-Cache)
+    
+    Args:
+        model_id: ID des Modells
+        
+    Returns:
+        ConnectivityGraph oder None, wenn kein Graph gespeichert ist
+    """
+    built_at = db.session.query(ModelGraph.built_at).filter_by(model_id=model_id).scalar()
+    if built_at is None:
+        return None
+    
+    cached = _graph_cache.get(model_id, built_at)
+    if cached is not None:
+        return cached
+    
+    model_graph = ModelGraph.query.filter_by(model_id=model_id).first()
+    graph = ConnectivityGraph.from_columns(
+        model_graph.node_keys,
+        model_graph.node_types,
+        model_graph.type_codes,
+        model_graph.indptr,
+        model_graph.indices,
+        model_graph.labels
+    )
+    _graph_cache.set(model_id, built_at, graph)
+    return graph
+
+def graph_nodes_to_dicts(model_id, graph, global_ids, distances=None):
+    """
+    Reichert Graphknoten mit den gespeicherten Komponenten des Modells an
+    
+    Args:
+        model_id: ID des Modells
+        graph: ConnectivityGraph Instanz
+        global_ids: Liste von GlobalIds
+        distances: Optional - dict GlobalId -> Abstand
+        
+    Returns:
+        list: Knoteninformationen
+    """
+    components = {}
+    for start in range(0, len(global_ids), 1000):
+        chunk = global_ids[start:start + 1000]
+        for component_id, global_id, name, bas_code in db.session.query(
+            HVACComponent.id, HVACComponent.global_id, HVACComponent.name, HVACComponent.bas_code
+        ).filter(HVACComponent.model_id == model_id, HVACComponent.global_id.in_(chunk)):
+            components[global_id] = {"component_id": component_id, "name": name, "bas_code": bas_code}
+    
+    nodes = []
+    for global_id in global_ids:
+        node = {
+            "global_id": global_id,
+            "ifc_class": graph.node_type(global_id),
+            "component": components.get(global_id)
+        }
+        if distances is not None:
+            node["distance"] = distances[global_id]
+        nodes.append(node)
+    return nodes
+
+def hierarchy_filters_from_request():
+    """Liest die Hierarchie-Filter (electronic_only, system_id) aus der Anfrage"""
+    electronic_only = request.args.get('electronic_only', 'false').lower() == 'true'
+    system_id = request.args.get('system_id')
+    system_id = int(system_id) if system_id and system_id.isdigit() else None
+    return electronic_only, system_id
+
+def filtered_components_query(model_id, electronic_only=False, system_id=None):
+    """
+    Erstellt die Abfrage der Komponenten eines Modells mit den Standardfiltern
+    
+    Args:
+        model_id: ID des Modells
+        electronic_only: Nur elektronisch gesteuerte Komponenten
+        system_id: Optional - nur Komponenten dieses Systems
+        
+    Returns:
+        Query auf HVACComponent
+    """
+    query = HVACComponent.query.filter(HVACComponent.model_id == model_id)
+    if electronic_only:
+        query = query.filter(HVACComponent.is_electronic.is_(True))
+    if system_id is not None:
+        query = query.filter(HVACComponent.system_id == system_id)
+    return query
+
+def component_dicts(query):
+    """
+    Komponenten als Wörterbücher wie HVACComponent.to_dict, direkt aus Zeilentupeln
+    
+    Args:
+        query: Abfrage auf HVACComponent (noch ohne Joins auf Standort und Typeigenschaften)
+        
+    Returns:
+        list: Wörterbücher, sortiert nach ID
+    """
+    rows = (
+        query.outerjoin(HVACComponent.location)
+        .outerjoin(HVACComponent.type_properties)
+        .with_entities(*COMPONENT_DICT_COLUMNS)
+        .order_by(HVACComponent.id)
+        .execution_options(yield_per=ARROW_BATCH_SIZE)
+    )
+    return [component_dict(row) for row in rows]
+
+# Sortierbare Spalten der Komponententabelle (Standort erfordert den Join auf locations)
+COMPONENT_SORT_COLUMNS = {
+    'id': (HVACComponent.id,),
+    'global_id': (HVACComponent.global_id,),
+    'name': (HVACComponent.name,),
+    'ifc_class': (HVACComponent.ifc_class,),
+    'location': (Location.storey_name, Location.space_name),
+    'is_electronic': (HVACComponent.is_electronic,),
+    'bas_code': (HVACComponent.bas_code,),
+}
+
+def component_table_filters(query, exclude=None):
+    """
+    Wendet die Filter der Komponententabelle aus der Anfrage an
+    (q: Suche in Name und BAS-Code, ifc_class, electronic, system_id)
+    
+    Args:
+        query: Abfrage auf HVACComponent
+        exclude: Optional - Name eines Filters, der nicht angewendet wird (für Facetten)
+        
+    Returns:
+        Query mit den Filtern
+    """
+    search = request.args.get('q', '').strip()
+    if search:
+        # lower(...) LIKE '%...%' nutzt auf PostgreSQL die Trigramm-Indizes
+        term = search.lower()
+        query = query.filter(db.or_(
+            db.func.lower(HVACComponent.name).contains(term, autoescape=True),
+            db.func.lower(HVACComponent.bas_code).contains(term, autoescape=True)
+        ))
+    
+    ifc_class = request.args.get('ifc_class')
+    if ifc_class and ifc_class != 'all' and exclude != 'ifc_class':
+        query = query.filter(HVACComponent.ifc_class == ifc_class)
+    
+    electronic = request.args.get('electronic', 'all').lower()
+    if electronic in ('true', 'false') and exclude != 'electronic':
+        query = query.filter(HVACComponent.is_electronic.is_(electronic == 'true'))
+    
+    system_id = request.args.get('system_id')
+    if system_id and system_id.isdigit() and exclude != 'system_id':
+        query = query.filter(HVACComponent.system_id == int(system_id))
     
-    return hierarchy
+    return query
+
+def component_table_order(sort, descending=False):
+    """
+    Liefert die ORDER BY-Ausdrücke der Komponententabelle (ID als eindeutiges Zweitkriterium)
+    
+    Args:
+        sort: Schlüssel aus COMPONENT_SORT_COLUMNS
+        descending: Absteigend sortieren
+        
+    Returns:
+        list: Sortierausdrücke
+    """
+    columns = list(COMPONENT_SORT_COLUMNS[sort])
+    if sort != 'id':
+        columns.append(HVACComponent.id)
+    return [column.desc() if descending else column.asc() for column in columns]
+
+def invalidate_model_hierarchies(model_id):
+    """Löscht alle gespeicherten Hierarchien eines Modells"""
+    ModelHierarchy.query.filter_by(model_id=model_id).delete(synchronize_session=False)
+
+def build_model_hierarchy_json(model_id, electronic_only=False, system_id=None):
+    """
+    Berechnet die Hierarchie einer Filterkombination, ohne sie zu speichern
+    
+    Args:
+        model_id: ID des Modells
+        electronic_only: Nur elektronisch gesteuerte Komponenten
+        system_id: Optional - nur Komponenten dieses Systems
+        
+    Returns:
+        str: Hierarchie als JSON
+    """
+    rows = (
+        filtered_components_query(model_id, electronic_only, system_id)
+        .outerjoin(HVACComponent.location)
+        .with_entities(
+            HVACComponent.id, HVACComponent.name, HVACComponent.ifc_class,
+            HVACComponent.bas_code, HVACComponent.is_electronic,
+            Location.storey_id, Location.storey_name, Location.space_id, Location.space_name
+        )
+        .order_by(HVACComponent.id)
+    )
+    return json.dumps(create_hierarchy_from_rows(rows), separators=(",", ":"))
+
+def store_model_hierarchy(model_id, electronic_only=False, system_id=None):
+    """
+    Berechnet die Hierarchie einer Filterkombination und speichert sie komprimiert
+    
+    Nur während der Verarbeitung aufgerufen, für die vorberechneten Kombinationen.
+    
+    Args:
+        model_id: ID des Modells
+        electronic_only: Nur elektronisch gesteuerte Komponenten
+        system_id: Optional - nur Komponenten dieses Systems
+        
+    Returns:
+        str: Hierarchie als JSON
+    """
+    hierarchy_json = build_model_hierarchy_json(model_id, electronic_only, system_id)
+    db.session.add(ModelHierarchy(
+        model_id=model_id,
+        filter_key=hierarchy_filter_key(electronic_only, system_id),
+        data=zlib.compress(hierarchy_json.encode("utf-8"))
+    ))
+    return hierarchy_json
+
+def get_model_hierarchy_json(model_id, electronic_only=False, system_id=None):
+    """
+    Liefert die gespeicherte Hierarchie als JSON; andere Kombinationen werden berechnet,
+    aber nicht gespeichert
+    
+    Args:
+        model_id: ID des Modells
+        electronic_only: Nur elektronisch gesteuerte Komponenten
+        system_id: Optional - nur Komponenten dieses Systems
+        
+    Returns:
+        str: Hierarchie als JSON
+    """
+    data = db.session.query(ModelHierarchy.data).filter_by(
+        model_id=model_id,
+        filter_key=hierarchy_filter_key(electronic_only, system_id)
+    ).scalar()
+    if data is not None:
+        return zlib.decompress(data).decode("utf-8")
+    
+    return build_model_hierarchy_json(model_id, electronic_only, system_id)
 
 def format_filesize(size_bytes):
     """Formatiert eine Dateigröße in Bytes in ein lesbares Format"""
@@ -601,6 +2059,24 @@ def get_sample_files():
                 })
     return samples
 
+def model_component_summary(model_id):
+    """
+    Kennzahlen eines Modells in einer Aggregatabfrage (ohne Komponenten zu laden)
+    
+    Returns:
+        tuple: (Anzahl Komponenten, davon elektronisch, BAS-Standard oder None)
+    """
+    component_count, electronic_count, bas_standard = (
+        db.session.query(
+            db.func.count(HVACComponent.id),
+            db.func.sum(db.case((HVACComponent.is_electronic.is_(True), 1), else_=0)),
+            db.func.max(HVACComponent.bas_standard)
+        )
+        .filter(HVACComponent.model_id == model_id)
+        .one()
+    )
+    return component_count, int(electronic_count or 0), bas_standard
+
 def add_file_to_session(model_id):
     """Fügt eine verarbeitete Datei zur aktuellen Sitzung hinzu"""
     if 'processed_files' not in session:
@@ -614,19 +2090,18 @@ def add_file_to_session(model_id):
             session.modified = True
             return
     
-    # Lade Modellinformationen
+    # Lade Modellinformationen (Kennzahlen per Aggregat statt aller Komponenten)
     model = IFCModel.query.get(model_id)
-    components = HVACComponent.query.filter_by(model_id=model_id).all()
-    electronic_count = sum(1 for c in components if c.is_electronic)
+    component_count, electronic_count, bas_standard = model_component_summary(model_id)
     
     # Neue Datei zur Sitzung hinzufügen
     file_info = {
         'id': model_id,
         'filename': model.filename,
         'processed_at': datetime.now().strftime('%d.%m.%Y, %H:%M'),
-        'component_count': len(components),
+        'component_count': component_count,
         'electronic_count': electronic_count,
-        'standard': components[0].bas_standard if components else 'amev'
+        'standard': bas_standard or 'amev'
     }
     
     session['processed_files'].insert(0, file_info)  # Am Anfang einfügen
@@ -643,12 +2118,15 @@ def get_session_files():
     if 'processed_files' not in session:
         return []
     
-    # Überprüfe, ob alle Modelle noch in der Datenbank sind
-    valid_files = []
-    for file_info in session['processed_files']:
-        model = IFCModel.query.get(file_info['id'])
-        if model:
-            valid_files.append(file_info)
+    # Überprüfe mit einer Abfrage, ob alle Modelle noch in der Datenbank sind
+    model_ids = [file_info['id'] for file_info in session['processed_files']]
+    existing_ids = set()
+    if model_ids:
+        existing_ids = {
+            row.id for row in
+            db.session.query(IFCModel.id).filter(IFCModel.id.in_(model_ids))
+        }
+    valid_files = [file_info for file_info in session['processed_files'] if file_info['id'] in existing_ids]
     
     # Aktualisiere die Session, falls einige Modelle nicht mehr existieren
     if len(valid_files) != len(session['processed_files']):
@@ -657,51 +2135,52 @@ def get_session_files():
     
     return valid_files
 
-def export_csv(model, components, include_properties, include_location):
-    """Exportiert Modelldaten als CSV"""
+def export_csv(model, include_properties, include_location, filtered_only=False):
+    """
+    Exportiert Modelldaten als CSV
+    
+    Es werden nur die benötigten Spalten gelesen (Eigenschaften nur mit include_properties).
+    
+    Args:
+        model: IFCModel
+        include_properties: Eigenschaften exportieren
+        include_location: Standortinformationen exportieren
+        filtered_only: Filter der Modelltabelle aus der Anfrage anwenden
+        
+    Returns:
+        Response: CSV-Datei
+    """
     import csv
     from io import StringIO
     
     # CSV-Datei im Speicher erstellen
     csv_data = StringIO()
     fieldnames = ['id', 'global_id', 'name', 'ifc_class', 'is_electronic', 'bas_code', 'bas_standard']
+    columns = [
+        HVACComponent.id, HVACComponent.global_id, HVACComponent.name, HVACComponent.ifc_class,
+        HVACComponent.is_electronic, HVACComponent.bas_code, HVACComponent.bas_standard
+    ]
     
     # Füge Standortfelder hinzu, wenn gewünscht
     if include_location:
         fieldnames.extend(['storey_name', 'space_name'])
+        columns.extend([Location.storey_name, Location.space_name])
     
     # Füge Eigenschaftsfelder hinzu, wenn gewünscht
     if include_properties:
         fieldnames.append('properties')
+        columns.extend([PropertyBlock.properties, HVACComponent.properties])
     
-    writer = csv.DictWriter(csv_data, fieldnames=fieldnames)
-    writer.writeheader()
+    writer = csv.writer(csv_data)
+    writer.writerow(fieldnames)
     
     # Füge Komponenten hinzu
-    for component in components:
-        row = {
-            'id': component.id,
-            'global_id': component.global_id,
-            'name': component.name,
-            'ifc_class': component.ifc_class,
-            'is_electronic': component.is_electronic,
-            'bas_code': component.bas_code,
-            'bas_standard': component.bas_standard
-        }
-        
-        # Füge Standortinformationen hinzu
-        if include_location and component.location:
-            row['storey_name'] = component.location.storey_name
-            row['space_name'] = component.location.space_name
-        
-        # Füge Eigenschaften hinzu
+    query = export_columns_query(model.id, columns, filtered_only).order_by(HVACComponent.id)
+    for row in query.execution_options(yield_per=ARROW_BATCH_SIZE):
         if include_properties:
-            row['properties'] = json.dumps(component.properties)
-        
-        writer.writerow(row)
-    
-    # Response erstellen
-    csv_data.seek(0)
+            writer.writerow((*row[:-2], json.dumps(merge_properties(row[-2], row[-1]))))
+        else:
+            writer.writerow(row)
     
     # Erstelle Dateinamen
     filename = f"{model.filename.rsplit('.', 1)[0]}_export.csv"
@@ -712,134 +2191,570 @@ def export_csv(model, components, include_properties, include_location):
         headers={"Content-Disposition": f"attachment;filename={filename}"}
     )
 
-def export_json(model, components, include_properties, include_location):
-    """Exportiert Modelldaten als JSON"""
-    result = {
-        "model": {
-            "id": model.id,
-            "filename": model.filename,
-            "uploaded_at": model.uploaded_at.isoformat()
-        },
-        "components": []
-    }
+# Zeilen je Record Batch beim Parquet-/Arrow-Export
+ARROW_BATCH_SIZE = 10000
+
+class _StreamSink:
+    """Schreibziel für pyarrow, dessen Inhalt blockweise an den Client weitergegeben wird"""
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self._position
+    
+    def writable(self):
+        return True
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def drain(self):
+        """Liefert die seit dem letzten Aufruf geschriebenen Bytes"""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def property_map_items(type_properties, properties):
+    """Zusammengeführte Eigenschaften als (Name, Wert als Text)-Paare für eine Map-Spalte"""
+    merged = {**(type_properties or {}), **(properties or {})}
+    return [
+        (str(key), value if isinstance(value, str) else json.dumps(value))
+        for key, value in merged.items()
+    ]
+
+def export_arrow(model, format_type, include_properties, include_location, filtered_only=False):
+    """
+    Exportiert Modelldaten als Parquet- oder Arrow-Datei (IPC) mit typisierten Spalten
+    
+    Die Komponenten werden in Record Batches direkt aus einem Datenbank-Cursor gelesen
+    und blockweise an den Client gestreamt. Der Standort ist in eigene Spalten
+    aufgelöst, die Eigenschaften liegen als Map-Spalte (Name -> Wert als Text) vor.
+    
+    Args:
+        model: IFCModel
+        format_type: "parquet" oder "arrow"
+        include_properties: Eigenschaften exportieren
+        include_location: Standortspalten exportieren
+        filtered_only: Filter der Modelltabelle aus der Anfrage anwenden
+        
+    Returns:
+        Response: Gestreamte Datei
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        flash('Parquet- und Arrow-Export benötigen die pyarrow-Bibliothek, die nicht installiert ist.', 'error')
+        return redirect(url_for('view_model', model_id=model.id))
+    
+    fields = [
+        pa.field('id', pa.int64(), nullable=False),
+        pa.field('global_id', pa.string(), nullable=False),
+        pa.field('name', pa.string()),
+        pa.field('ifc_class', pa.string(), nullable=False),
+        pa.field('is_electronic', pa.bool_()),
+        pa.field('bas_code', pa.string()),
+        pa.field('bas_standard', pa.string()),
+    ]
+    columns = [
+        HVACComponent.id, HVACComponent.global_id, HVACComponent.name, HVACComponent.ifc_class,
+        HVACComponent.is_electronic, HVACComponent.bas_code, HVACComponent.bas_standard
+    ]
+    if include_location:
+        fields.extend([
+            pa.field('storey_id', pa.int64()),
+            pa.field('storey_name', pa.string()),
+            pa.field('space_id', pa.int64()),
+            pa.field('space_name', pa.string()),
+        ])
+        columns.extend([Location.storey_id, Location.storey_name, Location.space_id, Location.space_name])
+    if include_properties:
+        fields.append(pa.field('properties', pa.map_(pa.string(), pa.string())))
+        columns.extend([PropertyBlock.properties, HVACComponent.properties])
+    schema = pa.schema(fields, metadata={
+        'model_id': str(model.id),
+        'filename': model.filename
+    })
+    
+    query = export_columns_query(model.id, columns, filtered_only)
+    statement = query.order_by(HVACComponent.id).statement
+    
+    column_count = len(schema) - (1 if include_properties else 0)
+    
+    def record_batches():
+        # Serverseitiger Cursor: es liegen nie mehr als ARROW_BATCH_SIZE Zeilen im Speicher
+        result = db.session.execute(statement, execution_options={'yield_per': ARROW_BATCH_SIZE})
+        for partition in result.partitions():
+            values = list(zip(*partition))
+            arrays = [pa.array(values[i], type=schema.field(i).type) for i in range(column_count)]
+            if include_properties:
+                arrays.append(pa.array(
+                    [property_map_items(type_props, props) for type_props, props in zip(values[-2], values[-1])],
+                    type=schema.field('properties').type
+                ))
+            yield pa.record_batch(arrays, schema=schema)
+    
+    def generate():
+        sink = _StreamSink()
+        if format_type == 'parquet':
+            writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema, compression='zstd')
+        else:
+            writer = pa.ipc.new_file(pa.PythonFile(sink, mode='w'), schema)
+        for batch in record_batches():
+            writer.write_batch(batch)
+            data = sink.drain()
+            if data:
+                yield data
+        writer.close()
+        yield sink.drain()
+    
+    extension = 'parquet' if format_type == 'parquet' else 'arrow'
+    filename = f"{model.filename.rsplit('.', 1)[0]}_export.{extension}"
+    mimetype = 'application/vnd.apache.parquet' if format_type == 'parquet' else 'application/vnd.apache.arrow.file'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment;filename={filename}"}
+    )
+
+# Blockgröße beim Ausliefern temporärer Exportdateien
+EXPORT_CHUNK_SIZE = 1024 * 1024
+# Grenzen der Spaltenbreite im Excel-Export
+EXCEL_MIN_WIDTH = 10
+EXCEL_MAX_WIDTH = 50
+
+def export_columns_query(model_id, columns, filtered_only=False):
+    """
+    Spaltenabfrage über die Komponenten eines Modells samt Standort und Typeigenschaften
     
-    # Komponenten hinzufügen
-    for component in components:
+    Args:
+        model_id: ID des Modells
+        columns: Auszuwählende Spalten
+        filtered_only: Filter der Modelltabelle aus der Anfrage anwenden
+        
+    Returns:
+        Query: Ungeordnete Abfrage, die Tupel statt ORM-Objekten liefert
+    """
+    query = (
+        db.session.query(*columns)
+        .select_from(HVACComponent)
+        .outerjoin(HVACComponent.location)
+        .outerjoin(HVACComponent.type_properties)
+        .filter(HVACComponent.model_id == model_id)
+    )
+    if filtered_only:
+        query = component_table_filters(query)
+    return query
+
+def export_json(model, include_properties, include_location, filtered_only=False):
+    """
+    Exportiert Modelldaten als JSON (kompakt, eingerückt mit ?indent=<n>)
+    
+    Die Komponenten werden aus Zeilentupeln einer Spaltenabfrage aufgebaut.
+    
+    Args:
+        model: IFCModel
+        include_properties: Eigenschaften exportieren
+        include_location: Standortinformationen exportieren
+        filtered_only: Filter der Modelltabelle aus der Anfrage anwenden
+        
+    Returns:
+        Response: JSON-Datei
+    """
+    columns = [
+        HVACComponent.id, HVACComponent.global_id, HVACComponent.name, HVACComponent.ifc_class,
+        HVACComponent.is_electronic, HVACComponent.bas_code, HVACComponent.bas_standard
+    ]
+    if include_location:
+        columns.extend([
+            HVACComponent.location_id, Location.storey_name, Location.storey_id,
+            Location.space_name, Location.space_id
+        ])
+    if include_properties:
+        columns.extend([PropertyBlock.properties, HVACComponent.properties])
+    
+    query = export_columns_query(model.id, columns, filtered_only).order_by(HVACComponent.id)
+    
+    components = []
+    for row in query.execution_options(yield_per=ARROW_BATCH_SIZE):
         comp_data = {
-            "id": component.id,
-            "global_id": component.global_id,
-            "name": component.name,
-            "ifc_class": component.ifc_class,
-            "is_electronic": component.is_electronic,
-            "bas_code": component.bas_code,
-            "bas_standard": component.bas_standard
+            "id": row[0],
+            "global_id": row[1],
+            "name": row[2],
+            "ifc_class": row[3],
+            "is_electronic": row[4],
+            "bas_code": row[5],
+            "bas_standard": row[6]
         }
         
         # Standortinformationen hinzufügen
-        if include_location and component.location:
+        if include_location and row[7] is not None:
             comp_data["location"] = {
-                "storey_name": component.location.storey_name,
-                "storey_id": component.location.storey_id,
-                "space_name": component.location.space_name,
-                "space_id": component.location.space_id
+                "storey_name": row[8],
+                "storey_id": row[9],
+                "space_name": row[10],
+                "space_id": row[11]
             }
         
         # Eigenschaften hinzufügen
         if include_properties:
-            comp_data["properties"] = component.properties
+            comp_data["properties"] = merge_properties(row[-2], row[-1])
         
-        result["components"].append(comp_data)
+        components.append(comp_data)
+    
+    response = app.json.response({
+        "model": {
+            "id": model.id,
+            "filename": model.filename,
+            "uploaded_at": model.uploaded_at.isoformat()
+        },
+        "components": components
+    })
     
     # Erstelle Dateinamen
     filename = f"{model.filename.rsplit('.', 1)[0]}_export.json"
+    response.headers["Content-Disposition"] = f"attachment;filename={filename}"
+    return response
+
+def stream_temp_file(path, chunk_size=EXPORT_CHUNK_SIZE):
+    """Liefert eine temporäre Datei blockweise und löscht sie danach"""
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        os.remove(path)
+
+def export_excel(model, include_properties, include_location, filtered_only=False):
+    """
+    Exportiert Modelldaten als Excel-Datei
+    
+    Die Zeilen werden aus einem Datenbank-Cursor in ein Write-Only-Workbook geschrieben,
+    das nur die aktuelle Zeile im Speicher hält, und die fertige Datei wird aus einer
+    temporären Datei an den Client gestreamt. Da Spaltenbreiten im Write-Only-Modus
+    vor der ersten Zeile feststehen müssen, werden sie vorab per SQL aus den
+    maximalen Feldlängen bestimmt.
+    
+    Args:
+        model: IFCModel
+        include_properties: Eigenschaften exportieren
+        include_location: Standortspalten exportieren
+        filtered_only: Filter der Modelltabelle aus der Anfrage anwenden
+        
+    Returns:
+        Response: Gestreamte Datei
+    """
+    try:
+        from openpyxl import Workbook
+        from openpyxl.utils import get_column_letter
+    except ImportError:
+        flash('Excel-Export benötigt die openpyxl-Bibliothek, die nicht installiert ist.', 'error')
+        return redirect(url_for('view_model', model_id=model.id))
+    
+    # Header und Spalten
+    headers = ['ID', 'Global ID', 'Name', 'IFC-Klasse', 'Elektronisch', 'BAS-Code', 'BAS-Standard']
+    columns = [
+        HVACComponent.id, HVACComponent.global_id, HVACComponent.name, HVACComponent.ifc_class,
+        HVACComponent.is_electronic, HVACComponent.bas_code, HVACComponent.bas_standard
+    ]
+    
+    # Füge Standortfelder hinzu
+    if include_location:
+        headers.extend(['Stockwerk', 'Raum'])
+        columns.extend([Location.storey_name, Location.space_name])
+    
+    # Eigenschaften-Header
+    if include_properties:
+        headers.append('Eigenschaften')
+        columns.extend([PropertyBlock.properties, HVACComponent.properties])
+    
+    query = export_columns_query(model.id, columns, filtered_only)
+    
+    # Maximale Feldlängen in einer Aggregatabfrage statt über alle Zellen
+    text_columns = columns[1:len(columns) - 2] if include_properties else columns[1:]
+    length_columns = [db.func.length(db.cast(HVACComponent.id, db.String))] + [
+        db.func.length(column) for column in text_columns if column is not HVACComponent.is_electronic
+    ]
+    lengths = list(query.with_entities(*[db.func.max(column) for column in length_columns]).one())
+    lengths.insert(4, len('Nein'))
+    if include_properties:
+        # JSON der Eigenschaften ist praktisch immer breiter als die Obergrenze
+        lengths.append(EXCEL_MAX_WIDTH)
+    
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Komponenten")
+    
+    # Spaltenbreiten anpassen (im Write-Only-Modus vor der ersten Zeile)
+    for i, (header, max_length) in enumerate(zip(headers, lengths), 1):
+        max_length = max(len(header), max_length or 0)
+        ws.column_dimensions[get_column_letter(i)].width = max(EXCEL_MIN_WIDTH, min(max_length + 2, EXCEL_MAX_WIDTH))
+    
+    ws.append(headers)
+    
+    # Daten hinzufügen
+    statement = query.order_by(HVACComponent.id).statement
+    result = db.session.execute(statement, execution_options={'yield_per': ARROW_BATCH_SIZE})
+    for row in result:
+        row = list(row)
+        row[4] = 'Ja' if row[4] else 'Nein'
+        
+        # Standortinformationen
+        if include_location:
+            row[7] = row[7] or ''
+            row[8] = row[8] or ''
+        
+        # Eigenschaften
+        if include_properties:
+            row[-2:] = [json.dumps(merge_properties(*row[-2:]))]
+        
+        ws.append(row)
+    
+    # In temporäre Datei speichern und von dort streamen
+    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as temp_file:
+        temp_path = temp_file.name
+    try:
+        wb.save(temp_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    
+    # Erstelle Dateinamen
+    filename = f"{model.filename.rsplit('.', 1)[0]}_export.xlsx"
     
     return Response(
-        json.dumps(result, indent=2),
-        mimetype="application/json",
-        headers={"Content-Disposition": f"attachment;filename={filename}"}
+        stream_temp_file(temp_path),
+        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers={
+            "Content-Disposition": f"attachment;filename={filename}",
+            "Content-Length": str(os.path.getsize(temp_path))
+        }
     )
 
-def export_excel(model, components, include_properties, include_location):
-    """Exportiert Modelldaten als Excel-Datei"""
-    # Hier benötigst du eine Excel-Bibliothek wie xlsxwriter oder openpyxl
-    # Dies ist nur ein Beispiel mit openpyxl
-    try:
-        from openpyxl import Workbook
-        from io import BytesIO
+# Exportformate und die dafür benötigten optionalen Bibliotheken
+EXPORT_FORMATS = {
+    'csv': None,
+    'json': None,
+    'xlsx': 'openpyxl',
+    'parquet': 'pyarrow',
+    'arrow': 'pyarrow',
+}
+
+def check_export_format(format_type):
+    """
+    Prüft vorab, ob ein Exportformat bekannt und verfügbar ist
+    
+    Returns:
+        str: Fehlermeldung oder None
+    """
+    if format_type not in EXPORT_FORMATS:
+        return f'Unbekanntes Exportformat: {format_type}'
+    library = EXPORT_FORMATS[format_type]
+    if library:
+        try:
+            __import__(library)
+        except ImportError:
+            return f'Das Exportformat {format_type} benötigt die {library}-Bibliothek, die nicht installiert ist.'
+    return None
+
+def export_model_to_file(model_id, format_type, options):
+    """
+    Exportiert ein Modell über export_model_data in eine temporäre Datei
+    
+    Läuft in einem Worker-Thread mit eigenem Anfragekontext und damit
+    eigener Datenbanksitzung.
+    
+    Args:
+        model_id: ID des Modells
+        format_type: Exportformat
+        options: Weitere Parameter des Exports (properties, location)
         
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Komponenten"
+    Returns:
+        tuple: (Dateiname des Exports, Pfad der temporären Datei, Größe in Bytes)
+    """
+    query_string = {'format': format_type, **options}
+    with app.test_request_context(f'/export/model/{model_id}', query_string=query_string):
+        response = export_model_data(model_id=model_id)
+        if response.status_code != 200:
+            raise ValueError(f'Export von Modell {model_id} fehlgeschlagen (Status {response.status_code})')
         
-        # Header hinzufügen
-        headers = ['ID', 'Global ID', 'Name', 'IFC-Klasse', 'Elektronisch', 'BAS-Code', 'BAS-Standard']
+        filename = response.headers['Content-Disposition'].split('filename=', 1)[1]
+        with tempfile.NamedTemporaryFile(suffix=f'.{format_type}', delete=False) as temp_file:
+            try:
+                for chunk in response.iter_encoded():
+                    temp_file.write(chunk)
+            except BaseException:
+                temp_file.close()
+                os.remove(temp_file.name)
+                raise
+            finally:
+                response.close()
+        return filename, temp_file.name, os.path.getsize(temp_file.name)
+
+def generate_model_archive(archive, model_ids, format_type, options):
+    """
+    Erzeugt die Modellexporte parallel und schreibt sie nacheinander ins Archiv
+    
+    Es laufen höchstens EXPORT_ARCHIVE_WORKERS Exporte gleichzeitig; jede Datei
+    wird ins Archiv geschrieben, sobald sie (in der angefragten Reihenfolge)
+    fertig ist. Fehlgeschlagene Exporte werden im Manifest vermerkt.
+    
+    Args:
+        archive: ArchiveStream
+        model_ids: IDs der Modelle
+        format_type: Exportformat
+        options: Weitere Parameter des Exports (properties, location)
         
-        # Füge Standortfelder hinzu
-        if include_location:
-            headers.extend(['Stockwerk', 'Raum'])
+    Yields:
+        bytes: Archivdaten
+    """
+    workers = max(1, app.config['EXPORT_ARCHIVE_WORKERS'])
+    remaining = iter(model_ids)
+    pending = deque()
+    manifest = []
+    
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='export')
+    
+    def submit_next():
+        model_id = next(remaining, None)
+        if model_id is not None:
+            pending.append((model_id, executor.submit(export_model_to_file, model_id, format_type, options)))
+    
+    try:
+        for _ in range(workers):
+            submit_next()
         
-        # Eigenschaften-Header
-        if include_properties:
-            headers.append('Eigenschaften')
-        
-        ws.append(headers)
-        
-        # Daten hinzufügen
-        for component in components:
-            row = [
-                component.id,
-                component.global_id,
-                component.name,
-                component.ifc_class,
-                'Ja' if component.is_electronic else 'Nein',
-                component.bas_code,
-                component.bas_standard
-            ]
-            
-            # Standortinformationen
-            if include_location:
-                if component.location:
-                    row.extend([
-                        component.location.storey_name,
-                        component.location.space_name
-                    ])
-                else:
-                    row.extend(['', ''])
-            
-            # Eigenschaften
-            if include_properties:
-                row.append(json.dumps(component.properties))
+        while pending:
+            model_id, future = pending.popleft()
+            submit_next()
+            try:
+                filename, path, size = future.result()
+            except Exception as e:
+                app.logger.exception("Export von Modell %s für das Archiv fehlgeschlagen", model_id)
+                manifest.append({'model_id': model_id, 'error': str(e)})
+                continue
             
-            ws.append(row)
-        
-        # Spaltenbreiten anpassen
-        for i, column in enumerate(ws.columns, 1):
-            max_length = 0
-            column_letter = ws.cell(row=1, column=i).column_letter
-            for cell in column:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            
-            adjusted_width = max(10, min(max_length + 2, 50))
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Speichere in BytesIO
-        excel_data = BytesIO()
-        wb.save(excel_data)
-        excel_data.seek(0)
+            name = f"{model_id}_{filename}"
+            try:
+                yield from archive.add_file(name, path)
+            finally:
+                os.remove(path)
+            manifest.append({'model_id': model_id, 'file': name, 'size': size})
         
-        # Erstelle Dateinamen
-        filename = f"{model.filename.rsplit('.', 1)[0]}_export.xlsx"
+        yield from archive.add_bytes('manifest.json', json.dumps({
+            'format': format_type,
+            'created_at': datetime.now().isoformat(),
+            'models': manifest
+        }, indent=2).encode('utf-8'))
+        yield from archive.close()
+    finally:
+        # Bei Abbruch (z.B. Client getrennt) laufende Exporte abwarten und aufräumen
+        executor.shutdown(wait=True, cancel_futures=True)
+        for _, future in pending:
+            if not future.cancelled() and future.exception() is None:
+                os.remove(future.result()[1])
+
+# Häufige Abfragen, die über einen Index bedient werden müssen
+HOT_QUERIES = {
+    "Komponente nach (model_id, global_id)":
+        "SELECT id FROM hvac_components WHERE model_id = :model_id AND global_id = :global_id",
+    "Elektronische Komponenten eines Modells":
+        "SELECT COUNT(*) FROM hvac_components WHERE model_id = :model_id AND is_electronic = :is_electronic",
+    "IFC-Klassen eines Modells":
+        "SELECT ifc_class, COUNT(*) FROM hvac_components WHERE model_id = :model_id GROUP BY ifc_class",
+    "Standorte eines Modells":
+        "SELECT id, storey_id, space_id FROM locations WHERE model_id = :model_id",
+}
+HOT_QUERY_PARAMS = {"model_id": 1, "global_id": "0000000000000000000000", "is_electronic": True}
+
+def explain_query(sql, params):
+    """
+    Liefert den Ausführungsplan einer Abfrage und ob dieser einen Index verwendet
+    
+    Args:
+        sql: SQL-Abfrage mit benannten Parametern
+        params: Parameterwerte
         
-        return Response(
-            excel_data.getvalue(),
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment;filename={filename}"}
-        )
+    Returns:
+        tuple: (verwendet Index, Plan als Text)
+    """
+    dialect = db.engine.dialect.name
+    with db.engine.connect() as connection:
+        if dialect == 'postgresql':
+            # Kleine Tabellen werden sonst sequenziell gelesen; geprüft wird, ob ein Index nutzbar ist
+            connection.execute(db.text("SET enable_seqscan = off"))
+            plan = "\n".join(row[0] for row in connection.execute(db.text(f"EXPLAIN {sql}"), params))
+            uses_index = "Index" in plan and "Seq Scan" not in plan
+        elif dialect == 'sqlite':
+            plan = "\n".join(row[-1] for row in connection.execute(db.text(f"EXPLAIN QUERY PLAN {sql}"), params))
+            uses_index = "USING INDEX" in plan or "USING COVERING INDEX" in plan
+        else:
+            plan = "\n".join(str(row) for row in connection.execute(db.text(f"EXPLAIN {sql}"), params))
+            uses_index = None
+        connection.rollback()
+    return uses_index, plan
+
+@app.cli.command('export-columns')
+@click.option('--model-id', type=int, multiple=True, help='Nur diese Modelle (mehrfach möglich)')
+def export_columns_command(model_id):
+    """Schreibt die Spaltendateien für Auswertungen (neu), z.B. für bestehende Modelle"""
+    model_ids = model_id or [model.id for model in IFCModel.query.with_entities(IFCModel.id)]
+    for current_id in model_ids:
+        count = save_model_columns(current_id)
+        click.echo(f"Modell {current_id}: {count} Komponenten")
+
+@app.cli.command('export-archive')
+@click.argument('output', type=click.Path(dir_okay=False, writable=True))
+@click.option('--model-id', type=int, multiple=True, help='Nur diese Modelle (mehrfach möglich)')
+@click.option('--format', 'format_type', default='csv', type=click.Choice(list(EXPORT_FORMATS)), help='Exportformat je Modell')
+@click.option('--archive', 'archive_format', default='zip', type=click.Choice(list(ARCHIVE_FORMATS)), help='Archivformat')
+@click.option('--no-properties', is_flag=True, help='Ohne Eigenschaften exportieren')
+@click.option('--no-location', is_flag=True, help='Ohne Standortinformationen exportieren')
+def export_archive_command(output, model_id, format_type, archive_format, no_properties, no_location):
+    """Exportiert mehrere (standardmäßig alle) Modelle in ein Archiv"""
+    error = check_export_format(format_type)
+    if error:
+        raise click.ClickException(error)
     
-    except ImportError:
-        flash('Excel-Export benötigt die openpyxl-Bibliothek, die nicht installiert ist.', 'error')
-        return redirect(url_for('view_model', model_id=model.id))
+    model_ids = model_id or [model.id for model in IFCModel.query.with_entities(IFCModel.id).order_by(IFCModel.id)]
+    options = {
+        'properties': 'false' if no_properties else 'true',
+        'location': 'false' if no_location else 'true'
+    }
+    
+    archive = ArchiveStream(archive_format)
+    with open(output, 'wb') as f:
+        for data in generate_model_archive(archive, model_ids, format_type, options):
+            f.write(data)
+    click.echo(f"{len(model_ids)} Modelle nach {output} exportiert")
+
+@app.cli.command('check-indexes')
+def check_indexes_command():
+    """Prüft per EXPLAIN, dass die häufigen Abfragen Indizes verwenden"""
+    failed = False
+    for name, sql in HOT_QUERIES.items():
+        uses_index, plan = explain_query(sql, HOT_QUERY_PARAMS)
+        status = "OK" if uses_index else ("UNBEKANNT" if uses_index is None else "KEIN INDEX")
+        click.echo(f"[{status}] {name}")
+        click.echo("    " + plan.replace("\n", "\n    "))
+        failed = failed or uses_index is False
+    
+    if failed:
+        raise SystemExit(1)
 
 # Hauptprogramm
 if __name__ == '__main__':
@@ -854,8 +2769,15 @@ if __name__ == '__main__':
         standard = sys.argv[3] if len(sys.argv) > 3 else "amev"
         electronic_only = sys.argv[4].lower() == "true" if len(sys.argv) > 4 else True
         
+        # Komprimierte Dateien werden zuerst in den Upload-Speicher entpackt
+        open_path = ifc_file_path
+        compression = compression_for(ifc_file_path)
+        if compression is not None:
+            with open(ifc_file_path, 'rb') as f:
+                open_path = upload_store.save_stream(f, compression=compression).path
+        
         # IFC-Datei öffnen
-        ifc_file = ifcopenshell.open(ifc_file_path)
+        ifc_file = ifcopenshell.open(open_path)
         
         # Extraktoren und Classifier initialisieren
         location_extractor = LocationExtractor(ifc_file)
@@ -0,0 +1,33 @@
+"""Add precomputed model hierarchies
+
+Revision ID: 0a6d2e8f4b13
+Revises: f19b3d6a0c58
+Create Date: 2026-10-19 14:48:09.652177
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a6d2e8f4b13'
+down_revision = 'f19b3d6a0c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('model_hierarchies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('model_id', sa.Integer(), nullable=False),
+    sa.Column('filter_key', sa.String(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['model_id'], ['ifc_models.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('model_id', 'filter_key', name='uq_model_hierarchies_model_filter')
+    )
+
+
+def downgrade():
+    op.drop_table('model_hierarchies')
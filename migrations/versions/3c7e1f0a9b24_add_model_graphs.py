@@ -0,0 +1,39 @@
+"""Add model graphs
+
+Revision ID: 3c7e1f0a9b24
+Revises: 59d29a2e9481
+Create Date: 2026-10-19 09:12:31.504812
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7e1f0a9b24'
+down_revision = '59d29a2e9481'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('model_graphs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('model_id', sa.Integer(), nullable=False),
+    sa.Column('node_count', sa.Integer(), nullable=False),
+    sa.Column('edge_count', sa.Integer(), nullable=False),
+    sa.Column('node_keys', sa.JSON(), nullable=False),
+    sa.Column('node_types', sa.JSON(), nullable=False),
+    sa.Column('type_codes', sa.LargeBinary(), nullable=False),
+    sa.Column('indptr', sa.LargeBinary(), nullable=False),
+    sa.Column('indices', sa.LargeBinary(), nullable=False),
+    sa.Column('labels', sa.LargeBinary(), nullable=False),
+    sa.Column('built_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['model_id'], ['ifc_models.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('model_id')
+    )
+
+
+def downgrade():
+    op.drop_table('model_graphs')
@@ -0,0 +1,43 @@
+"""Trigram indexes for component text search
+
+Revision ID: 4c9e7a2d1f86
+Revises: 0a6d2e8f4b13
+Create Date: 2026-10-19 15:02:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c9e7a2d1f86'
+down_revision = '0a6d2e8f4b13'
+branch_labels = None
+depends_on = None
+
+# (Index, Spalte) für die Suche mit LIKE '%...%'
+SEARCH_COLUMNS = [
+    ('ix_hvac_components_name_trgm', 'name'),
+    ('ix_hvac_components_bas_code_trgm', 'bas_code'),
+]
+
+
+def upgrade():
+    # pg_trgm gibt es nur auf PostgreSQL
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index, column in SEARCH_COLUMNS:
+        op.create_index(
+            index, 'hvac_components', [sa.text(f'lower({column}) gin_trgm_ops')],
+            postgresql_using='gin'
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for index, _ in SEARCH_COLUMNS:
+        op.drop_index(index, table_name='hvac_components')
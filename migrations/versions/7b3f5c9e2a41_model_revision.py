@@ -0,0 +1,31 @@
+"""Add revision counter and update time to models
+
+Revision ID: 7b3f5c9e2a41
+Revises: 4c9e7a2d1f86
+Create Date: 2026-10-19 15:21:07.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3f5c9e2a41'
+down_revision = '4c9e7a2d1f86'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ifc_models') as batch_op:
+        batch_op.add_column(sa.Column('revision', sa.Integer(), server_default='1', nullable=False))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Bestehende Modelle: letzte Änderung = Upload
+    op.execute('UPDATE ifc_models SET updated_at = uploaded_at')
+
+
+def downgrade():
+    with op.batch_alter_table('ifc_models') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('revision')
@@ -0,0 +1,39 @@
+"""Add shared property blocks
+
+Revision ID: 8d41b6e2c5f7
+Revises: 3c7e1f0a9b24
+Create Date: 2026-10-19 10:03:48.221907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d41b6e2c5f7'
+down_revision = '3c7e1f0a9b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('property_blocks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('block_key', sa.String(length=40), nullable=False),
+    sa.Column('properties', sa.JSON(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('block_key')
+    )
+    with op.batch_alter_table('hvac_components') as batch_op:
+        batch_op.add_column(sa.Column('type_properties_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_hvac_components_type_properties_id', 'property_blocks',
+            ['type_properties_id'], ['id']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('hvac_components') as batch_op:
+        batch_op.drop_constraint('fk_hvac_components_type_properties_id', type_='foreignkey')
+        batch_op.drop_column('type_properties_id')
+    op.drop_table('property_blocks')
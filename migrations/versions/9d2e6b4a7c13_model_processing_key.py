@@ -0,0 +1,26 @@
+"""Add processing key to models
+
+Revision ID: 9d2e6b4a7c13
+Revises: 7b3f5c9e2a41
+Create Date: 2026-10-19 16:02:41.915374
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2e6b4a7c13'
+down_revision = '7b3f5c9e2a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ifc_models') as batch_op:
+        batch_op.add_column(sa.Column('processing_key', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('ifc_models') as batch_op:
+        batch_op.drop_column('processing_key')
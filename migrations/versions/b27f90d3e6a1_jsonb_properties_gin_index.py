@@ -0,0 +1,54 @@
+"""JSONB properties with GIN index
+
+Revision ID: b27f90d3e6a1
+Revises: 8d41b6e2c5f7
+Create Date: 2026-10-19 11:20:05.877316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b27f90d3e6a1'
+down_revision = '8d41b6e2c5f7'
+branch_labels = None
+depends_on = None
+
+# (Tabelle, Index) mit JSON-Eigenschaften
+PROPERTY_COLUMNS = [
+    ('hvac_components', 'ix_hvac_components_properties'),
+    ('property_blocks', 'ix_property_blocks_properties'),
+]
+
+
+def upgrade():
+    # JSONB und GIN-Indizes gibt es nur auf PostgreSQL
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, index in PROPERTY_COLUMNS:
+        op.alter_column(
+            table, 'properties',
+            type_=postgresql.JSONB(),
+            postgresql_using='properties::jsonb'
+        )
+        op.create_index(
+            index, table, ['properties'],
+            postgresql_using='gin',
+            postgresql_ops={'properties': 'jsonb_path_ops'}
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, index in PROPERTY_COLUMNS:
+        op.drop_index(index, table_name=table)
+        op.alter_column(
+            table, 'properties',
+            type_=sa.JSON(),
+            postgresql_using='properties::json'
+        )
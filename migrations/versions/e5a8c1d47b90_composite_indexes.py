@@ -0,0 +1,60 @@
+"""Composite indexes for model-scoped queries
+
+Revision ID: e5a8c1d47b90
+Revises: b27f90d3e6a1
+Create Date: 2026-10-19 12:41:17.093650
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a8c1d47b90'
+down_revision = 'b27f90d3e6a1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GlobalIds sind nur innerhalb eines Modells eindeutig
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint('hvac_components_global_id_key', 'hvac_components', type_='unique')
+    else:
+        # SQLite: unbenannte Constraints über eine Namenskonvention adressieren
+        with op.batch_alter_table(
+            'hvac_components',
+            naming_convention={'uq': 'uq_%(table_name)s_%(column_0_name)s'}
+        ) as batch_op:
+            batch_op.drop_constraint('uq_hvac_components_global_id', type_='unique')
+
+    op.create_index('uq_hvac_components_model_global_id', 'hvac_components', ['model_id', 'global_id'], unique=True)
+    op.create_index('ix_hvac_components_model_electronic', 'hvac_components', ['model_id', 'is_electronic'])
+    op.create_index('ix_hvac_components_model_ifc_class', 'hvac_components', ['model_id', 'ifc_class'])
+    op.create_index('ix_hvac_components_ifc_class', 'hvac_components', ['ifc_class'])
+
+    # Standorte einem Modell zuordnen (Schlüssel für die Deduplizierung)
+    with op.batch_alter_table('locations') as batch_op:
+        batch_op.add_column(sa.Column('model_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_locations_model_id', 'ifc_models', ['model_id'], ['id'])
+
+    op.execute(
+        'UPDATE locations SET model_id = ('
+        'SELECT MIN(hvac_components.model_id) FROM hvac_components '
+        'WHERE hvac_components.location_id = locations.id)'
+    )
+    op.create_index('ix_locations_model_storey_space', 'locations', ['model_id', 'storey_id', 'space_id'])
+
+
+def downgrade():
+    op.drop_index('ix_locations_model_storey_space', table_name='locations')
+    with op.batch_alter_table('locations') as batch_op:
+        batch_op.drop_constraint('fk_locations_model_id', type_='foreignkey')
+        batch_op.drop_column('model_id')
+
+    op.drop_index('ix_hvac_components_ifc_class', table_name='hvac_components')
+    op.drop_index('ix_hvac_components_model_ifc_class', table_name='hvac_components')
+    op.drop_index('ix_hvac_components_model_electronic', table_name='hvac_components')
+    op.drop_index('uq_hvac_components_model_global_id', table_name='hvac_components')
+    with op.batch_alter_table('hvac_components') as batch_op:
+        batch_op.create_unique_constraint('hvac_components_global_id_key', ['global_id'])
@@ -0,0 +1,50 @@
+"""Deduplicate locations per model
+
+Revision ID: f19b3d6a0c58
+Revises: e5a8c1d47b90
+Create Date: 2026-10-19 13:55:42.310284
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f19b3d6a0c58'
+down_revision = 'e5a8c1d47b90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 1. Komponenten auf den ältesten gleichwertigen Standort umhängen
+    op.execute(
+        'UPDATE hvac_components SET location_id = ('
+        'SELECT MIN(other.id) FROM locations AS current '
+        'JOIN locations AS other '
+        'ON COALESCE(other.model_id, -1) = COALESCE(current.model_id, -1) '
+        'AND COALESCE(other.storey_id, -1) = COALESCE(current.storey_id, -1) '
+        'AND COALESCE(other.space_id, -1) = COALESCE(current.space_id, -1) '
+        'WHERE current.id = hvac_components.location_id) '
+        'WHERE location_id IS NOT NULL'
+    )
+
+    # 2. Nicht mehr referenzierte Standorte (Duplikate und Waisen) löschen
+    op.execute(
+        'DELETE FROM locations WHERE id NOT IN ('
+        'SELECT location_id FROM hvac_components WHERE location_id IS NOT NULL)'
+    )
+
+    # 3. Schlüssel als eindeutigen Index erzwingen
+    op.drop_index('ix_locations_model_storey_space', table_name='locations')
+    op.create_index(
+        'uq_locations_model_storey_space', 'locations',
+        ['model_id', sa.text('COALESCE(storey_id, -1)'), sa.text('COALESCE(space_id, -1)')],
+        unique=True
+    )
+
+
+def downgrade():
+    # Zusammengeführte Standorte werden nicht wieder aufgeteilt
+    op.drop_index('uq_locations_model_storey_space', table_name='locations')
+    op.create_index('ix_locations_model_storey_space', 'locations', ['model_id', 'storey_id', 'space_id'])
@@ -3,9 +3,51 @@ Erweiterte models.py mit Integration für BAS-Codes und Standortinformationen
 """
 
 from datetime import datetime
+from functools import wraps
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import DDL, event
+from sqlalchemy.dialects.postgresql import JSONB
 
-db = SQLAlchemy()
+# Bind-Schlüssel der optionalen Lesereplik (SQLALCHEMY_BINDS)
+READ_REPLICA_BIND = "replica"
+
+
+class RoutingSession(Session):
+    """
+    Session, die in mit @use_read_replica markierten Anfragen reine SELECT-Abfragen
+    an die Lesereplik schickt. Flushes, DML und Textanweisungen gehen immer an die
+    Primärdatenbank; ohne konfigurierte Replik verhält sie sich wie die Standard-Session.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and getattr(clause, "is_select", False)
+            and has_app_context()
+            and g.get("use_read_replica")
+        ):
+            replica = self._db.engines.get(READ_REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def use_read_replica(view):
+    """Decorator: Lesende Abfragen der Anfrage an die Lesereplik (falls konfiguriert)"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.use_read_replica = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
+
+# JSON-Spalten: JSONB (mit GIN-Index) auf PostgreSQL, JSON auf anderen Datenbanken
+JSONType = db.JSON().with_variant(JSONB(), "postgresql")
 
 class IFCModel(db.Model):
     __tablename__ = "ifc_models"
@@ -13,6 +55,11 @@ class IFCModel(db.Model):
     id          = db.Column(db.Integer, primary_key=True)
     filename    = db.Column(db.String,  nullable=False)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Wird bei jeder Verarbeitung erhöht (ETags, Last-Modified, Antwort-Caches)
+    revision    = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+    updated_at  = db.Column(db.DateTime, default=datetime.utcnow)
+    # SHA-256 aus Dateiinhalt und Optionen der letzten Verarbeitung (siehe processing_lock.py)
+    processing_key = db.Column(db.String(64))
 
     components  = db.relationship(
         "HVACComponent",
@@ -56,6 +103,7 @@ class Location(db.Model):
     __tablename__ = "locations"
     
     id          = db.Column(db.Integer, primary_key=True)
+    model_id    = db.Column(db.Integer, db.ForeignKey("ifc_models.id"))
     storey_id   = db.Column(db.Integer)
     storey_name = db.Column(db.String)
     space_id    = db.Column(db.Integer)
@@ -68,17 +116,58 @@ class Location(db.Model):
         foreign_keys="[HVACComponent.location_id]"
     )
 
+# Ein Standort pro (Modell, Geschoss, Raum); NULL-Werte zählen als gleich
+db.Index(
+    "uq_locations_model_storey_space",
+    Location.model_id,
+    db.func.coalesce(Location.storey_id, -1),
+    db.func.coalesce(Location.space_id, -1),
+    unique=True
+)
+
+class PropertyBlock(db.Model):
+    """Geteilte Eigenschaften (z.B. PropertySets eines Typobjekts), inhaltsbasiert dedupliziert"""
+    __tablename__ = "property_blocks"
+    __table_args__ = (
+        db.Index(
+            "ix_property_blocks_properties", "properties",
+            postgresql_using="gin", postgresql_ops={"properties": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    id          = db.Column(db.Integer, primary_key=True)
+    block_key   = db.Column(db.String(40), unique=True, nullable=False)  # SHA1 der Eigenschaften
+    properties  = db.Column(JSONType, nullable=False)
+
+    # Beziehung zu HVACComponent
+    components  = db.relationship(
+        "HVACComponent",
+        back_populates="type_properties",
+        foreign_keys="[HVACComponent.type_properties_id]"
+    )
+
 class HVACComponent(db.Model):
     __tablename__ = "hvac_components"
+    __table_args__ = (
+        # GlobalIds sind nur innerhalb eines Modells eindeutig
+        db.Index("uq_hvac_components_model_global_id", "model_id", "global_id", unique=True),
+        db.Index("ix_hvac_components_model_electronic", "model_id", "is_electronic"),
+        db.Index("ix_hvac_components_model_ifc_class", "model_id", "ifc_class"),
+        db.Index("ix_hvac_components_ifc_class", "ifc_class"),
+        db.Index(
+            "ix_hvac_components_properties", "properties",
+            postgresql_using="gin", postgresql_ops={"properties": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     # Primärschlüssel: KEIN foreign_key hier!
     id           = db.Column(db.Integer, primary_key=True)
 
-    global_id    = db.Column(db.String,  unique=True, nullable=False)
+    global_id    = db.Column(db.String,  nullable=False)
     name         = db.Column(db.String)
     ifc_class    = db.Column(db.String,  nullable=False)
     object_type  = db.Column(db.String)
-    properties   = db.Column(db.JSON)
+    properties   = db.Column(JSONType)
     is_electronic = db.Column(db.Boolean, default=False)
     
     # BAS-Codes
@@ -90,6 +179,7 @@ class HVACComponent(db.Model):
     system_id    = db.Column(db.Integer, db.ForeignKey("distribution_systems.id"))
     mapping_id   = db.Column(db.Integer, db.ForeignKey("classification_mappings.id"))
     location_id  = db.Column(db.Integer, db.ForeignKey("locations.id"))
+    type_properties_id = db.Column(db.Integer, db.ForeignKey("property_blocks.id"))
 
     # Beziehungen
     model        = db.relationship(
@@ -112,6 +202,18 @@ class HVACComponent(db.Model):
         back_populates="components",
         foreign_keys=[location_id]
     )
+    type_properties = db.relationship(
+        "PropertyBlock",
+        back_populates="components",
+        foreign_keys=[type_properties_id]
+    )
+    
+    @property
+    def all_properties(self):
+        """Liefert Typ- und Instanzeigenschaften (Instanzwerte überschreiben Typwerte)"""
+        if not self.type_properties:
+            return self.properties
+        return {**self.type_properties.properties, **(self.properties or {})}
     
     @property
     def storey_name(self):
@@ -127,12 +229,13 @@ class HVACComponent(db.Model):
         """Konvertiert das Objekt in ein Wörterbuch (für JSON-Serialisierung)"""
         result = {
             "element_id": self.id,
+            "global_id": self.global_id,
             "element_name": self.name,
             "element_type": self.ifc_class,
             "is_electronic": self.is_electronic,
             "bas_code": self.bas_code,
             "standard": self.bas_standard,
-            "properties": self.properties
+            "properties": self.all_properties
         }
         
         # Standortinformationen hinzufügen, falls vorhanden
@@ -144,4 +247,106 @@ class HVACComponent(db.Model):
                 "space_id": self.location.space_id
             }
         
-        return result
\ No newline at end of file
+        return result
+
+# Trigramm-Indizes für die Textsuche (LIKE '%...%') auf Name und BAS-Code (nur PostgreSQL)
+event.listen(
+    HVACComponent.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+db.Index(
+    "ix_hvac_components_name_trgm",
+    db.func.lower(HVACComponent.name).label("lower_name"),
+    postgresql_using="gin",
+    postgresql_ops={"lower_name": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
+db.Index(
+    "ix_hvac_components_bas_code_trgm",
+    db.func.lower(HVACComponent.bas_code).label("lower_bas_code"),
+    postgresql_using="gin",
+    postgresql_ops={"lower_bas_code": "gin_trgm_ops"}
+).ddl_if(dialect="postgresql")
+
+
+def merge_properties(type_properties, properties):
+    """Typ- und Instanzeigenschaften zusammenführen (wie HVACComponent.all_properties)"""
+    if not type_properties:
+        return properties
+    return {**type_properties, **(properties or {})}
+
+
+# Spalten für Komponenten-Wörterbücher im Format von HVACComponent.to_dict
+COMPONENT_DICT_COLUMNS = (
+    HVACComponent.id, HVACComponent.global_id, HVACComponent.name, HVACComponent.ifc_class,
+    HVACComponent.is_electronic, HVACComponent.bas_code, HVACComponent.bas_standard,
+    PropertyBlock.properties, HVACComponent.properties,
+    HVACComponent.location_id, Location.storey_name, Location.storey_id, Location.space_name, Location.space_id
+)
+
+
+def component_dict(row):
+    """
+    Komponente als Wörterbuch wie HVACComponent.to_dict aus einer Zeile mit COMPONENT_DICT_COLUMNS
+
+    Args:
+        row: Zeilentupel in der Reihenfolge von COMPONENT_DICT_COLUMNS
+
+    Returns:
+        dict: Komponentendaten
+    """
+    (component_id, global_id, name, ifc_class, is_electronic, bas_code, bas_standard,
+     type_properties, properties, location_id, storey_name, storey_id, space_name, space_id) = row
+    component = {
+        "element_id": component_id,
+        "global_id": global_id,
+        "element_name": name,
+        "element_type": ifc_class,
+        "is_electronic": is_electronic,
+        "bas_code": bas_code,
+        "standard": bas_standard,
+        "properties": merge_properties(type_properties, properties)
+    }
+    if location_id is not None:
+        component["location"] = {
+            "storey_name": storey_name,
+            "storey_id": storey_id,
+            "space_name": space_name,
+            "space_id": space_id
+        }
+    return component
+
+
+class ModelGraph(db.Model):
+    """Verbindungsgraph (CSR-Arrays) der MEP-Elemente eines Modells"""
+    __tablename__ = "model_graphs"
+
+    id          = db.Column(db.Integer, primary_key=True)
+    model_id    = db.Column(db.Integer, db.ForeignKey("ifc_models.id"), unique=True, nullable=False)
+    node_count  = db.Column(db.Integer, nullable=False, default=0)
+    edge_count  = db.Column(db.Integer, nullable=False, default=0)
+    node_keys   = db.Column(db.JSON, nullable=False)        # GlobalIds, Index = Knotennummer
+    node_types  = db.Column(db.JSON, nullable=False)        # Wörterbuch der IFC-Klassen
+    type_codes  = db.Column(db.LargeBinary, nullable=False) # array('H')
+    indptr      = db.Column(db.LargeBinary, nullable=False) # array('i')
+    indices     = db.Column(db.LargeBinary, nullable=False) # array('i')
+    labels      = db.Column(db.LargeBinary, nullable=False) # array('i'), Zusammenhangskomponenten
+    built_at    = db.Column(db.DateTime, default=datetime.utcnow)
+
+    model       = db.relationship("IFCModel")
+
+
+class ModelHierarchy(db.Model):
+    """Vorberechnete Standorthierarchie eines Modells je Filterkombination (zlib-komprimiertes JSON)"""
+    __tablename__ = "model_hierarchies"
+    __table_args__ = (
+        db.UniqueConstraint("model_id", "filter_key", name="uq_model_hierarchies_model_filter"),
+    )
+
+    id          = db.Column(db.Integer, primary_key=True)
+    model_id    = db.Column(db.Integer, db.ForeignKey("ifc_models.id"), nullable=False)
+    filter_key  = db.Column(db.String, nullable=False)  # z.B. "electronic_only=1;system_id="
+    data        = db.Column(db.LargeBinary, nullable=False)
+    created_at  = db.Column(db.DateTime, default=datetime.utcnow)
+
+    model       = db.relationship("IFCModel")
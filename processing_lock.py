@@ -0,0 +1,155 @@
+"""
+Verarbeitungssperren (processing_lock.py) für HVAC Classifier
+Serialisiert die Verarbeitung desselben Modells über Prozesse hinweg
+(PostgreSQL-Advisory-Lock bzw. Dateisperre für SQLite) und fasst gleichzeitige,
+identische Verarbeitungen innerhalb eines Prozesses zusammen
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from sqlalchemy import func, select
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def processing_key(content_hash, standard, electronic_only):
+    """
+    Schlüssel einer Verarbeitung: gleiche Datei mit gleichen Optionen ergibt dasselbe Ergebnis
+
+    Args:
+        content_hash: SHA-256 der hochgeladenen Datei
+        standard: BAS-Standard (amev oder vdi)
+        electronic_only: Nur elektronisch gesteuerte Elemente
+
+    Returns:
+        str: Hex-Hash (64 Zeichen)
+    """
+    return hashlib.sha256(f"{content_hash}:{standard}:{int(bool(electronic_only))}".encode("utf-8")).hexdigest()
+
+
+def advisory_lock_id(name):
+    """Vorzeichenbehaftete 64-Bit-Zahl für pg_advisory_xact_lock aus einem Namen"""
+    return int.from_bytes(hashlib.sha1(name.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+class ModelLock:
+    """
+    Sperre je Modell (Dateiname) für die Dauer einer Verarbeitung.
+
+    Unter PostgreSQL wird ein transaktionsgebundener Advisory-Lock verwendet; er wird
+    mit dem Commit bzw. Rollback der Verarbeitung freigegeben. Bei anderen Datenbanken
+    (SQLite) sperrt eine Datei im Sperrverzeichnis, die beim Verlassen freigegeben wird.
+    """
+
+    def __init__(self, lock_dir):
+        """
+        Args:
+            lock_dir: Verzeichnis für Sperrdateien (nur ohne PostgreSQL benötigt)
+        """
+        self.lock_dir = lock_dir
+
+    @contextmanager
+    def hold(self, session, name):
+        """
+        Wartet, bis die Sperre für `name` frei ist, und hält sie im with-Block
+
+        Args:
+            session: Datenbanksitzung der Verarbeitung
+            name: Name des Modells (Dateiname)
+        """
+        if session.get_bind().dialect.name == "postgresql":
+            session.execute(select(func.pg_advisory_xact_lock(advisory_lock_id(name))))
+            yield
+            return
+
+        os.makedirs(self.lock_dir, exist_ok=True)
+        path = os.path.join(self.lock_dir, hashlib.sha1(name.encode("utf-8")).hexdigest() + ".lock")
+        with open(path, "a+b") as f, file_lock(f):
+            yield
+
+
+@contextmanager
+def file_lock(f):
+    """
+    Exklusive Sperre auf eine geöffnete Datei (auch über Prozesse hinweg) für den with-Block
+
+    Unter Windows wird das erste Byte der Datei gesperrt; die Dateiposition steht danach
+    am Dateianfang.
+
+    Args:
+        f: Geöffnete Datei
+    """
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:  # LK_LOCK gibt nach etwa 10 Sekunden auf
+                continue
+    try:
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_UN)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class RequestCoalescer:
+    """
+    Fasst gleichzeitige Aufrufe mit demselben Schlüssel zusammen: Der erste Aufruf
+    arbeitet, alle weiteren warten auf sein Ergebnis (oder seine Ausnahme).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._running = {}
+        self.coalesced = 0
+
+    def run(self, key, function):
+        """
+        Führt `function()` aus oder wartet auf einen laufenden Aufruf mit demselben Schlüssel
+
+        Args:
+            key: Hashbarer Schlüssel (None = nicht zusammenfassen)
+            function: Aufruf ohne Argumente
+
+        Returns:
+            Ergebnis von function()
+        """
+        if key is None:
+            return function()
+
+        with self._lock:
+            future = self._running.get(key)
+            owner = future is None
+            if owner:
+                future = self._running[key] = Future()
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._running[key]
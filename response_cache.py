@@ -0,0 +1,125 @@
+"""
+Antwort-Cache (response_cache.py) für HVAC Classifier
+Größenbegrenzter LRU-Cache mit Ablaufzeit für serialisierte Antworten,
+gemeinsam genutzt von allen Threads eines Prozesses
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedResponse:
+    """Serialisierte Antwort: Status, Header (ohne Validatoren) und Inhalt"""
+
+    __slots__ = ("status", "headers", "body", "expires", "tag")
+
+    def __init__(self, status, headers, body, expires, tag):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires = expires
+        self.tag = tag
+
+    @property
+    def size(self):
+        """Ungefährer Speicherbedarf in Bytes (Inhalt und Header)"""
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers)
+
+
+class ResponseCache:
+    """
+    LRU-Cache mit Obergrenze in Bytes und Ablaufzeit je Eintrag.
+
+    Einträge tragen ein Tag (z.B. die Modell-ID), über das alle Einträge eines
+    Modells auf einmal verworfen werden können.
+    """
+
+    def __init__(self, max_bytes, ttl, max_entry_bytes=None):
+        """
+        Args:
+            max_bytes: Maximale Gesamtgröße (0 = Cache deaktiviert)
+            ttl: Lebensdauer eines Eintrags in Sekunden
+            max_entry_bytes: Größere Antworten werden nicht gespeichert (Standard: ein Viertel von max_bytes)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 4
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def get(self, key):
+        """Liefert einen gültigen Eintrag (und markiert ihn als zuletzt verwendet) oder None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, status, headers, body, tag=None):
+        """
+        Speichert eine Antwort; verdrängt dafür die am längsten nicht genutzten Einträge
+
+        Returns:
+            bool: True, wenn die Antwort gespeichert wurde
+        """
+        entry = CachedResponse(status, headers, body, time.monotonic() + self.ttl, tag)
+        size = entry.size
+        if not self.enabled or size > self.max_entry_bytes:
+            return False
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def invalidate(self, tag):
+        """Verwirft alle Einträge mit diesem Tag"""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.tag == tag]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def stats(self):
+        """Kennzahlen für /api/metrics"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / requests, 3) if requests else None,
+                "evictions": self.evictions,
+            }
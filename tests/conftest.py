@@ -0,0 +1,33 @@
+"""
+Gemeinsame Fixtures der Tests: Die Anwendung läuft gegen eine temporäre SQLite-Datenbank
+"""
+
+import os
+import tempfile
+
+import pytest
+
+# Muss vor dem Import von main gesetzt sein, da config.py die Adresse beim Import liest
+_db_dir = tempfile.mkdtemp(prefix="hvac_tests_")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_db_dir, "test.sqlite")
+os.environ.pop("DATABASE_REPLICA_URL", None)
+
+
+@pytest.fixture
+def app():
+    """Anwendung mit leerer Datenbank"""
+    from main import app, db, response_cache
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    response_cache.invalidate(None)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,65 @@
+"""
+Tests für den Archivexport mehrerer Modelle (/export/models)
+"""
+
+import io
+import json
+import tarfile
+import zipfile
+
+import pytest
+
+from models import HVACComponent, IFCModel
+
+
+@pytest.fixture
+def model_ids(app):
+    """Zwei kleine Modelle mit je zwei Komponenten"""
+    from main import db
+
+    with app.app_context():
+        ids = []
+        for number in (1, 2):
+            model = IFCModel(filename=f"modell_{number}.ifc")
+            db.session.add(model)
+            db.session.flush()
+            for index in range(2):
+                db.session.add(HVACComponent(
+                    model_id=model.id,
+                    global_id=f"{number:011d}{index:011d}",
+                    name=f"Pumpe {number}.{index}",
+                    ifc_class="IfcPump",
+                    is_electronic=True,
+                    bas_code="PU",
+                    bas_standard="amev"
+                ))
+            ids.append(model.id)
+        db.session.commit()
+        return ids
+
+
+def _archive_members(archive_format, data):
+    if archive_format == "zip":
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:*") as archive:
+        return {member.name: archive.extractfile(member).read() for member in archive.getmembers()}
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.gz"])
+def test_archive_contains_model_exports(client, model_ids, archive_format):
+    query = "&".join(f"model_id={model_id}" for model_id in model_ids)
+    response = client.get(f"/export/models?{query}&format=csv&archive={archive_format}")
+    assert response.status_code == 200
+
+    members = _archive_members(archive_format, response.get_data())
+    manifest = json.loads(members.pop("manifest.json"))
+
+    assert [entry.get("error") for entry in manifest["models"]] == [None, None]
+    assert [entry["model_id"] for entry in manifest["models"]] == model_ids
+    assert sorted(entry["file"] for entry in manifest["models"]) == sorted(members)
+    for model_id in model_ids:
+        name = next(name for name in members if name.startswith(f"{model_id}_"))
+        content = members[name].decode("utf-8-sig")
+        assert f"Pumpe {model_ids.index(model_id) + 1}.0" in content
+        assert f"Pumpe {model_ids.index(model_id) + 1}.1" in content
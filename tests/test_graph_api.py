@@ -0,0 +1,43 @@
+"""
+Tests für die Endpunkte des Verbindungsgraphen
+"""
+
+from array import array
+
+import pytest
+
+from classifier.connectivity_graph import ConnectivityGraph
+from models import IFCModel
+
+NODES = ["A" * 22, "B" * 22, "C" * 22]
+
+
+@pytest.fixture
+def model_id(app):
+    """Modell mit einer Kette A - B - C als Verbindungsgraph"""
+    from main import db, save_model_graph
+
+    with app.app_context():
+        model = IFCModel(filename="modell.ifc")
+        db.session.add(model)
+        db.session.flush()
+        graph = ConnectivityGraph(
+            NODES, ["IfcPipeSegment"], array("H", [0, 0, 0]),
+            indptr=array("i", [0, 1, 3, 4]), indices=array("i", [1, 0, 2, 1])
+        )
+        save_model_graph(model.id, graph)
+        db.session.commit()
+        return model.id
+
+
+def test_neighbors_within_hops(client, model_id):
+    response = client.get(f"/api/model/{model_id}/graph/neighbors/{NODES[0]}?hops=2")
+    assert response.status_code == 200
+    assert response.get_json()["count"] == 2
+
+
+@pytest.mark.parametrize("hops", ["abc", "1.5", "0", "51"])
+def test_neighbors_rejects_invalid_hops(client, model_id, hops):
+    response = client.get(f"/api/model/{model_id}/graph/neighbors/{NODES[0]}?hops={hops}")
+    assert response.status_code == 400
+    assert "hops" in response.get_json()["error"]
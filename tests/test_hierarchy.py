@@ -0,0 +1,57 @@
+"""
+Tests für die gespeicherten Standorthierarchien
+"""
+
+import json
+
+import pytest
+
+from models import HVACComponent, IFCModel, Location, ModelHierarchy
+
+
+@pytest.fixture
+def model_id(app):
+    """Modell mit einer Komponente in einem Raum; Hierarchien wie nach der Verarbeitung"""
+    from main import db, store_model_hierarchy
+
+    with app.app_context():
+        model = IFCModel(filename="modell.ifc")
+        db.session.add(model)
+        db.session.flush()
+        location = Location(model_id=model.id, storey_id=1, storey_name="EG", space_id=2, space_name="Raum 1")
+        db.session.add(location)
+        db.session.flush()
+        db.session.add(HVACComponent(
+            model_id=model.id, global_id="0" * 22, name="Pumpe", ifc_class="IfcPump",
+            is_electronic=True, location_id=location.id
+        ))
+        db.session.flush()
+        for electronic_only in (False, True):
+            store_model_hierarchy(model.id, electronic_only)
+        db.session.commit()
+        return model.id
+
+
+def _stored_filter_keys(app, model_id):
+    with app.app_context():
+        return sorted(key for key, in ModelHierarchy.query.filter_by(model_id=model_id)
+                      .with_entities(ModelHierarchy.filter_key))
+
+
+@pytest.mark.parametrize("query", ["system_id=1", "system_id=424242", "electronic_only=true&system_id=7"])
+def test_get_does_not_store_other_filter_combinations(app, client, model_id, query):
+    stored = _stored_filter_keys(app, model_id)
+    assert len(stored) == 2
+
+    response = client.get(f"/api/model/{model_id}/hierarchy?{query}")
+    assert response.status_code == 200
+    json.loads(response.get_data())
+
+    assert client.get(f"/api/model/{model_id}?{query}").status_code == 200
+    assert _stored_filter_keys(app, model_id) == stored
+
+
+def test_get_uses_precomputed_hierarchy(client, model_id):
+    response = client.get(f"/api/model/{model_id}/hierarchy?electronic_only=true")
+    assert response.status_code == 200
+    assert "EG" in response.get_data(as_text=True)
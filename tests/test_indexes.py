@@ -0,0 +1,41 @@
+"""
+Prüft per EXPLAIN, dass die häufigen Abfragen nach den Migrationen Indizes verwenden
+"""
+
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def migrated_app(monkeypatch):
+    """Anwendung mit einer Datenbank, die nur über `flask db upgrade` angelegt wurde"""
+    from main import app, db
+
+    # Flask-Migrate sucht das Verzeichnis migrations relativ zum Arbeitsverzeichnis
+    monkeypatch.chdir(REPO_ROOT)
+    with app.app_context():
+        db.drop_all()
+        db.session.execute(db.text("DROP TABLE IF EXISTS alembic_version"))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["db", "upgrade"])
+    assert result.exit_code == 0, result.output
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.session.execute(db.text("DROP TABLE IF EXISTS alembic_version"))
+        db.session.commit()
+
+
+def test_hot_queries_use_indexes(migrated_app):
+    from main import HOT_QUERIES, HOT_QUERY_PARAMS, explain_query
+
+    with migrated_app.app_context():
+        for name, sql in HOT_QUERIES.items():
+            uses_index, plan = explain_query(sql, HOT_QUERY_PARAMS)
+            assert uses_index, f"{name} verwendet keinen Index:\n{plan}"
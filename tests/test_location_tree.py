@@ -0,0 +1,48 @@
+"""
+Tests für die Ebenen des Standortbaums (/storeys, /spaces, /components)
+"""
+
+import pytest
+
+from models import HVACComponent, IFCModel, Location
+
+
+@pytest.fixture
+def model_id(app):
+    """Komponenten in einem Raum, ohne Standort und an einem Standort ohne Geschoss"""
+    from main import db
+
+    with app.app_context():
+        model = IFCModel(filename="modell.ifc")
+        db.session.add(model)
+        db.session.flush()
+        space = Location(model_id=model.id, storey_id=1, storey_name="EG", space_id=2, space_name="Raum 1")
+        no_storey = Location(model_id=model.id, space_id=3, space_name="Raum ohne Geschoss")
+        db.session.add_all([space, no_storey])
+        db.session.flush()
+        for index, location in enumerate([space, None, no_storey, no_storey]):
+            db.session.add(HVACComponent(
+                model_id=model.id, global_id=f"{index:022d}", name=f"Pumpe {index}",
+                ifc_class="IfcPump", location_id=location.id if location else None
+            ))
+        db.session.commit()
+        return model.id
+
+
+def test_unknown_location_bucket_matches_drill_down(client, model_id):
+    storeys = client.get(f"/api/model/{model_id}/storeys").get_json()["storeys"]
+    unknown = next(storey for storey in storeys if storey["storey_id"] is None)
+    assert unknown["component_count"] == 3
+
+    components = client.get(f"/api/model/{model_id}/storeys/none/components").get_json()
+    assert components["total"] == unknown["component_count"]
+    assert sorted(c["name"] for c in components["components"]) == ["Pumpe 1", "Pumpe 2", "Pumpe 3"]
+
+
+def test_storey_counts_match_drill_down(client, model_id):
+    storeys = client.get(f"/api/model/{model_id}/storeys").get_json()["storeys"]
+    storey = next(storey for storey in storeys if storey["storey_id"] == 1)
+    spaces = client.get(f"/api/model/{model_id}/storeys/1/spaces").get_json()
+    assert storey["component_count"] == spaces["direct_component_count"] + sum(
+        space["component_count"] for space in spaces["spaces"]
+    )
@@ -0,0 +1,66 @@
+"""
+Tests für das Speichern geteilter Eigenschaftsblöcke
+"""
+
+import threading
+
+from models import PropertyBlock
+
+BLOCKS = {
+    "a" * 40: {"Hersteller": "A"},
+    "b" * 40: {"Hersteller": "B"},
+}
+
+
+def test_save_property_blocks_reuses_existing_blocks(app):
+    from main import db, save_property_blocks
+
+    with app.app_context():
+        first = save_property_blocks({"a" * 40: BLOCKS["a" * 40]})
+        db.session.commit()
+
+        block_ids = save_property_blocks(BLOCKS)
+        db.session.commit()
+
+        assert block_ids["a" * 40] == first["a" * 40]
+        assert set(block_ids) == set(BLOCKS)
+        assert PropertyBlock.query.count() == 2
+        assert db.session.get(PropertyBlock, block_ids["b" * 40]).properties == BLOCKS["b" * 40]
+
+
+def test_save_property_blocks_tolerates_concurrent_insert(app):
+    """Eine zweite Verarbeitung fügt dieselben Blöcke ein, bevor die erste committet"""
+    from main import db, save_property_blocks
+
+    inserted = threading.Event()
+    release = threading.Event()
+    results = {}
+
+    def first_processing():
+        with app.app_context():
+            results["first"] = save_property_blocks(BLOCKS)
+            inserted.set()
+            release.wait(5)
+            db.session.commit()
+
+    def second_processing():
+        with app.app_context():
+            try:
+                results["second"] = save_property_blocks(BLOCKS)
+                db.session.commit()
+            except Exception as e:
+                results["second"] = e
+
+    first = threading.Thread(target=first_processing)
+    first.start()
+    assert inserted.wait(5)
+    second = threading.Thread(target=second_processing)
+    second.start()
+    second.join(0.3)
+    release.set()
+    first.join(5)
+    second.join(10)
+
+    assert results["second"] == results["first"]
+    with app.app_context():
+        assert PropertyBlock.query.count() == 2
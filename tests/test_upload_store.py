@@ -0,0 +1,69 @@
+"""
+Tests für fortsetzbare Uploads im Upload-Speicher
+"""
+
+import io
+import threading
+
+import pytest
+
+from upload_store import UploadOffsetMismatch, UploadStore
+
+
+class _BlockingStream:
+    """Liefert die Daten erst, nachdem `release` gesetzt wurde"""
+
+    def __init__(self, data):
+        self.stream = io.BytesIO(data)
+        self.reading = threading.Event()
+        self.release = threading.Event()
+
+    def read(self, size=-1):
+        self.reading.set()
+        self.release.wait(5)
+        return self.stream.read(size)
+
+
+def test_append_chunk_rejects_concurrent_chunk_at_same_offset(tmp_path):
+    store = UploadStore(str(tmp_path), max_size=1024)
+    upload_id = store.start_session("modell.ifc", total_size=8)
+
+    first = _BlockingStream(b"AAAA")
+    results = {}
+
+    def append(name, stream):
+        try:
+            results[name] = store.append_chunk(upload_id, 0, stream)
+        except UploadOffsetMismatch as e:
+            results[name] = e
+
+    writer = threading.Thread(target=append, args=("first", first))
+    writer.start()
+    assert first.reading.wait(5)
+
+    # Zweites Teilstück mit demselben Offset, während das erste noch geschrieben wird
+    competitor = threading.Thread(target=append, args=("second", io.BytesIO(b"BBBB")))
+    competitor.start()
+    competitor.join(0.2)
+    first.release.set()
+    writer.join(5)
+    competitor.join(5)
+
+    assert results["first"] == 4
+    assert isinstance(results["second"], UploadOffsetMismatch)
+    assert results["second"].status_code == 409
+    assert store.session_status(upload_id)["received"] == 4
+
+    assert store.append_chunk(upload_id, 4, io.BytesIO(b"CCCC")) == 8
+    stored, filename = store.complete_session(upload_id)
+    with open(stored.path, "rb") as f:
+        assert f.read() == b"AAAACCCC"
+
+
+def test_append_chunk_rejects_wrong_offset(tmp_path):
+    store = UploadStore(str(tmp_path), max_size=1024)
+    upload_id = store.start_session("modell.ifc")
+    store.append_chunk(upload_id, 0, io.BytesIO(b"AAAA"))
+
+    with pytest.raises(UploadOffsetMismatch):
+        store.append_chunk(upload_id, 0, io.BytesIO(b"BBBB"))
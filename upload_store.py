@@ -0,0 +1,444 @@
+"""
+Upload-Speicher (upload_store.py) für HVAC Classifier
+Speichert hochgeladene IFC-Dateien inhaltsadressiert (SHA-256) und unterstützt
+fortsetzbare Uploads in Teilstücken
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+import uuid
+import zipfile
+import zlib
+from contextlib import contextmanager
+
+from processing_lock import file_lock
+
+# Fehler, die beim Entpacken beschädigter Dateien auftreten
+DECOMPRESSION_ERRORS = (OSError, EOFError, zipfile.BadZipFile, zlib.error)
+
+try:
+    import zstandard
+    DECOMPRESSION_ERRORS += (zstandard.ZstdError,)
+except ImportError:
+    zstandard = None
+
+# Komprimierte IFC-Formate: Dateiendung -> Verfahren
+COMPRESSED_SUFFIXES = {
+    ".ifczip": "zip",
+    ".ifc.gz": "gzip",
+    ".ifc.zst": "zstd",
+}
+
+
+class UploadError(Exception):
+    """Fehler beim Speichern eines Uploads"""
+    status_code = 400
+
+
+class UploadTooLarge(UploadError):
+    """Der Upload überschreitet die maximale Dateigröße"""
+    status_code = 413
+
+
+class UploadNotFound(UploadError):
+    """Unbekannter oder abgelaufener fortsetzbarer Upload"""
+    status_code = 404
+
+
+class UploadOffsetMismatch(UploadError):
+    """Ein Teilstück passt nicht an den bisherigen Stand des Uploads"""
+    status_code = 409
+
+    def __init__(self, offset, expected):
+        super().__init__(f"Falscher Offset {offset}, erwartet {expected}")
+        self.expected = expected
+
+
+def compression_for(filename):
+    """
+    Ermittelt das Kompressionsverfahren anhand der Dateiendung
+
+    Args:
+        filename: Dateiname
+
+    Returns:
+        str: "zip", "gzip", "zstd" oder None für unkomprimierte Dateien
+    """
+    name = filename.lower()
+    for suffix, compression in COMPRESSED_SUFFIXES.items():
+        if name.endswith(suffix):
+            return compression
+    return None
+
+
+def ifc_filename(filename):
+    """Liefert den Namen der entpackten IFC-Datei (z.B. modell.ifc.gz -> modell.ifc)"""
+    name = filename.lower()
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            return filename[:-len(suffix)] + ".ifc"
+    return filename
+
+
+def open_decompressed(stream, compression):
+    """
+    Öffnet einen Datenstrom zum blockweisen Lesen der entpackten Daten
+
+    Args:
+        stream: Dateiähnliches Objekt mit den komprimierten Daten (für zip: seekable)
+        compression: Verfahren aus compression_for() oder None
+
+    Returns:
+        Dateiähnliches Objekt mit read()
+    """
+    if compression is None:
+        return stream
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise UploadError(".ifc.zst-Dateien benötigen das Paket zstandard, das nicht installiert ist")
+        return zstandard.ZstdDecompressor().stream_reader(stream)
+    if compression == "zip":
+        archive = zipfile.ZipFile(stream)
+        members = [info for info in archive.infolist() if info.filename.lower().endswith(".ifc")]
+        if not members:
+            raise UploadError("Das Archiv enthält keine IFC-Datei")
+        return archive.open(members[0])
+    raise UploadError(f"Unbekanntes Kompressionsverfahren: {compression}")
+
+
+class StoredUpload:
+    """Eine vollständig gespeicherte Datei im Upload-Speicher"""
+
+    def __init__(self, sha256, size, path):
+        self.sha256 = sha256
+        self.size = size
+        self.path = path
+
+
+class UploadStore:
+    """
+    Inhaltsadressierter Speicher für hochgeladene Dateien.
+
+    Dateien werden in Blöcken in eine temporäre Datei geschrieben, während der
+    SHA-256-Hash laufend berechnet wird, und erst nach Abschluss atomar nach
+    objects/<hash[:2]>/<hash><endung> verschoben. Gleichzeitige Uploads mit
+    demselben Dateinamen überschreiben sich daher nicht; gleiche Inhalte werden
+    nur einmal abgelegt.
+
+    Fortsetzbare Uploads werden unter sessions/<upload_id>.part gesammelt.
+    """
+
+    def __init__(self, root, max_size, chunk_size=8 * 1024 * 1024, session_max_age=24 * 3600):
+        """
+        Initialisiert den Upload-Speicher
+
+        Args:
+            root: Basisverzeichnis des Speichers
+            max_size: Maximale Dateigröße in Bytes
+            chunk_size: Blockgröße beim Lesen von Datenströmen
+            session_max_age: Sekunden, nach denen unvollständige Uploads verworfen werden
+        """
+        self.root = root
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.session_max_age = session_max_age
+        self.objects_dir = os.path.join(root, "objects")
+        self.sessions_dir = os.path.join(root, "sessions")
+        self.tmp_dir = os.path.join(root, "tmp")
+        for directory in [self.objects_dir, self.sessions_dir, self.tmp_dir]:
+            os.makedirs(directory, exist_ok=True)
+
+        # Laufende Hashes der fortsetzbaren Uploads dieses Prozesses
+        self._session_hashes = {}
+
+    def object_path(self, sha256, suffix=".ifc"):
+        """Pfad einer gespeicherten Datei anhand ihres Hashes"""
+        return os.path.join(self.objects_dir, sha256[:2], f"{sha256}{suffix}")
+
+    def _copy_stream(self, stream, target, hasher, size=0):
+        """
+        Kopiert einen Datenstrom blockweise, aktualisiert den Hash und prüft die Größe
+
+        Returns:
+            int: Gesamtgröße nach dem Kopieren
+        """
+        while True:
+            chunk = stream.read(self.chunk_size)
+            if not chunk:
+                return size
+            size += len(chunk)
+            if size > self.max_size:
+                raise UploadTooLarge(f"Datei ist größer als {self.max_size} Bytes")
+            hasher.update(chunk)
+            target.write(chunk)
+
+    def _commit(self, temp_path, sha256, size, suffix):
+        """Verschiebt eine fertige temporäre Datei an ihren inhaltsadressierten Pfad"""
+        path = self.object_path(sha256, suffix)
+        if os.path.exists(path):
+            # Gleicher Inhalt ist bereits gespeichert
+            os.remove(temp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+        return StoredUpload(sha256, size, path)
+
+    def save_stream(self, stream, suffix=".ifc", compression=None):
+        """
+        Speichert einen Datenstrom vollständig im Speicher
+
+        Komprimierte Daten werden beim Kopieren entpackt; Hash und Größenlimit
+        beziehen sich auf die entpackte Datei.
+
+        Args:
+            stream: Dateiähnliches Objekt mit read()
+            suffix: Dateiendung der gespeicherten Datei
+            compression: Optional - Verfahren aus compression_for()
+
+        Returns:
+            StoredUpload: Die gespeicherte Datei
+        """
+        temp_path, sha256, size = self._write_temp(stream, compression)
+        return self._commit(temp_path, sha256, size, suffix)
+
+    @contextmanager
+    def temporary_stream(self, stream, compression=None):
+        """
+        Schreibt einen Datenstrom wie save_stream, legt ihn aber nicht im Speicher ab:
+        Die Datei existiert nur innerhalb des with-Blocks (z.B. für einen Vorabscan)
+
+        Args:
+            stream: Dateiähnliches Objekt mit read()
+            compression: Optional - Verfahren aus compression_for()
+
+        Returns:
+            StoredUpload: Temporäre Datei (wird beim Verlassen gelöscht)
+        """
+        temp_path, sha256, size = self._write_temp(stream, compression)
+        try:
+            yield StoredUpload(sha256, size, temp_path)
+        finally:
+            os.remove(temp_path)
+
+    def _write_temp(self, stream, compression):
+        """Kopiert den (entpackten) Datenstrom in eine temporäre Datei -> (Pfad, SHA-256, Größe)"""
+        hasher = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as target:
+                source = open_decompressed(stream, compression)
+                size = self._copy_stream(source, target, hasher)
+        except BaseException as e:
+            os.remove(temp_path)
+            if compression is not None and isinstance(e, DECOMPRESSION_ERRORS):
+                raise UploadError(f"Datei konnte nicht entpackt werden: {e}") from e
+            raise
+        return temp_path, hasher.hexdigest(), size
+
+    # Fortsetzbare Uploads
+
+    def _session_paths(self, upload_id):
+        # Nur von start_session erzeugte IDs (uuid4 hex) zulassen
+        if len(upload_id) != 32 or not all(c in "0123456789abcdef" for c in upload_id):
+            raise UploadNotFound("Ungültige Upload-ID")
+        base = os.path.join(self.sessions_dir, upload_id)
+        return base + ".part", base + ".json"
+
+    def _read_session(self, upload_id):
+        part_path, meta_path = self._session_paths(upload_id)
+        if not os.path.exists(meta_path):
+            raise UploadNotFound("Unbekannter oder abgelaufener Upload")
+        with open(meta_path) as f:
+            meta = json.load(f)
+        meta["received"] = os.path.getsize(part_path)
+        return meta
+
+    def start_session(self, filename, total_size=None):
+        """
+        Startet einen fortsetzbaren Upload
+
+        Args:
+            filename: Ursprünglicher Dateiname
+            total_size: Optional - angekündigte Gesamtgröße in Bytes
+
+        Returns:
+            str: ID des Uploads
+        """
+        if total_size is not None and total_size > self.max_size:
+            raise UploadTooLarge(f"Datei ist größer als {self.max_size} Bytes")
+
+        self.purge_stale_sessions()
+
+        upload_id = uuid.uuid4().hex
+        part_path, meta_path = self._session_paths(upload_id)
+        open(part_path, "wb").close()
+        with open(meta_path, "w") as f:
+            json.dump({"filename": filename, "total_size": total_size, "created_at": time.time()}, f)
+        self._session_hashes[upload_id] = _TrackedHash(hashlib.sha256(), 0)
+        return upload_id
+
+    def session_status(self, upload_id):
+        """
+        Liefert den Stand eines fortsetzbaren Uploads
+
+        Returns:
+            dict: filename, total_size und received (bereits gespeicherte Bytes)
+        """
+        meta = self._read_session(upload_id)
+        return {
+            "upload_id": upload_id,
+            "filename": meta["filename"],
+            "total_size": meta["total_size"],
+            "received": meta["received"]
+        }
+
+    def append_chunk(self, upload_id, offset, stream):
+        """
+        Hängt ein Teilstück an einen fortsetzbaren Upload an
+
+        Args:
+            upload_id: ID des Uploads
+            offset: Position des Teilstücks; muss der bisher empfangenen Größe entsprechen
+            stream: Dateiähnliches Objekt mit den Daten des Teilstücks
+
+        Returns:
+            int: Insgesamt empfangene Bytes
+        """
+        meta = self._read_session(upload_id)
+        if offset != meta["received"]:
+            raise UploadOffsetMismatch(offset, meta["received"])
+
+        max_size = self.max_size
+        if meta["total_size"] is not None:
+            max_size = min(max_size, meta["total_size"])
+
+        part_path, _ = self._session_paths(upload_id)
+        try:
+            target = open(part_path, "r+b")
+        except FileNotFoundError:
+            raise UploadNotFound("Unbekannter oder abgelaufener Upload")
+        with target, file_lock(target):
+            # Unter der Sperre erneut prüfen: Ein gleichzeitiger Aufruf mit demselben
+            # Offset kann inzwischen angehängt haben
+            received = target.seek(0, os.SEEK_END)
+            if offset != received:
+                raise UploadOffsetMismatch(offset, received)
+
+            # Der laufende Hash ist nur gültig, wenn er alle bisherigen Bytes gesehen hat
+            hasher = self._session_hashes.pop(upload_id, None)
+            if hasher is not None and hasher.received != offset:
+                hasher = None
+
+            size = offset
+            while True:
+                chunk = stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    target.truncate(offset)
+                    raise UploadTooLarge(f"Upload ist größer als {max_size} Bytes")
+                if hasher is not None:
+                    hasher.update(chunk)
+                target.write(chunk)
+            target.flush()
+
+            if hasher is not None:
+                hasher.received = size
+                self._session_hashes[upload_id] = hasher
+        return size
+
+    def complete_session(self, upload_id, suffix=".ifc", expected_sha256=None):
+        """
+        Schließt einen fortsetzbaren Upload ab und übernimmt die Datei in den Speicher
+
+        Args:
+            upload_id: ID des Uploads
+            suffix: Dateiendung der gespeicherten Datei
+            expected_sha256: Optional - vom Client berechneter Hash zur Prüfung
+
+        Returns:
+            tuple: (StoredUpload, ursprünglicher Dateiname)
+        """
+        meta = self._read_session(upload_id)
+        if meta["total_size"] is not None and meta["received"] != meta["total_size"]:
+            raise UploadError(f"Upload unvollständig: {meta['received']} von {meta['total_size']} Bytes")
+
+        part_path, meta_path = self._session_paths(upload_id)
+        hasher = self._session_hashes.pop(upload_id, None)
+        if hasher is None or hasher.received != meta["received"]:
+            # Upload wurde (teilweise) von einem anderen Prozess angenommen: Hash neu berechnen
+            hasher = hashlib.sha256()
+            with open(part_path, "rb") as f:
+                for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                    hasher.update(chunk)
+        sha256 = hasher.hexdigest()
+
+        if expected_sha256 and expected_sha256.lower() != sha256:
+            self.abort_session(upload_id)
+            raise UploadError("Prüfsumme stimmt nicht überein")
+
+        compression = compression_for(meta["filename"])
+        if compression is None:
+            stored = self._commit(part_path, sha256, meta["received"], suffix)
+        else:
+            # Komprimierte Uploads werden beim Abschluss in den Speicher entpackt
+            try:
+                with open(part_path, "rb") as f:
+                    stored = self.save_stream(f, suffix, compression)
+            except BaseException:
+                self.abort_session(upload_id)
+                raise
+            os.remove(part_path)
+        os.remove(meta_path)
+        return stored, ifc_filename(meta["filename"])
+
+    def abort_session(self, upload_id):
+        """Verwirft einen fortsetzbaren Upload"""
+        self._session_hashes.pop(upload_id, None)
+        for path in self._session_paths(upload_id):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def purge_stale_sessions(self):
+        """Entfernt unvollständige Uploads und temporäre Dateien, die älter als session_max_age sind"""
+        cutoff = time.time() - self.session_max_age
+        for name in os.listdir(self.tmp_dir):
+            path = os.path.join(self.tmp_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+        # Maßgeblich ist der letzte Schreibzugriff auf die .part-Datei
+        for name in os.listdir(self.sessions_dir):
+            upload_id, extension = os.path.splitext(name)
+            if extension != ".json":
+                continue
+            part_path = os.path.join(self.sessions_dir, upload_id + ".part")
+            try:
+                if os.path.getmtime(part_path) < cutoff:
+                    self.abort_session(upload_id)
+            except (OSError, UploadError):
+                pass
+
+
+class _TrackedHash:
+    """SHA-256-Hash mit der Anzahl der bereits eingerechneten Bytes"""
+
+    def __init__(self, hasher, received):
+        self._hasher = hasher
+        self.received = received
+
+    def update(self, data):
+        self._hasher.update(data)
+
+    def hexdigest(self):
+        return self._hasher.hexdigest()